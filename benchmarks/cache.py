@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# Times SceneCache hits against loading the file directly with arrays=True,
+# with and without mmap, on a synthetic scene.
+# Usage: python benchmarks/cache.py [--nodes 40] [--vertices 5000] [--animation all]
+
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+from xanlib import load_xbf, save_xbf
+from xanlib.cache import SceneCache
+from synthetic import ANIMATIONS, build_scene
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=40)
+    parser.add_argument("--vertices", type=int, default=5000)
+    parser.add_argument("--animation", choices=ANIMATIONS, default="all")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scene = build_scene(
+        node_count=args.nodes,
+        vertex_count=args.vertices,
+        face_count=2 * args.vertices,
+        animation=args.animation,
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        filename = Path(directory) / "scene.xbf"
+        save_xbf(scene, filename)
+        cache = SceneCache(Path(directory) / "cache")
+        assert load_xbf(filename, cache=cache) == load_xbf(filename, arrays=True)
+
+        def best(load):
+            return min(timeit.repeat(load, number=1, repeat=args.repeat))
+
+        timings = {
+            "arrays": best(lambda: load_xbf(filename, arrays=True)),
+            "arrays, mmap": best(lambda: load_xbf(filename, arrays=True, mmap=True)),
+            "cache hit": best(lambda: load_xbf(filename, cache=cache)),
+        }
+        print(f"{filename.stat().st_size} bytes, {cache.size()} cached")
+        for name, seconds in timings.items():
+            print(f"{name + ':':14}{seconds * 1000:8.2f} ms")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# Times loading a synthetic scene whose nodes are nested 10 levels deep.
+# Compares the single-pass parser against the previous approach,
+# which re-serialized every parsed child to find where the next one starts.
+# Usage: python benchmarks/deep_hierarchy.py [--depth 10] [--vertices 500]
+
+import argparse
+import timeit
+from xanlib import Node, Scene
+from xanlib.vertex import Vertex
+from xanlib.face import Face
+from synthetic import build_scene
+
+
+def reserializing_parse(buffer: bytes, offset: int = 0) -> Node:
+    node = Node(parent=None)
+    vertex_count, flags, face_count, child_count, *transform, name_length = (
+        Node._header.unpack_from(buffer, offset)
+    )
+    offset += Node._header.size
+    node.transform = tuple(transform)
+    node.name = buffer[offset : offset + name_length].decode("ascii")
+    offset += name_length
+    for _ in range(child_count):
+        child = reserializing_parse(buffer, offset)
+        node.children.append(child)
+        offset += len(bytes(child))
+    node.vertices = [
+        Vertex(*coords)
+        for coords in Vertex.cstruct.iter_unpack(
+            buffer[offset : offset + Vertex.cstruct.size * vertex_count]
+        )
+    ]
+    offset += Vertex.cstruct.size * vertex_count
+    node.faces = [
+        Face(*fields)
+        for fields in Face.cstruct.iter_unpack(
+            buffer[offset : offset + Face.cstruct.size * face_count]
+        )
+    ]
+    return node
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--vertices", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scene = build_scene(
+        node_count=args.depth,
+        depth=args.depth,
+        vertex_count=args.vertices,
+        face_count=args.vertices,
+    )
+    buffer = bytes(scene)
+    assert bytes(Scene.frombuffer(buffer)) == buffer
+
+    nodes_offset = (
+        Scene._header.size + len(scene.FXData) + 4 + len(scene.textureNameData)
+    )
+    single_pass = min(
+        timeit.repeat(lambda: Scene.frombuffer(buffer), number=1, repeat=args.repeat)
+    )
+    reserializing = min(
+        timeit.repeat(
+            lambda: reserializing_parse(buffer, nodes_offset),
+            number=1,
+            repeat=args.repeat,
+        )
+    )
+    print(f"{args.depth} levels, {len(buffer)} bytes")
+    print(f"single pass:   {single_pass * 1000:8.2f} ms")
+    print(f"reserializing: {reserializing * 1000:8.2f} ms")
+    print(f"speedup:       {reserializing / single_pass:8.2f}x")
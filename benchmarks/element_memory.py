@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Measures memory per element and construction time of the mesh element
+# classes, next to the previous representation that kept a __dict__ and
+# nested Vector3/UV tuples on every Vertex and Face.
+# Usage: python benchmarks/element_memory.py [--count 100000]
+
+import argparse
+import random
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+from xanlib.vertex import Vertex
+from xanlib.face import Face
+from xanlib.compressed_vertex import CompressedVertex
+from xanlib.key_animation import KeyAnimationFrame
+from xanlib.math_utils import Vector3, Quaternion, UV
+
+
+class DictVertex:
+    def __init__(
+        self, x: float, y: float, z: float, nx: float, ny: float, nz: float
+    ) -> None:
+        self.position = Vector3(x, y, z)
+        self.normal = Vector3(nx, ny, nz)
+
+
+class DictFace:
+    def __init__(
+        self,
+        vertex_index_1: int,
+        vertex_index_2: int,
+        vertex_index_3: int,
+        texture_index: int,
+        flags: int,
+        uv1u: float,
+        uv1v: float,
+        uv2u: float,
+        uv2v: float,
+        uv3u: float,
+        uv3v: float,
+    ) -> None:
+        self.vertex_indices = (vertex_index_1, vertex_index_2, vertex_index_3)
+        self.texture_index = texture_index
+        self.flags = flags
+        self.uv_coords = (UV(uv1u, uv1v), UV(uv2u, uv2v), UV(uv3u, uv3v))
+
+
+class DictCompressedVertex:
+    def __init__(self, x: int, y: int, z: int, normal_packed: int) -> None:
+        self.x = x
+        self.y = y
+        self.z = z
+        self.normal_packed = normal_packed
+
+
+def make_key_frame(
+    frame_id: int, flag: int, w: float, x: float, y: float, z: float
+) -> KeyAnimationFrame:
+    return KeyAnimationFrame(
+        frame_id, flag, Quaternion(w, Vector3(x, y, z)), None, Vector3(x, y, z)
+    )
+
+
+def measure(
+    factory: Callable[..., Any], rows: list[tuple[Any, ...]], repeat: int
+) -> tuple[float, float]:
+    """Traced bytes per element and construction time per element in ns."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    elements = [factory(*row) for row in rows]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del elements
+    seconds = min(
+        timeit.repeat(lambda: [factory(*row) for row in rows], number=1, repeat=repeat)
+    )
+    return size / len(rows), seconds / len(rows) * 1e9
+
+
+def rows_for(count: int, kind: str, rng: random.Random) -> list[tuple[Any, ...]]:
+    """Fresh rows, as struct.iter_unpack would yield, so floats are not shared."""
+    if kind == "vertex":
+        return [tuple(rng.random() for _ in range(6)) for _ in range(count)]
+    if kind == "face":
+        return [
+            (
+                *(rng.randrange(1 << 16) for _ in range(5)),
+                *(rng.random() for _ in range(6)),
+            )
+            for _ in range(count)
+        ]
+    if kind == "compressed":
+        return [
+            tuple(rng.randrange(-32768, 32767) for _ in range(4)) for _ in range(count)
+        ]
+    return [(i, 0b101 << 12, *(rng.random() for _ in range(4))) for i in range(count)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    cases = (
+        ("vertex", "Vertex (dict)", DictVertex),
+        ("vertex", "Vertex", Vertex),
+        ("face", "Face (dict)", DictFace),
+        ("face", "Face", Face),
+        ("compressed", "CompressedVertex (dict)", DictCompressedVertex),
+        ("compressed", "CompressedVertex", CompressedVertex),
+        ("key", "KeyAnimationFrame", make_key_frame),
+    )
+    print(f"{'element':<26} {'bytes/element':>14} {'ns/element':>11}")
+    for kind, label, factory in cases:
+        rows = rows_for(args.count, kind, rng)
+        size, ns = measure(factory, rows, args.repeat)
+        print(f"{label:<26} {size:>14.1f} {ns:>11.1f}")
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# Measures load, save and round-trip throughput of each XBF structure.
+# Reports MB/s, objects/s and peak traced memory, as a table or as JSON
+# so results can be compared across versions.
+# Usage:
+#   python benchmarks/run.py --nodes 20 --depth 5 --animation all --json out.json
+#   python benchmarks/run.py --data-dir Data --limit 100
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from importlib.metadata import version, PackageNotFoundError
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+from xanlib import Scene, load_xbf
+from xanlib.batch import find_xbf_files
+from xanlib.node import Node
+from xanlib.vertex_animation import VertexAnimation
+from xanlib.key_animation import KeyAnimation
+from synthetic import ANIMATIONS, build_scene, count_objects
+
+
+def measure(
+    func: Callable[[], Any], repeat: int, memory: bool = True
+) -> tuple[float, int | None]:
+    """Best wall time over repeat runs, and peak traced memory of one more run."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak
+
+
+def result(
+    case: str,
+    operation: str,
+    size: int,
+    objects: int,
+    seconds: float,
+    peak: int | None,
+) -> dict[str, Any]:
+    return {
+        "case": case,
+        "operation": operation,
+        "bytes": size,
+        "objects": objects,
+        "seconds": seconds,
+        "mb_per_s": size / seconds / 1e6 if seconds else None,
+        "objects_per_s": objects / seconds if seconds else None,
+        "peak_bytes": peak,
+    }
+
+
+def bench_structures(
+    scene: Scene, repeat: int, memory: bool, load_options: dict[str, Any]
+) -> list[dict[str, Any]]:
+    results = []
+    buffer = bytes(scene)
+    objects = count_objects(scene)
+
+    def roundtrip() -> None:
+        bytes(Scene.frombuffer(buffer, **load_options))
+
+    for operation, func in (
+        ("load", lambda: Scene.frombuffer(buffer, **load_options)),
+        ("save", lambda: bytes(scene)),
+        ("stream", lambda: scene.tostream(BytesIO())),
+        ("roundtrip", roundtrip),
+    ):
+        seconds, peak = measure(func, repeat, memory)
+        results.append(result("Scene", operation, len(buffer), objects, seconds, peak))
+
+    arrays = load_options.get("arrays", False)
+    nodes = list(scene)
+    node = nodes[0]
+    node_buffer = bytes(node)
+    seconds, peak = measure(
+        lambda: Node.frombuffer(node_buffer, arrays=arrays), repeat, memory
+    )
+    node_objects = len(node.vertices) + len(node.faces)
+    results.append(
+        result("Node", "load", len(node_buffer), node_objects, seconds, peak)
+    )
+    seconds, peak = measure(lambda: bytes(node), repeat, memory)
+    results.append(
+        result("Node", "save", len(node_buffer), node_objects, seconds, peak)
+    )
+
+    vertex_animations = [n.vertex_animation for n in nodes if n.vertex_animation]
+    if vertex_animations:
+        animation = vertex_animations[0]
+        animation_buffer = bytes(animation)
+        frames = sum(len(frame) for frame in animation.frames)
+        seconds, peak = measure(
+            lambda: VertexAnimation.frombuffer(animation_buffer, arrays=arrays),
+            repeat,
+            memory,
+        )
+        results.append(
+            result(
+                "VertexAnimation", "load", len(animation_buffer), frames, seconds, peak
+            )
+        )
+        seconds, peak = measure(lambda: bytes(animation), repeat, memory)
+        results.append(
+            result(
+                "VertexAnimation", "save", len(animation_buffer), frames, seconds, peak
+            )
+        )
+
+    key_animations = [n.key_animation for n in nodes if n.key_animation]
+    if key_animations:
+        key_animation = key_animations[0]
+        key_buffer = bytes(key_animation)
+        keys = len(key_animation.frames) + len(key_animation.matrices)
+        seconds, peak = measure(
+            lambda: KeyAnimation.frombuffer(key_buffer), repeat, memory
+        )
+        results.append(
+            result("KeyAnimation", "load", len(key_buffer), keys, seconds, peak)
+        )
+        seconds, peak = measure(lambda: bytes(key_animation), repeat, memory)
+        results.append(
+            result("KeyAnimation", "save", len(key_buffer), keys, seconds, peak)
+        )
+
+    return results
+
+
+def bench_data_dir(
+    data_dir: Path,
+    limit: int | None,
+    repeat: int,
+    memory: bool,
+    load_options: dict[str, Any],
+) -> list[dict[str, Any]]:
+    files = find_xbf_files(data_dir)[:limit]
+    scenes = [load_xbf(file, **load_options) for file in files]
+    size = sum(file.stat().st_size for file in files)
+    objects = sum(count_objects(scene) for scene in scenes)
+
+    results = []
+    for operation, func in (
+        ("load", lambda: [load_xbf(file, **load_options) for file in files]),
+        ("save", lambda: [bytes(scene) for scene in scenes]),
+        (
+            "roundtrip",
+            lambda: [bytes(load_xbf(file, **load_options)) for file in files],
+        ),
+    ):
+        seconds, peak = measure(func, repeat, memory)
+        results.append(
+            result(
+                f"{data_dir} ({len(files)} files)",
+                operation,
+                size,
+                objects,
+                seconds,
+                peak,
+            )
+        )
+    return results
+
+
+def print_table(results: list[dict[str, Any]]) -> None:
+    print(
+        f"{'case':<24} {'operation':<10} {'MB/s':>10} {'objects/s':>14} {'peak MB':>9}"
+    )
+    for row in results:
+        peak = row["peak_bytes"]
+        print(
+            f"{row['case']:<24} {row['operation']:<10} {row['mb_per_s']:>10.1f} "
+            f"{row['objects_per_s']:>14,.0f} "
+            f"{peak / 1e6 if peak is not None else float('nan'):>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=1)
+    parser.add_argument("--vertices", type=int, default=500)
+    parser.add_argument("--faces", type=int, default=1000)
+    parser.add_argument("--animation", choices=ANIMATIONS, default="all")
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--arrays", action="store_true", help="load with arrays=True")
+    parser.add_argument("--lazy", action="store_true", help="load with lazy=True")
+    parser.add_argument(
+        "--workers", type=int, help="decode top-level nodes in parallel"
+    )
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    parser.add_argument("--data-dir", type=Path, help="benchmark real XBF files")
+    parser.add_argument("--limit", type=int, help="max files from --data-dir")
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+
+    load_options = {"arrays": args.arrays, "lazy": args.lazy, "workers": args.workers}
+    memory = not args.no_memory
+    if args.data_dir is not None:
+        results = bench_data_dir(
+            args.data_dir, args.limit, args.repeat, memory, load_options
+        )
+    else:
+        scene = build_scene(
+            args.nodes,
+            args.depth,
+            args.vertices,
+            args.faces,
+            args.animation,
+            args.frames,
+        )
+        results = bench_structures(scene, args.repeat, memory, load_options)
+
+    try:
+        xanlib_version = version("xanlib")
+    except PackageNotFoundError:
+        xanlib_version = None
+
+    print_table(results)
+    if args.json is not None:
+        report = {
+            "xanlib": xanlib_version,
+            "python": sys.version,
+            "platform": platform.platform(),
+            "parameters": {
+                key: str(value) if isinstance(value, Path) else value
+                for key, value in vars(args).items()
+            },
+            "results": results,
+        }
+        args.json.write_text(json.dumps(report, indent=2))
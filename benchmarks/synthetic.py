@@ -0,0 +1,153 @@
+# Builds synthetic scenes for the benchmarks, so they need no game data.
+
+import random
+from xanlib import Node, Scene
+from xanlib.vertex import Vertex
+from xanlib.face import Face
+from xanlib.compressed_vertex import CompressedVertex
+from xanlib.vertex_animation import VertexAnimation
+from xanlib.key_animation import KeyAnimation, KeyAnimationFrame
+from xanlib.math_utils import Vector3, Quaternion
+
+IDENTITY = tuple(float(i % 5 == 0) for i in range(16))
+ANIMATIONS = ("none", "vertex", "key", "matrix", "all")
+
+
+def build_vertex_animation(
+    rng: random.Random, vertex_count: int, frame_count: int
+) -> VertexAnimation:
+    frames = [
+        [
+            CompressedVertex(
+                rng.randint(-32768, 32767),
+                rng.randint(-32768, 32767),
+                rng.randint(-32768, 32767),
+                rng.randint(0, 65535),
+            )
+            for _ in range(vertex_count)
+        ]
+        for _ in range(frame_count)
+    ]
+    return VertexAnimation(
+        frame_count=frame_count,
+        count=-vertex_count * frame_count,
+        keys=list(range(frame_count)),
+        scale=0x80000000 | 1024,
+        base_count=vertex_count * frame_count,
+        real_count=vertex_count,
+        frames=frames,
+        interpolation_data=[rng.getrandbits(32) for _ in range(frame_count)],
+    )
+
+
+def build_key_animation(rng: random.Random, frame_count: int) -> KeyAnimation:
+    frames = []
+    for frame_id in range(frame_count):
+        parts = rng.randint(1, 7)
+        frames.append(
+            KeyAnimationFrame(
+                frame_id,
+                parts << 12,
+                (
+                    Quaternion(rng.random(), Vector3(rng.random(), 0.0, 0.0))
+                    if parts & 1
+                    else None
+                ),
+                Vector3(1.0, 1.0, 1.0) if parts & 2 else None,
+                Vector3(rng.random(), rng.random(), 0.0) if parts & 4 else None,
+            )
+        )
+    return KeyAnimation(frame_count, frame_count, [], [], frames)
+
+
+def build_matrix_animation(rng: random.Random, frame_count: int) -> KeyAnimation:
+    return KeyAnimation(
+        frame_count,
+        -1,
+        [
+            tuple(rng.random() for _ in range(16))  # type: ignore[misc]
+            for _ in range(frame_count + 1)
+        ],
+        [],
+        [],
+    )
+
+
+def build_node(
+    rng: random.Random,
+    name: str,
+    vertex_count: int,
+    face_count: int,
+    animation: str,
+    frame_count: int,
+    parent: Node | None = None,
+) -> Node:
+    node = Node(
+        parent=parent,
+        transform=IDENTITY,
+        name=name,
+        vertices=[
+            Vertex(*(rng.uniform(-100, 100) for _ in range(6)))
+            for _ in range(vertex_count)
+        ],
+        faces=[
+            Face(
+                *(rng.randrange(vertex_count) for _ in range(3)),
+                rng.randrange(4),
+                0,
+                *(rng.random() for _ in range(6)),
+            )
+            for _ in range(face_count if vertex_count else 0)
+        ],
+        rgb=[
+            (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+            for _ in range(vertex_count)
+        ],
+        smoothing_groups=[rng.randrange(32) for _ in range(face_count)],
+    )
+    if animation in ("vertex", "all"):
+        node.vertex_animation = build_vertex_animation(rng, vertex_count, frame_count)
+    if animation in ("key", "all"):
+        node.key_animation = build_key_animation(rng, frame_count)
+    if animation == "matrix":
+        node.key_animation = build_matrix_animation(rng, frame_count)
+    return node
+
+
+def build_scene(
+    node_count: int = 10,
+    depth: int = 1,
+    vertex_count: int = 500,
+    face_count: int = 1000,
+    animation: str = "none",
+    frame_count: int = 10,
+    seed: int = 0,
+) -> Scene:
+    """A scene of node_count nodes, arranged in chains depth levels deep."""
+    rng = random.Random(seed)
+    scene = Scene(
+        version=1, FXData=b"\x00" * 64, textureNameData=b"synthetic.tga\x00\x00"
+    )
+    parent = None
+    for i in range(node_count):
+        node = build_node(
+            rng, f"node{i}", vertex_count, face_count, animation, frame_count, parent
+        )
+        if parent is None:
+            scene.nodes.append(node)
+        else:
+            parent.children.append(node)
+        parent = node if (i + 1) % depth else None
+    return scene
+
+
+def count_objects(scene: Scene) -> int:
+    """Number of elements a full decode builds: vertices, faces and frames."""
+    total = 0
+    for node in scene:
+        total += 1 + len(node.vertices) + len(node.faces)
+        if node.vertex_animation is not None:
+            total += sum(len(frame) for frame in node.vertex_animation.frames)
+        if node.key_animation is not None:
+            total += len(node.key_animation.frames) + len(node.key_animation.matrices)
+    return total
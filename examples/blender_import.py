@@ -7,6 +7,7 @@
 import bpy
 from mathutils import Matrix
 import xanlib
+from xanlib.export import SceneBuffers, export_buffers
 
 
 def should_hide(name: str) -> bool:
@@ -14,7 +15,11 @@ def should_hide(name: str) -> bool:
 
 
 def process_node(
-    node: xanlib.Node, materials: list[str], parent_obj: bpy.types.Object | None = None
+    node: xanlib.Node,
+    buffers: SceneBuffers,
+    rows: dict[int, int],
+    materials: list[str],
+    parent_obj: bpy.types.Object | None = None,
 ):
     mesh = bpy.data.meshes.new(name=f"{node.name}_mesh")
 
@@ -22,23 +27,20 @@ def process_node(
     for material in materials:
         obj.data.materials.append(material)
 
+    row = rows[id(node)]
+    vertices = buffers.vertex_slice(row)
+    faces = buffers.face_slice(row)
     mesh.from_pydata(
-        [vertex.position for vertex in node.vertices],
+        buffers.positions[vertices].tolist(),
         [],
-        [face.vertex_indices for face in node.faces],
+        (buffers.indices[faces] - vertices.start).tolist(),
     )
 
-    for i, face in enumerate(mesh.polygons):
-        face.material_index = node.faces[i].texture_index
-
-        for j, loop_index in enumerate(face.loop_indices):
-            u = node.faces[i].uv_coords[j][0]
-            v = 1 - node.faces[i].uv_coords[j][1]
-            if not mesh.uv_layers:
-                mesh.uv_layers.new(name="UVMap")
-            if not mesh.uv_layers.active:
-                mesh.uv_layers.active = mesh.uv_layers[0]
-            mesh.uv_layers.active.data[loop_index].uv = [u, v]
+    if len(mesh.polygons):
+        mesh.polygons.foreach_set("material_index", buffers.texture_index[faces])
+        uvs = buffers.uvs[faces].copy()
+        uvs[..., 1] = 1 - uvs[..., 1]
+        mesh.uv_layers.new(name="UVMap").data.foreach_set("uv", uvs.ravel())
 
     assert node.transform is not None
     obj.matrix_local = Matrix(
@@ -54,7 +56,7 @@ def process_node(
         obj.hide_render = True
 
     for child in node.children:
-        process_node(child, materials, obj)
+        process_node(child, buffers, rows, materials, obj)
 
 
 scene: xanlib.Scene = xanlib.load_xbf("Data/3DDATA0001/Units/HK_missile_H0.xbf")
@@ -93,5 +95,7 @@ for texture in scene.textures:
 
     materials.append(material)
 
+buffers = export_buffers(scene)
+rows = {id(node): row for row, node in enumerate(buffers.nodes)}
 for node in scene.nodes:
-    process_node(node, materials)
+    process_node(node, buffers, rows, materials)
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# Checks that XBF files are well formed without decoding their geometry
+# Usage: python validate_xbf.py <xbf file or directory> [--sections]
+# Example: python validate_xbf.py Data
+
+import argparse
+from pathlib import Path
+from xanlib.batch import find_xbf_files
+from xanlib.validate import validate_many
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", type=Path, help="XBF file or directory to scan")
+    parser.add_argument(
+        "--sections", action="store_true", help="print each file's section table"
+    )
+    args = parser.parse_args()
+
+    files = find_xbf_files(args.path) if args.path.is_dir() else [args.path]
+    invalid = 0
+    for report in validate_many(files):
+        if report.error is not None:
+            invalid += 1
+            print(f"{report.filename}: {report.error}")
+        if args.sections:
+            print(f"{report.filename} ({report.size} bytes)")
+            for entry in report.sections:
+                print(
+                    f"  {entry.offset:>10} {entry.size:>10}  {entry.section:<18} {entry.path}"
+                )
+    print(f"{len(files) - invalid} of {len(files)} files are well formed")
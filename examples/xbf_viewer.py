@@ -4,17 +4,17 @@ import pygame
 from pygame.locals import QUIT
 from pygame.math import Vector2, Vector3
 from xanlib import load_xbf
+from xanlib.transforms import world_transforms
+from xanlib.bounds import scene_bounds
+from xanlib.playback import VertexAnimationPlayer
 import sys
 
 
-def transform_vertex(vertex, transform):
-    position = np.array([*vertex.position, 1]).dot(transform)
-    normal = np.array([*vertex.normal,0]).dot(transform)
+def transform_vertex(position, normal, transform):
+    position = np.array([*position, 1]).dot(transform)
+    normal = np.array([*normal,0]).dot(transform)
     return Vector3(*position[:3])/position[3], Vector3(*normal[:3])
 
-def as_matrix44(transform):
-    return np.array(transform).reshape(4,4)
-
 draw_index = 0
 
 class Viewer:
@@ -32,6 +32,7 @@ class Viewer:
         self.rotspeed = 0.001
         self.screen_half = Vector2(width/2.0, height/2.0)
         self.offset = Vector3(0, 0, 0)
+        self.players = {}
         
         
     def transform_vertex(self, p):
@@ -39,7 +40,7 @@ class Viewer:
         rotp = np.dot([np.cos(a), np.sin(a)], [p.x - self.offset.x, p.z - self.offset.z])
         return Vector2(rotp, -p.y + self.offset.y)*self.scale+self.screen_half
     
-    def display_frame(self, faces, va_frame, transform):
+    def display_frame(self, faces, mesh, transform):
         
         transformed_vertices = []
 
@@ -51,20 +52,9 @@ class Viewer:
         origin = self.transform_vertex(Vector3(0,0,0))
         pygame.draw.circle(self.WINDOW, (0,255,0), origin, 5)
 
-        for vi, vertex in enumerate(va_frame):
-
-            worldpos, norm = transform_vertex(vertex, transform)
+        for vi, (position, normal) in enumerate(zip(*mesh)):
 
-            if self.bounds_min is None:
-                self.bounds_min = Vector3(worldpos)
-            if self.bounds_max is None:
-                self.bounds_max = Vector3(worldpos)
-            self.bounds_min.x = min(self.bounds_min.x, worldpos.x)
-            self.bounds_min.y = min(self.bounds_min.y, worldpos.y)
-            self.bounds_min.z = min(self.bounds_min.z, worldpos.z)
-            self.bounds_max.x = max(self.bounds_max.x, worldpos.x)
-            self.bounds_max.y = max(self.bounds_max.y, worldpos.y)
-            self.bounds_max.z = max(self.bounds_max.z, worldpos.z)
+            worldpos, norm = transform_vertex(position, normal, transform)
 
             curpos = self.transform_vertex(worldpos)
             transformed_vertices.append(curpos)
@@ -86,20 +76,25 @@ class Viewer:
         draw_index += 1
                 
                 
-    def display(self, node):
+    def display(self, node, node_transform):
             
-        frames = len(node.vertex_animation.keys)
-        frame = self.curframe%frames
-        key_frame = node.vertex_animation.keys[frame]
-        if key_frame < len(node.vertex_animation.frames):
-            node_transform = as_matrix44(node.transform)
-            for ancestor in node.ancestors:
-                node_transform @= as_matrix44(ancestor.transform)
-            self.display_frame(node.faces, node.vertex_animation.frames[key_frame], node_transform)
+        player = self.players.get(id(node))
+        if player is None:
+            player = self.players[id(node)] = VertexAnimationPlayer(node.vertex_animation)
+        try:
+            mesh = player.mesh(self.curframe)
+        except IndexError:
+            return
+        self.display_frame(node.faces, mesh, node_transform)
             
         
     def view(self, scene):
-        
+
+        boxes = [frames.union() for frames in scene_bounds(scene).world_frames if frames is not None]
+        if boxes:
+            self.bounds_min = Vector3(*np.min([box[0] for box in boxes], axis=0))
+            self.bounds_max = Vector3(*np.max([box[1] for box in boxes], axis=0))
+
         while True:
             for event in pygame.event.get() :
                 if event.type == QUIT:
@@ -109,11 +104,12 @@ class Viewer:
             
             self.time = pygame.time.get_ticks()
             
-            self.curframe = int(np.floor(self.time*0.01))
+            self.curframe = self.time*0.01
             global draw_index
             draw_index = 0
-            for node in filter(lambda node: node.vertex_animation, scene):
-                self.display(node)
+            world = world_transforms(scene)
+            for node in filter(lambda node: node.vertex_animation and node.vertex_animation.frames, scene):
+                self.display(node, world.matrix(node))
 
             pygame.display.update()
             
@@ -1,12 +1,18 @@
 from .node import Node
 from .scene import Scene, traverse, print_node_names
 from .xbf_io import load_xbf, save_xbf
+from .batch import load_many, iter_scenes, LoadResult
+from .layout import FormatError
 
 __all__ = [
     "traverse",
     "print_node_names",
     "load_xbf",
     "save_xbf",
+    "load_many",
+    "iter_scenes",
+    "LoadResult",
+    "FormatError",
     "Node",
     "Scene",
 ]
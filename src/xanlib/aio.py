@@ -0,0 +1,87 @@
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Executor
+from functools import partial
+from itertools import islice
+from os import PathLike
+from typing import Any
+import asyncio
+from xanlib.scene import Scene
+from xanlib.xbf_io import load_xbf, save_xbf
+from xanlib.batch import LoadResult, _load_one, find_xbf_files
+
+
+async def _run(
+    executor: Executor | None,
+    semaphore: asyncio.Semaphore | None,
+    func: Callable[[], Any],
+) -> Any:
+    loop = asyncio.get_running_loop()
+    if semaphore is None:
+        return await loop.run_in_executor(executor, func)
+    async with semaphore:
+        return await loop.run_in_executor(executor, func)
+
+
+async def load_xbf_async(
+    filename: str | PathLike,
+    executor: Executor | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+    **load_options: Any,
+) -> Scene:
+    """load_xbf without blocking the event loop.
+
+    Reading and parsing run in executor (the loop's default thread pool if
+    None; a ProcessPoolExecutor keeps parsing off the GIL, at the cost of
+    pickling the scene back). A shared semaphore bounds how many loads and
+    saves run at once.
+    """
+    return await _run(executor, semaphore, partial(load_xbf, filename, **load_options))
+
+
+async def save_xbf_async(
+    scene: Scene,
+    filename: str | PathLike,
+    executor: Executor | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+    streaming: bool = False,
+) -> None:
+    """save_xbf without blocking the event loop; see load_xbf_async.
+
+    The scene must not be modified until the save completes.
+    """
+    await _run(executor, semaphore, partial(save_xbf, scene, filename, streaming))
+
+
+async def iter_scenes_async(
+    root_dir: str | PathLike,
+    concurrency: int = 4,
+    executor: Executor | None = None,
+    reduce: Callable[[Scene], Any] | None = None,
+    **load_options: Any,
+) -> AsyncIterator[LoadResult]:
+    """Load every XBF file below root_dir, at most concurrency at a time.
+
+    Yields a LoadResult per file as loads finish, like batch.load_many with
+    ordered=False. Files are only submitted as earlier ones complete, so a
+    large directory does not queue every load up front.
+    """
+    loop = asyncio.get_running_loop()
+    paths = iter(await loop.run_in_executor(None, find_xbf_files, root_dir))
+
+    def submit(path: PathLike) -> "asyncio.Future[LoadResult]":
+        return loop.run_in_executor(executor, _load_one, path, reduce, load_options)
+
+    pending = {submit(path) for path in islice(paths, concurrency)}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                path = next(paths, None)
+                if path is not None:
+                    pending.add(submit(path))
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,276 @@
+from collections.abc import Sequence, Iterable
+from typing import Any, overload
+import numpy as np
+import numpy.typing as npt
+from xanlib.vertex import Vertex
+from xanlib.face import Face
+from xanlib.compressed_vertex import CompressedVertex
+
+
+class VertexArray(Sequence[Vertex]):
+    """Vertices stored as one (N, 6) float32 array of position and normal.
+
+    Vertex objects are only built when an element is indexed.
+    """
+
+    dtype = np.dtype("<f4")
+
+    def __init__(self, data: npt.NDArray[np.float32]) -> None:
+        self.data = data
+
+    @classmethod
+    def frombuffer(cls, buffer: Any, count: int, offset: int = 0) -> "VertexArray":
+        return cls(
+            np.frombuffer(buffer, cls.dtype, count * 6, offset).reshape(count, 6)
+        )
+
+    @classmethod
+    def fromvertices(cls, vertices: Iterable[Vertex]) -> "VertexArray":
+        return cls(
+            np.array(
+                [(*vertex.position, *vertex.normal) for vertex in vertices],
+                dtype=cls.dtype,
+            ).reshape(-1, 6)
+        )
+
+    @property
+    def positions(self) -> npt.NDArray[np.float32]:
+        return self.data[:, :3]
+
+    @property
+    def normals(self) -> npt.NDArray[np.float32]:
+        return self.data[:, 3:]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @overload
+    def __getitem__(self, index: int) -> Vertex: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "VertexArray": ...
+
+    def __getitem__(self, index: int | slice) -> "Vertex | VertexArray":
+        if isinstance(index, slice):
+            return VertexArray(self.data[index])
+        return Vertex(*self.data[index].tolist())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, VertexArray):
+            return np.array_equal(self.data, other.data)
+        if isinstance(other, Sequence):
+            return bytes(self) == b"".join(bytes(vertex) for vertex in other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.data!r})"
+
+    def tobytes(self) -> bytes:
+        return self.data.astype(self.dtype, copy=False).tobytes()
+
+    def __bytes__(self) -> bytes:
+        return self.tobytes()
+
+
+class FaceArray(Sequence[Face]):
+    """Faces stored as one structured array laid out like Face.cstruct.
+
+    Face objects are only built when an element is indexed.
+    """
+
+    dtype = np.dtype(
+        [
+            ("vertex_indices", "<i4", (3,)),
+            ("texture_index", "<i4"),
+            ("flags", "<i4"),
+            ("uv_coords", "<f4", (3, 2)),
+        ]
+    )
+
+    def __init__(self, data: npt.NDArray[np.void]) -> None:
+        self.data = data
+
+    @classmethod
+    def frombuffer(cls, buffer: Any, count: int, offset: int = 0) -> "FaceArray":
+        return cls(np.frombuffer(buffer, cls.dtype, count, offset))
+
+    @classmethod
+    def fromfaces(cls, faces: Iterable[Face]) -> "FaceArray":
+        data = b"".join(bytes(face) for face in faces)
+        return cls(np.frombuffer(data, cls.dtype).copy())
+
+    @property
+    def vertex_indices(self) -> npt.NDArray[np.int32]:
+        return self.data["vertex_indices"]
+
+    @property
+    def texture_index(self) -> npt.NDArray[np.int32]:
+        return self.data["texture_index"]
+
+    @property
+    def flags(self) -> npt.NDArray[np.int32]:
+        return self.data["flags"]
+
+    @property
+    def uv_coords(self) -> npt.NDArray[np.float32]:
+        return self.data["uv_coords"]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @overload
+    def __getitem__(self, index: int) -> Face: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "FaceArray": ...
+
+    def __getitem__(self, index: int | slice) -> "Face | FaceArray":
+        if isinstance(index, slice):
+            return FaceArray(self.data[index])
+        return Face(*Face.cstruct.unpack(self.data[index].tobytes()))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FaceArray):
+            return self.tobytes() == other.tobytes()
+        if isinstance(other, Sequence):
+            return bytes(self) == b"".join(bytes(face) for face in other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.data!r})"
+
+    def tobytes(self) -> bytes:
+        return self.data.astype(self.dtype, copy=False).tobytes()
+
+    def __bytes__(self) -> bytes:
+        return self.tobytes()
+
+
+def decode_normals(normal_packed: npt.ArrayLike) -> npt.NDArray[np.float32]:
+    """Vectorized CompressedVertex.normal: unpack three signed 5-bit components.
+
+    Returns an array with a trailing axis of length 3.
+    """
+    packed = np.asarray(normal_packed, np.uint16)[..., None]
+    components = (packed >> [0, 5, 10]) & 0x1F
+    magnitude = (components % 16).astype(np.float32)
+    return np.where(components > 15, -magnitude, magnitude)
+
+
+def decode_flags(normal_packed: npt.ArrayLike) -> npt.NDArray[np.bool_]:
+    """Vectorized CompressedVertex.as_flag: the high bit of the packed normal."""
+    return ((np.asarray(normal_packed, np.uint16) >> 15) & 1).astype(bool)
+
+
+def encode_normals(
+    normals: npt.ArrayLike, flags: npt.ArrayLike | None = None
+) -> npt.NDArray[np.uint16]:
+    """Pack normals (trailing axis of 3) with convert_to_5bit_signed rules.
+
+    Components are rounded and clamped to [-15, 15]; flags, if given, set the
+    high bit. Like convert_to_5bit_signed, negative components are stored in
+    two's complement, so they do not round-trip through decode_normals.
+    """
+    components = np.clip(np.round(np.asarray(normals, np.float64)), -15, 15)
+    fields = components.astype(np.int32) % 32
+    packed = (fields << [0, 5, 10]).sum(axis=-1)
+    if flags is not None:
+        packed |= np.asarray(flags, np.int32) << 15
+    return packed.astype(np.uint16)
+
+
+class CompressedFrames(Sequence[list[CompressedVertex]]):
+    """Vertex animation frames as one (frames, vertices) structured array.
+
+    The array matches CompressedVertex.cstruct. Indexing a frame returns
+    CompressedVertex objects as a compatibility view.
+    """
+
+    dtype = np.dtype(
+        [("x", "<i2"), ("y", "<i2"), ("z", "<i2"), ("normal_packed", "<u2")]
+    )
+
+    def __init__(self, data: npt.NDArray[np.void]) -> None:
+        self.data = data
+
+    @classmethod
+    def frombuffer(
+        cls, buffer: Any, frame_count: int, vertex_count: int, offset: int = 0
+    ) -> "CompressedFrames":
+        return cls(
+            np.frombuffer(
+                buffer, cls.dtype, frame_count * vertex_count, offset
+            ).reshape(frame_count, vertex_count)
+        )
+
+    @classmethod
+    def fromframes(
+        cls, frames: Iterable[Iterable[CompressedVertex]]
+    ) -> "CompressedFrames":
+        return cls(
+            np.array(
+                [
+                    [
+                        (vertex.x, vertex.y, vertex.z, vertex.normal_packed)
+                        for vertex in frame
+                    ]
+                    for frame in frames
+                ],
+                dtype=cls.dtype,
+            )
+        )
+
+    @property
+    def positions(self) -> npt.NDArray[np.int16]:
+        """(frames, vertices, 3) integer positions."""
+        return np.stack([self.data["x"], self.data["y"], self.data["z"]], axis=-1)
+
+    @property
+    def normals(self) -> npt.NDArray[np.float32]:
+        """(frames, vertices, 3) decoded normals."""
+        return decode_normals(self.data["normal_packed"])
+
+    @property
+    def flags(self) -> npt.NDArray[np.bool_]:
+        """(frames, vertices) flag bits."""
+        return decode_flags(self.data["normal_packed"])
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @overload
+    def __getitem__(self, index: int) -> list[CompressedVertex]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "CompressedFrames": ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> "list[CompressedVertex] | CompressedFrames":
+        if isinstance(index, slice):
+            return CompressedFrames(self.data[index])
+        return [CompressedVertex(*fields) for fields in self.data[index].tolist()]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompressedFrames):
+            return self.tobytes() == other.tobytes()
+        if isinstance(other, Sequence):
+            return bytes(self) == b"".join(
+                bytes(vertex) for frame in other for vertex in frame
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.data!r})"
+
+    def tobytes(self) -> bytes:
+        return self.data.astype(self.dtype, copy=False).tobytes()
+
+    def __bytes__(self) -> bytes:
+        return self.tobytes()
@@ -0,0 +1,89 @@
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from os import PathLike
+from pathlib import Path
+from typing import Any, NamedTuple
+from xanlib.scene import Scene
+from xanlib.xbf_io import load_xbf
+
+
+class LoadResult(NamedTuple):
+    path: str | PathLike
+    value: Any
+    error: Exception | None
+    unparsed_size: int | None
+
+
+def _load_one(
+    path: str | PathLike,
+    reduce: Callable[[Scene], Any] | None,
+    load_options: dict[str, Any],
+) -> LoadResult:
+    try:
+        scene = load_xbf(path, **load_options)
+        value = scene if reduce is None else reduce(scene)
+    except Exception as e:
+        return LoadResult(path, None, e, None)
+    return LoadResult(
+        path,
+        value,
+        scene.error,
+        len(scene.unparsed) if scene.unparsed is not None else None,
+    )
+
+
+def load_many(
+    paths: Iterable[str | PathLike],
+    workers: int | None = None,
+    reduce: Callable[[Scene], Any] | None = None,
+    ordered: bool = True,
+    **load_options: Any,
+) -> Iterator[LoadResult]:
+    """Load many XBF files in a process pool.
+
+    Yields one LoadResult per path, in input order or, with ordered=False, as
+    files finish. The value is the Scene, or reduce(scene) when a reduction is
+    given; reducing in the worker avoids pickling whole meshes back. Failures
+    are reported in the result's error instead of aborting the run, as are
+    scenes that only parsed partially (scene.error and unparsed bytes).
+
+    reduce must be picklable (e.g. a module-level function), and so must the
+    returned values: do not combine reduce=None with mmap=True.
+    workers=0 loads sequentially in the calling process.
+    Other keyword arguments are passed to load_xbf.
+    """
+    paths = list(paths)
+    if workers == 0:
+        for path in paths:
+            yield _load_one(path, reduce, load_options)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            executor.submit(_load_one, path, reduce, load_options) for path in paths
+        ]
+        for future in futures if ordered else as_completed(futures):
+            yield future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def find_xbf_files(root_dir: str | PathLike) -> list[Path]:
+    """All .xbf files below root_dir (case-insensitive), in sorted order."""
+    return sorted(
+        path
+        for path in Path(root_dir).rglob("*")
+        if path.is_file() and path.suffix.casefold() == ".xbf"
+    )
+
+
+def iter_scenes(
+    root_dir: str | PathLike,
+    workers: int | None = None,
+    reduce: Callable[[Scene], Any] | None = None,
+    ordered: bool = True,
+    **load_options: Any,
+) -> Iterator[LoadResult]:
+    """load_many over every XBF file below root_dir."""
+    return load_many(find_xbf_files(root_dir), workers, reduce, ordered, **load_options)
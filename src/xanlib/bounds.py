@@ -0,0 +1,202 @@
+from collections.abc import Sequence
+from typing import NamedTuple
+import numpy as np
+import numpy.typing as npt
+from xanlib.node import Node, _pack_all
+from xanlib.scene import Scene
+from xanlib.compressed_vertex import CompressedVertex
+from xanlib.arrays import VertexArray, CompressedFrames
+from xanlib.transforms import world_transforms
+
+# Vertex animation frames are taken to be in the node's local space, as the
+# viewer draws them, and their integer positions are multiplied by a
+# caller-supplied position_scale (see xanlib.playback).
+
+
+class Bounds(NamedTuple):
+    """Axis-aligned boxes and bounding spheres, one per row.
+
+    Spheres are centred on their box. Rows of empty meshes are NaN.
+    """
+
+    minimum: npt.NDArray[np.float64]
+    maximum: npt.NDArray[np.float64]
+    center: npt.NDArray[np.float64]
+    radius: npt.NDArray[np.float64]
+
+    def union(self) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """The box enclosing every non-empty row, NaN if there are none."""
+        minimum = self.minimum.reshape(-1, 3)
+        maximum = self.maximum.reshape(-1, 3)
+        filled = ~np.isnan(minimum[:, 0])
+        if not filled.any():
+            return np.full(3, np.nan), np.full(3, np.nan)
+        return minimum[filled].min(axis=0), maximum[filled].max(axis=0)
+
+
+def bounds_of(positions: npt.ArrayLike) -> Bounds:
+    """Bounds of (..., vertices, 3) positions, one row per leading index."""
+    positions = np.asarray(positions, np.float64)
+    if positions.shape[-2] == 0:
+        empty = np.full(positions.shape[:-2] + (3,), np.nan)
+        return Bounds(empty, empty.copy(), empty.copy(), empty[..., 0].copy())
+    minimum = positions.min(axis=-2)
+    maximum = positions.max(axis=-2)
+    center = (minimum + maximum) / 2
+    radius = np.linalg.norm(positions - center[..., None, :], axis=-1).max(axis=-1)
+    return Bounds(minimum, maximum, center, radius)
+
+
+def _stack(rows: list[Bounds]) -> Bounds:
+    if not rows:
+        return bounds_of(np.zeros((0, 1, 3)))
+    return Bounds(*(np.array(column) for column in zip(*rows)))
+
+
+def _positions(node: Node) -> npt.NDArray[np.float64]:
+    if isinstance(node.vertices, VertexArray):
+        return node.vertices.positions.astype(np.float64)
+    return (
+        np.frombuffer(_pack_all(node.vertices), VertexArray.dtype)
+        .reshape(-1, 6)[:, :3]
+        .astype(np.float64)
+    )
+
+
+def _frame_positions(
+    frames: Sequence[Sequence[CompressedVertex]], position_scale: float
+) -> npt.NDArray[np.float64]:
+    if not isinstance(frames, CompressedFrames):
+        frames = CompressedFrames.fromframes(frames)
+    return frames.positions.astype(np.float64) * position_scale
+
+
+def _transform(
+    positions: npt.NDArray[np.float64], matrix: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    return positions @ matrix[:3, :3] + matrix[3, :3]
+
+
+class SceneBounds(NamedTuple):
+    """Bounds of every node of a scene, in depth-first order.
+
+    Row i of local and world bounds nodes[i]'s vertices in its own space and
+    in world space. local_frames[i] and world_frames[i] have a row per stored
+    frame of the node's vertex animation, or are None if it has none.
+    World boxes enclose the transformed vertices, so they are as tight as
+    the local ones.
+    """
+
+    nodes: list[Node]
+    local: Bounds
+    world: Bounds
+    local_frames: list[Bounds | None]
+    world_frames: list[Bounds | None]
+    rows: dict[int, int]
+
+    def aabb(
+        self, node: Node, world: bool = True
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        bounds = self.world if world else self.local
+        row = self.rows[id(node)]
+        return bounds.minimum[row], bounds.maximum[row]
+
+    def sphere(
+        self, node: Node, world: bool = True
+    ) -> tuple[npt.NDArray[np.float64], float]:
+        bounds = self.world if world else self.local
+        row = self.rows[id(node)]
+        return bounds.center[row], float(bounds.radius[row])
+
+
+def compute_scene_bounds(scene: Scene, position_scale: float = 1.0) -> SceneBounds:
+    """Compute the bounds of every node, one vectorized pass per node."""
+    transforms = world_transforms(scene)
+    local = []
+    world = []
+    local_frames: list[Bounds | None] = []
+    world_frames: list[Bounds | None] = []
+    for node, matrix in zip(transforms.nodes, transforms.matrices):
+        positions = _positions(node)
+        local.append(bounds_of(positions))
+        world.append(bounds_of(_transform(positions, matrix)))
+        animation = node.vertex_animation
+        if animation is not None and animation.frames:
+            frames = _frame_positions(animation.frames, position_scale)
+            local_frames.append(bounds_of(frames))
+            world_frames.append(bounds_of(_transform(frames, matrix)))
+        else:
+            local_frames.append(None)
+            world_frames.append(None)
+
+    return SceneBounds(
+        transforms.nodes,
+        _stack(local),
+        _stack(world),
+        local_frames,
+        world_frames,
+        transforms.rows,
+    )
+
+
+def scene_bounds(scene: Scene, position_scale: float = 1.0) -> SceneBounds:
+    """Cached compute_scene_bounds.
+
+    The result is reused until the transform, vertices or vertex animation
+    of one of the scene's nodes is assigned or its node hierarchy changes. Vertices edited in
+    place are not noticed; assign node.vertices to refresh the bounds.
+    """
+    key = (
+        scene._structure_generation,
+        scene._transform_generation,
+        scene._geometry_generation,
+        position_scale,
+    )
+    cached = scene._bounds
+    if cached is None or cached[0] != key:
+        cached = (key, compute_scene_bounds(scene, position_scale))
+        scene._bounds = cached
+    return cached[1]
+
+
+def frustum_planes(matrix: npt.ArrayLike) -> npt.NDArray[np.float64]:
+    """(6, 4) inward planes of a view-projection matrix.
+
+    The matrix is laid out like Node.transform, transforming row vectors to
+    OpenGL clip space (-w <= x, y, z <= w). A point p is inside plane
+    (a, b, c, d) when a * p.x + b * p.y + c * p.z + d >= 0.
+    """
+    columns = np.asarray(matrix, np.float64).reshape(4, 4).T
+    w = columns[3]
+    return np.array(
+        [
+            w + columns[0],
+            w - columns[0],
+            w + columns[1],
+            w - columns[1],
+            w + columns[2],
+            w - columns[2],
+        ]
+    )
+
+
+def classify_boxes(
+    minimum: npt.ArrayLike, maximum: npt.ArrayLike, planes: npt.ArrayLike
+) -> tuple[npt.NDArray[np.bool_], npt.NDArray[np.bool_]]:
+    """Which (N, 3) boxes are entirely outside, and which entirely inside,
+    a convex volume of inward planes."""
+    minimum = np.asarray(minimum, np.float64)[:, None, :]
+    maximum = np.asarray(maximum, np.float64)[:, None, :]
+    planes = np.asarray(planes, np.float64)
+    normals = planes[:, :3]
+    positive = np.where(normals >= 0, maximum, minimum)
+    negative = np.where(normals >= 0, minimum, maximum)
+    outside = ((positive * normals).sum(axis=-1) + planes[:, 3] < 0).any(axis=1)
+    inside = ((negative * normals).sum(axis=-1) + planes[:, 3] >= 0).all(axis=1)
+    return outside, inside
+
+
+def in_frustum(bounds: Bounds, planes: npt.ArrayLike) -> npt.NDArray[np.bool_]:
+    """Which rows of bounds may be visible; empty rows never are."""
+    outside, _ = classify_boxes(bounds.minimum, bounds.maximum, planes)
+    return ~outside & ~np.isnan(bounds.minimum[:, 0])
@@ -0,0 +1,225 @@
+from typing import NamedTuple
+import numpy as np
+import numpy.typing as npt
+from xanlib.scene import Scene
+from xanlib.export import SceneBuffers, export_buffers
+from xanlib.bounds import classify_boxes
+
+# Traversal is vectorized over rays rather than over the tree: each visited
+# BVH node tests all rays that reached it against its box, and each leaf runs
+# a Moller-Trumbore test of those rays against all of its triangles at once.
+
+_EPSILON = 1e-12
+
+
+class RayHits(NamedTuple):
+    """The nearest hit of each ray.
+
+    face is a row of the BVH's buffers (and node a row of buffers.nodes),
+    or -1 for rays that hit nothing, whose distance is inf. u and v are the
+    barycentric coordinates of the hit along the face's second and third
+    vertices. Distances are in multiples of the ray direction's length.
+    """
+
+    distance: npt.NDArray[np.float64]
+    face: npt.NDArray[np.int64]
+    node: npt.NDArray[np.int64]
+    u: npt.NDArray[np.float64]
+    v: npt.NDArray[np.float64]
+
+
+class SceneBVH:
+    """A bounding volume hierarchy over every face of a scene in world space.
+
+    Faces are split at the median centroid along the longest axis until at
+    most leaf_size remain. The faces below any BVH node are the contiguous
+    range order[start[i] : start[i] + size[i]]; leaves have left == -1.
+    """
+
+    def __init__(self, buffers: SceneBuffers, leaf_size: int = 4) -> None:
+        self.buffers = buffers
+        self.triangles = buffers.positions[buffers.indices].astype(np.float64)
+        self.order = np.arange(len(self.triangles))
+        triangle_min = self.triangles.min(axis=1, initial=np.inf)
+        triangle_max = self.triangles.max(axis=1, initial=-np.inf)
+        centroids = self.triangles.mean(axis=1)
+
+        minimum: list[npt.NDArray[np.float64]] = []
+        maximum: list[npt.NDArray[np.float64]] = []
+        start: list[int] = []
+        size: list[int] = []
+        left: list[int] = []
+        right: list[int] = []
+
+        def add(first: int, count: int) -> int:
+            rows = self.order[first : first + count]
+            minimum.append(triangle_min[rows].min(axis=0))
+            maximum.append(triangle_max[rows].max(axis=0))
+            start.append(first)
+            size.append(count)
+            left.append(-1)
+            right.append(-1)
+            return len(start) - 1
+
+        stack = [add(0, len(self.order))] if len(self.order) else []
+        while stack:
+            index = stack.pop()
+            first, count = start[index], size[index]
+            if count <= leaf_size:
+                continue
+            rows = self.order[first : first + count]
+            spread = centroids[rows].max(axis=0) - centroids[rows].min(axis=0)
+            axis = int(np.argmax(spread))
+            if spread[axis] == 0:
+                continue
+            half = count // 2
+            self.order[first : first + count] = rows[
+                np.argpartition(centroids[rows, axis], half)
+            ]
+            left[index] = add(first, half)
+            right[index] = add(first + half, count - half)
+            stack.extend((left[index], right[index]))
+
+        self.minimum = np.array(minimum).reshape(-1, 3)
+        self.maximum = np.array(maximum).reshape(-1, 3)
+        self.start = np.array(start, np.int64)
+        self.size = np.array(size, np.int64)
+        self.left = np.array(left, np.int64)
+        self.right = np.array(right, np.int64)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def intersect(
+        self,
+        origins: npt.ArrayLike,
+        directions: npt.ArrayLike,
+        max_distance: float = np.inf,
+    ) -> RayHits:
+        """Cast a batch of (R, 3) rays and return their nearest hits.
+
+        Faces are hit from either side.
+        """
+        origins = np.asarray(origins, np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, np.float64).reshape(-1, 3)
+        ray_count = len(origins)
+        with np.errstate(divide="ignore"):
+            inverse = 1 / directions
+        distance = np.full(ray_count, max_distance, np.float64)
+        face = np.full(ray_count, -1, np.int64)
+        u = np.zeros(ray_count)
+        v = np.zeros(ray_count)
+
+        stack = [(0, np.arange(ray_count))] if len(self) and ray_count else []
+        while stack:
+            index, rays = stack.pop()
+            rays = rays[
+                self._enters(index, origins[rays], inverse[rays], distance[rays])
+            ]
+            if not len(rays):
+                continue
+            if self.left[index] >= 0:
+                stack.append((self.right[index], rays))
+                stack.append((self.left[index], rays))
+                continue
+            faces = self.order[self.start[index] : self.start[index] + self.size[index]]
+            hit, t, hit_u, hit_v = _intersect_triangles(
+                origins[rays], directions[rays], self.triangles[faces]
+            )
+            closer = t < distance[rays]
+            rays = rays[closer]
+            distance[rays] = t[closer]
+            face[rays] = faces[hit[closer]]
+            u[rays] = hit_u[closer]
+            v[rays] = hit_v[closer]
+
+        distance[face < 0] = np.inf
+        node = np.full(ray_count, -1, np.int64)
+        node[face >= 0] = self.buffers.face_node[face[face >= 0]]
+        return RayHits(distance, face, node, u, v)
+
+    def _enters(
+        self,
+        index: int,
+        origins: npt.NDArray[np.float64],
+        inverse: npt.NDArray[np.float64],
+        distance: npt.NDArray[np.float64],
+    ) -> npt.NDArray[np.bool_]:
+        """Which rays enter a BVH node's box before their current hit."""
+        with np.errstate(invalid="ignore"):
+            low = (self.minimum[index] - origins) * inverse
+            high = (self.maximum[index] - origins) * inverse
+        # A ray parallel to a slab and starting on its plane gives 0 * inf;
+        # treat that axis as not constraining the ray.
+        near = np.fmin(low, high)
+        far = np.fmax(low, high)
+        near = np.where(np.isnan(near), -np.inf, near).max(axis=1)
+        far = np.where(np.isnan(far), np.inf, far).min(axis=1)
+        return (near <= far) & (far >= 0) & (near <= distance)
+
+    def faces_in_frustum(self, planes: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """Rows of the faces whose boxes are not entirely outside the planes
+        (see xanlib.bounds.frustum_planes), in ascending order."""
+        planes = np.asarray(planes, np.float64)
+        found = []
+        stack = [0] if len(self) else []
+        while stack:
+            index = stack.pop()
+            outside, inside = classify_boxes(
+                self.minimum[index : index + 1], self.maximum[index : index + 1], planes
+            )
+            if outside[0]:
+                continue
+            faces = self.order[self.start[index] : self.start[index] + self.size[index]]
+            if inside[0]:
+                found.append(faces)
+            elif self.left[index] >= 0:
+                stack.extend((self.left[index], self.right[index]))
+            else:
+                triangles = self.triangles[faces]
+                outside, _ = classify_boxes(
+                    triangles.min(axis=1), triangles.max(axis=1), planes
+                )
+                found.append(faces[~outside])
+        if not found:
+            return np.zeros(0, np.int64)
+        return np.sort(np.concatenate(found)).astype(np.int64)
+
+
+def _intersect_triangles(
+    origins: npt.NDArray[np.float64],
+    directions: npt.NDArray[np.float64],
+    triangles: npt.NDArray[np.float64],
+) -> tuple[
+    npt.NDArray[np.intp],
+    npt.NDArray[np.float64],
+    npt.NDArray[np.float64],
+    npt.NDArray[np.float64],
+]:
+    """Nearest of (T, 3, 3) triangles hit by each of (R, 3) rays.
+
+    Returns the triangle index, distance (inf for a miss) and barycentric
+    coordinates per ray.
+    """
+    edge1 = triangles[:, 1] - triangles[:, 0]
+    edge2 = triangles[:, 2] - triangles[:, 0]
+    p = np.cross(directions[:, None], edge2[None])
+    determinant = (edge1[None] * p).sum(axis=-1)
+    parallel = np.abs(determinant) < _EPSILON
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inverse = 1 / np.where(parallel, 1, determinant)
+        s = origins[:, None] - triangles[None, :, 0]
+        u = (s * p).sum(axis=-1) * inverse
+        q = np.cross(s, edge1[None])
+        v = (directions[:, None] * q).sum(axis=-1) * inverse
+        t = (edge2[None] * q).sum(axis=-1) * inverse
+    hit = ~parallel & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0)
+    t = np.where(hit, t, np.inf)
+    nearest = np.argmin(t, axis=1)
+    rows = np.arange(len(origins))
+    return nearest, t[rows, nearest], u[rows, nearest], v[rows, nearest]
+
+
+def build_bvh(scene: Scene, leaf_size: int = 4) -> SceneBVH:
+    """A SceneBVH over the world-space faces of every node of scene."""
+    return SceneBVH(export_buffers(scene, world=True), leaf_size)
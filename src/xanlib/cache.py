@@ -0,0 +1,181 @@
+from hashlib import sha256
+from importlib.metadata import version, PackageNotFoundError
+from os import PathLike
+from pathlib import Path
+from struct import Struct
+from typing import Any
+import mmap as _mmap
+import os
+import pickle
+import tempfile
+from xanlib.scene import Scene
+
+CACHE_FORMAT_VERSION = 2
+
+# An entry is this header (pickle size and buffer count), the size of each
+# out-of-band buffer, the pickle, then the buffers, each aligned for numpy.
+_header = Struct("<2Q")
+_ALIGNMENT = 64
+
+try:
+    _LIBRARY_VERSION = version("xanlib")
+except PackageNotFoundError:
+    _LIBRARY_VERSION = "unknown"
+
+
+class SceneCache:
+    """On-disk cache of parsed scenes for load_xbf.
+
+    Scenes are cached array-backed (as loaded with arrays=True, which needs
+    numpy). Their vertex, face and animation arrays are stored as raw
+    buffers outside the pickle, and a hit maps the entry and returns arrays
+    that are read-only views into it, so only the remaining objects (names,
+    transforms, colours, smoothing groups and key animations) are rebuilt.
+    A hit is then faster than load_xbf(arrays=True), which reads the whole
+    file into memory, but only about as fast as adding mmap=True to it;
+    benchmarks/cache.py compares the three.
+
+    Entries are keyed by the source file's resolved path, modification time and
+    size (or, with by_content=True, by a hash of its bytes), together with the
+    load options, CACHE_FORMAT_VERSION and the installed xanlib version, so
+    entries from other library versions are never used and age out.
+    The least recently used entries are evicted once the cache grows past
+    max_bytes.
+
+    Entries are pickles: only point this at a directory you trust.
+    """
+
+    suffix = ".xbfcache"
+
+    def __init__(
+        self,
+        directory: str | PathLike,
+        max_bytes: int = 1 << 30,
+        by_content: bool = False,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.by_content = by_content
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key(self, filename: str | PathLike, **load_options: Any) -> str:
+        digest = sha256()
+        digest.update(
+            f"{CACHE_FORMAT_VERSION}\0{_LIBRARY_VERSION}\0"
+            f"{sorted(load_options.items())}\0".encode()
+        )
+        if self.by_content:
+            with open(filename, "rb") as stream:
+                digest.update(stream.read())
+        else:
+            path = Path(filename).resolve()
+            stat = path.stat()
+            digest.update(f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}".encode())
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def get(self, filename: str | PathLike, **load_options: Any) -> Scene | None:
+        entry = self._entry(self.key(filename, **load_options))
+        try:
+            scene = _read_entry(entry)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            entry.unlink(missing_ok=True)
+            return None
+        os.utime(entry)
+        return scene
+
+    def put(self, filename: str | PathLike, scene: Scene, **load_options: Any) -> None:
+        entry = self._entry(self.key(filename, **load_options))
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as stream:
+                _write_entry(stream, scene)
+            os.replace(temporary, entry)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self.evict()
+
+    def load(
+        self, filename: str | PathLike, lazy: bool = False, workers: int | None = None
+    ) -> Scene:
+        """Return the cached scene for filename, loading and storing it on a miss.
+
+        workers is passed to load_xbf on a miss; it does not change the result,
+        so it is not part of the key.
+        """
+        from xanlib.xbf_io import load_xbf
+
+        scene = self.get(filename, lazy=lazy)
+        if scene is None:
+            scene = load_xbf(filename, arrays=True, lazy=lazy, workers=workers)
+            self.put(filename, scene, lazy=lazy)
+        return scene
+
+    def entries(self) -> list[os.DirEntry[str]]:
+        """Cache entries, least recently used first."""
+        with os.scandir(self.directory) as it:
+            entries = [entry for entry in it if entry.name.endswith(self.suffix)]
+        return sorted(entries, key=lambda entry: entry.stat().st_mtime_ns)
+
+    def size(self) -> int:
+        return sum(entry.stat().st_size for entry in self.entries())
+
+    def evict(self) -> None:
+        entries = self.entries()
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            total -= entry.stat().st_size
+            try:
+                Path(entry.path).unlink(missing_ok=True)
+            except PermissionError:
+                # Still mapped by a loaded scene, on platforms that forbid
+                # deleting mapped files.
+                pass
+
+    def clear(self) -> None:
+        for entry in self.entries():
+            Path(entry.path).unlink(missing_ok=True)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _write_entry(stream: Any, scene: Scene) -> None:
+    buffers: list[pickle.PickleBuffer] = []
+    data = pickle.dumps(scene, protocol=5, buffer_callback=buffers.append)
+    raw = [buffer.raw() for buffer in buffers]
+    sizes = Struct(f"<{len(raw)}Q").pack(*(view.nbytes for view in raw))
+    offset = stream.write(_header.pack(len(data), len(raw)) + sizes + data)
+    for view in raw:
+        padding = _aligned(offset) - offset
+        offset += stream.write(b"\0" * padding) + stream.write(view)
+
+
+def _read_entry(entry: Path) -> Scene:
+    with open(entry, "rb") as stream:
+        mapping = _mmap.mmap(stream.fileno(), 0, access=_mmap.ACCESS_READ)
+    view = memoryview(mapping)
+    data_size, count = _header.unpack_from(view)
+    sizes = Struct(f"<{count}Q").unpack_from(view, _header.size)
+    offset = _header.size + 8 * count
+    data = view[offset : offset + data_size]
+    offset += data_size
+    buffers = []
+    for size in sizes:
+        offset = _aligned(offset)
+        if offset + size > len(view):
+            raise ValueError("Truncated cache entry")
+        buffers.append(view[offset : offset + size])
+        offset += size
+    scene = pickle.loads(data, buffers=buffers)
+    if not isinstance(scene, Scene):
+        raise TypeError(f"Cache entry holds {type(scene).__name__}, not a Scene")
+    return scene
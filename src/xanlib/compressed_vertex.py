@@ -18,7 +18,7 @@ def convert_to_5bit_signed(v: int) -> int:
         return v_clamped
 
 
-@dataclass
+@dataclass(slots=True)
 class CompressedVertex:
     x: int
     y: int
@@ -0,0 +1,248 @@
+from collections.abc import Iterable
+from os import PathLike
+from pathlib import Path
+from typing import NamedTuple
+import mmap as _mmap
+import os
+import sqlite3
+from xanlib.node import Node
+from xanlib.scene import split_texture_names
+from xanlib.layout import SceneLayout, skim_scene
+from xanlib.batch import find_xbf_files
+
+# Bump when the tables change; older databases are rebuilt from scratch.
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    version INTEGER,
+    error TEXT
+);
+CREATE TABLE textures (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    name TEXT NOT NULL COLLATE NOCASE
+);
+CREATE TABLE nodes (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    vertex_count INTEGER NOT NULL,
+    face_count INTEGER NOT NULL,
+    flags INTEGER NOT NULL
+);
+CREATE INDEX textures_name ON textures(name);
+CREATE INDEX textures_file ON textures(file_id);
+CREATE INDEX nodes_name ON nodes(name);
+CREATE INDEX nodes_file ON nodes(file_id);
+"""
+
+
+class NodeEntry(NamedTuple):
+    file: str
+    path: str
+    name: str
+    vertex_count: int
+    face_count: int
+    flags: Node.Flags
+
+
+class UpdateStats(NamedTuple):
+    added: int
+    updated: int
+    removed: int
+    unchanged: int
+
+
+def _skim_file(filename: str) -> tuple[SceneLayout | None, list[str], str | None]:
+    """Skim a file through a read-only mapping.
+
+    Returns its layout and texture names (None and [] if the scene header is
+    unreadable), and the error that stopped the skim, if any.
+    """
+    with open(filename, "rb") as stream:
+        try:
+            mapping = _mmap.mmap(stream.fileno(), 0, access=_mmap.ACCESS_READ)
+        except ValueError:
+            return None, [], "Empty file"
+    with mapping, memoryview(mapping) as buffer:
+        body = buffer[:-4]
+        try:
+            layout = skim_scene(body)
+            textures = split_texture_names(body[slice(*layout.texture_name_data)])
+        except Exception as e:
+            return None, [], str(e)
+        finally:
+            body.release()
+    error = None if layout.error is None else str(layout.error)
+    return layout, textures, error
+
+
+class CorpusIndex:
+    """A persistent SQLite index of the textures and nodes of many XBF files.
+
+    update() skims the headers of every file below a directory, without
+    decoding geometry, and only revisits files whose size or modification
+    time changed since the last update. Queries then run against the
+    database instead of the files. Paths are stored resolved.
+
+    The underlying sqlite3 connection is available as connection for ad hoc
+    queries over the files, textures and nodes tables.
+    """
+
+    def __init__(self, database: str | PathLike = ":memory:") -> None:
+        self.connection = sqlite3.connect(database)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        (schema_version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        if schema_version != SCHEMA_VERSION:
+            with self.connection:
+                for table in ("nodes", "textures", "files"):
+                    self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+                self.connection.executescript(_SCHEMA)
+                self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "CorpusIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def update(self, root_dir: str | PathLike) -> UpdateStats:
+        """Bring the entries of the XBF files below root_dir up to date.
+
+        Entries of files that no longer exist below root_dir are removed.
+        Files that fail to skim are kept with their error and any nodes read
+        before it.
+        """
+        root = str(Path(root_dir).resolve())
+        known = {
+            path: (file_id, size, mtime_ns)
+            for file_id, path, size, mtime_ns in self.connection.execute(
+                "SELECT id, path, size, mtime_ns FROM files"
+                " WHERE substr(path, 1, ?) = ?",
+                (len(root) + 1, os.path.join(root, "")),
+            )
+        }
+        added = updated = unchanged = 0
+        with self.connection:
+            for path in find_xbf_files(root):
+                filename = str(path.resolve())
+                stat = os.stat(filename)
+                entry = known.pop(filename, None)
+                if entry is not None:
+                    if entry[1:] == (stat.st_size, stat.st_mtime_ns):
+                        unchanged += 1
+                        continue
+                    self.connection.execute(
+                        "DELETE FROM files WHERE id = ?", (entry[0],)
+                    )
+                    updated += 1
+                else:
+                    added += 1
+                self._add(filename, stat.st_size, stat.st_mtime_ns)
+            self.connection.executemany(
+                "DELETE FROM files WHERE id = ?",
+                [(file_id,) for file_id, _, _ in known.values()],
+            )
+        return UpdateStats(added, updated, len(known), unchanged)
+
+    def _add(self, filename: str, size: int, mtime_ns: int) -> None:
+        layout, textures, error = _skim_file(filename)
+        cursor = self.connection.execute(
+            "INSERT INTO files (path, size, mtime_ns, version, error)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (filename, size, mtime_ns, layout.version if layout else None, error),
+        )
+        file_id = cursor.lastrowid
+        if layout is None:
+            return
+        self.connection.executemany(
+            "INSERT INTO textures (file_id, name) VALUES (?, ?)",
+            [(file_id, name) for name in textures],
+        )
+        self.connection.executemany(
+            "INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    file_id,
+                    node.path,
+                    node.name,
+                    node.vertex_count,
+                    node.face_count,
+                    int(node.flags),
+                )
+                for node in layout
+            ],
+        )
+
+    def _paths(self, query: str, params: Iterable[object]) -> list[str]:
+        return [path for (path,) in self.connection.execute(query, tuple(params))]
+
+    def files(self) -> list[str]:
+        return self._paths("SELECT path FROM files ORDER BY path", ())
+
+    def errors(self) -> dict[str, str]:
+        """Files that failed to skim, and why."""
+        return dict(
+            self.connection.execute(
+                "SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path"
+            )
+        )
+
+    def files_with_texture(self, texture: str) -> list[str]:
+        """Files that use a texture, matched case-insensitively."""
+        return self._paths(
+            "SELECT DISTINCT files.path FROM textures JOIN files"
+            " ON files.id = textures.file_id WHERE textures.name = ?"
+            " ORDER BY files.path",
+            (texture,),
+        )
+
+    def files_with_node(self, name: str, substring: bool = False) -> list[str]:
+        """Files with a node of that name, or whose name contains it."""
+        condition = "instr(nodes.name, ?) > 0" if substring else "nodes.name = ?"
+        return self._paths(
+            "SELECT DISTINCT files.path FROM nodes JOIN files"
+            f" ON files.id = nodes.file_id WHERE {condition} ORDER BY files.path",
+            (name,),
+        )
+
+    def files_with_flags(self, flags: Node.Flags) -> list[str]:
+        """Files with a node that has all of the given flags."""
+        return self._paths(
+            "SELECT DISTINCT files.path FROM nodes JOIN files"
+            " ON files.id = nodes.file_id WHERE nodes.flags & ? = ?"
+            " ORDER BY files.path",
+            (int(flags), int(flags)),
+        )
+
+    def textures(self, filename: str | PathLike) -> list[str]:
+        return self._paths(
+            "SELECT textures.name FROM textures JOIN files"
+            " ON files.id = textures.file_id WHERE files.path = ?"
+            " ORDER BY textures.rowid",
+            (str(Path(filename).resolve()),),
+        )
+
+    def nodes(self, filename: str | PathLike) -> list[NodeEntry]:
+        """The nodes of a file, in depth-first order."""
+        return [
+            NodeEntry(
+                path, node_path, name, vertex_count, face_count, Node.Flags(flags)
+            )
+            for path, node_path, name, vertex_count, face_count, flags in (
+                self.connection.execute(
+                    "SELECT files.path, nodes.path, nodes.name, nodes.vertex_count,"
+                    " nodes.face_count, nodes.flags FROM nodes JOIN files"
+                    " ON files.id = nodes.file_id WHERE files.path = ?"
+                    " ORDER BY nodes.rowid",
+                    (str(Path(filename).resolve()),),
+                )
+            )
+        ]
@@ -0,0 +1,206 @@
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field, fields
+from os import PathLike
+from typing import Any, Literal
+from struct import Struct
+from xanlib.vertex import Vertex
+from xanlib.face import Face
+from xanlib.vertex_animation import VertexAnimation
+from xanlib.key_animation import KeyAnimation
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.layout import NodeLayout, SceneLayout, Span, skim_scene
+
+
+@dataclass
+class SectionDiff:
+    """A section that differs between two versions of a node.
+
+    changes maps what differs to its (old, new) values: header field names,
+    record indices for vertices, faces, rgb and smoothing_groups, and
+    dataclass field names for animations. A side is None where it is absent.
+    """
+
+    name: str
+    old: Span | None
+    new: Span | None
+    changes: dict[Any, tuple[Any, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class NodeDiff:
+    path: str
+    status: Literal["added", "removed", "changed"]
+    sections: dict[str, SectionDiff] = field(default_factory=dict)
+
+
+@dataclass
+class SceneDiff:
+    changes: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+    nodes: list[NodeDiff] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes or self.nodes)
+
+    def __iter__(self) -> Iterator[NodeDiff]:
+        return iter(self.nodes)
+
+
+def _records(struct: Struct, decode: Callable[[tuple], Any]) -> Any:
+    def changes(old: Any, new: Any) -> dict[Any, tuple[Any, Any]]:
+        size = struct.size
+        old_count, new_count = len(old) // size, len(new) // size
+        result = {}
+        for i in range(max(old_count, new_count)):
+            start = i * size
+            old_record = old[start : start + size] if i < old_count else None
+            new_record = new[start : start + size] if i < new_count else None
+            if old_record != new_record:
+                result[i] = (
+                    None if old_record is None else decode(struct.unpack(old_record)),
+                    None if new_record is None else decode(struct.unpack(new_record)),
+                )
+        return result
+
+    return changes
+
+
+def _animation(
+    cls: type[VertexAnimation] | type[KeyAnimation],
+) -> Callable[[Any, Any], dict[Any, tuple[Any, Any]]]:
+    def changes(old: Any, new: Any) -> dict[Any, tuple[Any, Any]]:
+        old_value = cls.frombuffer(old) if old else None
+        new_value = cls.frombuffer(new) if new else None
+        if old_value is None or new_value is None:
+            return {None: (old_value, new_value)}
+        return {
+            f.name: (getattr(old_value, f.name), getattr(new_value, f.name))
+            for f in fields(cls)
+            if getattr(old_value, f.name) != getattr(new_value, f.name)
+        }
+
+    return changes
+
+
+_SECTION_CHANGES = {
+    "vertices": _records(Vertex.cstruct, lambda values: Vertex(*values)),
+    "faces": _records(Face.cstruct, lambda values: Face(*values)),
+    "rgb": _records(Node._rgb, tuple),
+    "smoothing_groups": _records(Struct("<i"), lambda values: values[0]),
+    "vertex_animation": _animation(VertexAnimation),
+    "key_animation": _animation(KeyAnimation),
+}
+
+
+def _header_changes(old: NodeLayout, new: NodeLayout) -> dict[Any, tuple[Any, Any]]:
+    values = (
+        ("name", old.name, new.name),
+        ("flags", old.flags, new.flags),
+        ("vertex_count", old.vertex_count, new.vertex_count),
+        ("face_count", old.face_count, new.face_count),
+        ("children", len(old.children), len(new.children)),
+        ("transform", old.transform, new.transform),
+    )
+    return {name: (a, b) for name, a, b in values if a != b}
+
+
+def _diff_node(
+    old_buffer: Any,
+    new_buffer: Any,
+    old: NodeLayout,
+    new: NodeLayout,
+    result: list[NodeDiff],
+) -> None:
+    if old_buffer[old.offset : old.end] == new_buffer[new.offset : new.end]:
+        return
+    node_diff = NodeDiff(new.path, "changed")
+    for name in dict.fromkeys([*old.sections, *new.sections]):
+        old_span = old.sections.get(name)
+        new_span = new.sections.get(name)
+        old_bytes = bytes(old_buffer[slice(*old_span)]) if old_span else b""
+        new_bytes = bytes(new_buffer[slice(*new_span)]) if new_span else b""
+        if old_span is not None and new_span is not None and old_bytes == new_bytes:
+            continue
+        if name == "header":
+            changes = _header_changes(old, new)
+            if not changes:
+                continue
+        else:
+            changes = _SECTION_CHANGES[name](old_bytes, new_bytes)
+        node_diff.sections[name] = SectionDiff(name, old_span, new_span, changes)
+    if node_diff.sections:
+        result.append(node_diff)
+    _diff_children(old_buffer, new_buffer, old.children, new.children, result)
+
+
+def _diff_children(
+    old_buffer: Any,
+    new_buffer: Any,
+    old_nodes: list[NodeLayout],
+    new_nodes: list[NodeLayout],
+    result: list[NodeDiff],
+) -> None:
+    """Match siblings by name, pairing same-named siblings in order."""
+    unmatched: dict[str, list[NodeLayout]] = {}
+    for node in old_nodes:
+        unmatched.setdefault(node.name, []).append(node)
+    for node in new_nodes:
+        candidates = unmatched.get(node.name)
+        if candidates:
+            _diff_node(old_buffer, new_buffer, candidates.pop(0), node, result)
+        else:
+            result.extend(NodeDiff(added.path, "added") for added in node)
+    for candidates in unmatched.values():
+        for node in candidates:
+            result.extend(NodeDiff(removed.path, "removed") for removed in node)
+
+
+def _scene_buffer(scene: Scene | bytes | memoryview | str | PathLike) -> Any:
+    if isinstance(scene, Scene):
+        return bytes(scene)
+    if isinstance(scene, (bytes, bytearray, memoryview)):
+        return scene
+    with open(scene, "rb") as stream:
+        buffer = stream.read()
+    if buffer[-4:] == b"\xff\xff\xff\xff":
+        buffer = buffer[:-4]
+    return buffer
+
+
+def diff_scenes(
+    a: Scene | bytes | memoryview | str | PathLike,
+    b: Scene | bytes | memoryview | str | PathLike,
+) -> SceneDiff:
+    """Compare two scenes section by section.
+
+    Each side may be a Scene, a scene buffer as taken by Scene.frombuffer, or
+    an XBF file name. Nodes are matched by path; byte spans are compared
+    first, and only sections that differ are decoded to report their changes.
+    """
+    old_buffer = _scene_buffer(a)
+    new_buffer = _scene_buffer(b)
+    old: SceneLayout = skim_scene(old_buffer)
+    new: SceneLayout = skim_scene(new_buffer)
+
+    result = SceneDiff()
+    for name, old_value, new_value in (
+        ("version", old.version, new.version),
+        ("FXData", old_buffer[slice(*old.fx_data)], new_buffer[slice(*new.fx_data)]),
+        (
+            "textureNameData",
+            old_buffer[slice(*old.texture_name_data)],
+            new_buffer[slice(*new.texture_name_data)],
+        ),
+        (
+            "unparsed",
+            old.unparsed and old_buffer[slice(*old.unparsed)],
+            new.unparsed and new_buffer[slice(*new.unparsed)],
+        ),
+    ):
+        if old_value != new_value:
+            result.changes[name] = (
+                bytes(old_value) if isinstance(old_value, memoryview) else old_value,
+                bytes(new_value) if isinstance(new_value, memoryview) else new_value,
+            )
+    _diff_children(old_buffer, new_buffer, old.nodes, new.nodes, result.nodes)
+    return result
@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+import numpy as np
+import numpy.typing as npt
+from xanlib.node import Node, _pack_all
+from xanlib.scene import Scene
+from xanlib.arrays import VertexArray, FaceArray
+from xanlib.transforms import compose_hierarchy, flatten_hierarchy, local_matrices
+
+
+@dataclass
+class SceneBuffers:
+    """Geometry of every node of a scene, concatenated into flat arrays.
+
+    Nodes are in depth-first order. Vertices of nodes[i] are rows
+    vertex_offsets[i]:vertex_offsets[i + 1] of the vertex arrays, and likewise
+    for faces; indices are already offset into the concatenated vertices.
+    Nodes without prelight colours get white rgb.
+    """
+
+    nodes: list[Node]
+    positions: npt.NDArray[np.float32]
+    normals: npt.NDArray[np.float32]
+    rgb: npt.NDArray[np.uint8]
+    vertex_node: npt.NDArray[np.int32]
+    vertex_offsets: npt.NDArray[np.int64]
+    indices: npt.NDArray[np.uint32]
+    uvs: npt.NDArray[np.float32]
+    texture_index: npt.NDArray[np.int32]
+    face_flags: npt.NDArray[np.int32]
+    face_node: npt.NDArray[np.int32]
+    face_offsets: npt.NDArray[np.int64]
+
+    def vertex_slice(self, node: int) -> slice:
+        return slice(self.vertex_offsets[node], self.vertex_offsets[node + 1])
+
+    def face_slice(self, node: int) -> slice:
+        return slice(self.face_offsets[node], self.face_offsets[node + 1])
+
+
+def _apply_world(
+    buffers: SceneBuffers,
+    matrices: npt.NDArray[np.float64],
+    parents: list[int],
+    depths: list[int],
+) -> None:
+    world = compose_hierarchy(matrices, parents, depths)
+    for row in range(len(buffers.nodes)):
+        vertices = buffers.vertex_slice(row)
+        if vertices.start == vertices.stop:
+            continue
+        matrix = world[row]
+        positions = buffers.positions[vertices].astype(np.float64)
+        buffers.positions[vertices] = positions @ matrix[:3, :3] + matrix[3, :3]
+        normal_matrix = np.linalg.pinv(matrix[:3, :3]).T
+        normals = buffers.normals[vertices].astype(np.float64) @ normal_matrix
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        buffers.normals[vertices] = normals / np.where(lengths, lengths, 1)
+
+
+def export_buffers(scene: Scene, world: bool = False) -> SceneBuffers:
+    """Concatenate the vertices, faces and colours of all nodes in one pass.
+
+    With world=True, positions are transformed by each node's world matrix
+    and normals by its inverse transpose, then renormalized.
+    """
+    nodes, parents, depths = flatten_hierarchy(scene)
+    vertex_counts = np.array([len(node.vertices) for node in nodes], np.int64)
+    face_counts = np.array([len(node.faces) for node in nodes], np.int64)
+    vertex_offsets = np.concatenate([[0], np.cumsum(vertex_counts)])
+    face_offsets = np.concatenate([[0], np.cumsum(face_counts)])
+
+    vertex_data = np.frombuffer(
+        b"".join(_pack_all(node.vertices) for node in nodes), VertexArray.dtype
+    ).reshape(-1, 6)
+    face_data = np.frombuffer(
+        b"".join(_pack_all(node.faces) for node in nodes), FaceArray.dtype
+    )
+    rgb = np.full((len(vertex_data), 3), 255, np.uint8)
+    for row, node in enumerate(nodes):
+        if node.rgb is not None:
+            rgb[vertex_offsets[row] : vertex_offsets[row + 1]] = np.array(
+                node.rgb, np.uint8
+            ).reshape(-1, 3)
+
+    node_rows = np.arange(len(nodes), dtype=np.int32)
+    face_node = np.repeat(node_rows, face_counts)
+    indices = (
+        face_data["vertex_indices"].astype(np.int64) + vertex_offsets[face_node, None]
+    )
+
+    buffers = SceneBuffers(
+        nodes=nodes,
+        positions=vertex_data[:, :3].copy(),
+        normals=vertex_data[:, 3:].copy(),
+        rgb=rgb,
+        vertex_node=np.repeat(node_rows, vertex_counts),
+        vertex_offsets=vertex_offsets,
+        indices=indices.astype(np.uint32),
+        uvs=face_data["uv_coords"].copy(),
+        texture_index=face_data["texture_index"].copy(),
+        face_flags=face_data["flags"].copy(),
+        face_node=face_node,
+        face_offsets=face_offsets,
+    )
+    if world:
+        _apply_world(buffers, local_matrices(nodes), parents, depths)
+    return buffers
@@ -4,36 +4,57 @@ from xanlib.math_utils import UV
 from struct import Struct
 
 
-@dataclass
+@dataclass(slots=True)
 class Face:
+    """A face stored as its flat record fields; vertex_indices and uv_coords
+    are views."""
+
+    vertex_index_1: int
+    vertex_index_2: int
+    vertex_index_3: int
+    texture_index: int
+    flags: int
+    uv1u: float
+    uv1v: float
+    uv2u: float
+    uv2v: float
+    uv3u: float
+    uv3v: float
     cstruct = Struct("<5i6f")
 
-    def __init__(
-        self,
-        vertex_index_1: int,
-        vertex_index_2: int,
-        vertex_index_3: int,
-        texture_index: int,
-        flags: int,
-        uv1u: float,
-        uv1v: float,
-        uv2u: float,
-        uv2v: float,
-        uv3u: float,
-        uv3v: float,
-    ) -> None:
-        self.vertex_indices = (vertex_index_1, vertex_index_2, vertex_index_3)
-        self.texture_index = texture_index
-        self.flags = flags
-        self.uv_coords = (UV(uv1u, uv1v), UV(uv2u, uv2v), UV(uv3u, uv3v))
-
-    def __bytes__(self):
-        uv_coords = (coord for uv in self.uv_coords for coord in uv)
+    @property
+    def vertex_indices(self) -> tuple[int, int, int]:
+        return (self.vertex_index_1, self.vertex_index_2, self.vertex_index_3)
+
+    @vertex_indices.setter
+    def vertex_indices(self, value: tuple[int, int, int]) -> None:
+        self.vertex_index_1, self.vertex_index_2, self.vertex_index_3 = value
+
+    @property
+    def uv_coords(self) -> tuple[UV, UV, UV]:
+        return (
+            UV(self.uv1u, self.uv1v),
+            UV(self.uv2u, self.uv2v),
+            UV(self.uv3u, self.uv3v),
+        )
+
+    @uv_coords.setter
+    def uv_coords(self, value: tuple[tuple[float, float], ...]) -> None:
+        (self.uv1u, self.uv1v), (self.uv2u, self.uv2v), (self.uv3u, self.uv3v) = value
+
+    def __bytes__(self) -> bytes:
         return self.cstruct.pack(
-            *self.vertex_indices,
+            self.vertex_index_1,
+            self.vertex_index_2,
+            self.vertex_index_3,
             self.texture_index,
             self.flags,
-            *uv_coords,
+            self.uv1u,
+            self.uv1v,
+            self.uv2u,
+            self.uv2v,
+            self.uv3u,
+            self.uv3v,
         )
 
     def tostream(self, stream: BinaryIO) -> None:
@@ -0,0 +1,210 @@
+from bisect import bisect_right
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import NamedTuple, overload
+from struct import Struct
+import re
+
+# The layout of the FX data header around the animation records is not known,
+# so records are found by their names, as examples/extract_anim_info.py did.
+# Each record is a 32-byte null-padded name and an int, followed by frame
+# ranges up to and including the one flagged as last.
+
+ANIMATION_NAMES = [
+    "Stationary",
+    "Idle 0",
+    "Idle 1",
+    "Move Start",
+    "Move Stop",
+    "Move",
+    "Turn Left",
+    "Turn Right",
+    "Fire 0",
+    "Fire 1",
+    "Fire 2",
+    "Fire 3",
+    "Fire 4",
+    "Explode",
+    "Blow Up 1",
+    "Blow Up 2",
+    "Shot 1",
+    "Shot 2",
+    "Burnt 1",
+    "Run Over 1",
+    "Gassed 1",
+    "Deployed Death 1",
+    "Deployed Death 2",
+    "Deploy Gun",
+    "Deploy Gun Hold",
+    "Undeploy Gun",
+    "Deployed Idle 0",
+    "Deployed Fire",
+    "DeployedDeath0",
+    "Harv Unload Start",
+    "Harv Unload Hold",
+    "Harv Unload End",
+    "Harv Eat Start",
+    "Harv Eat Hold",
+    "Harv Eat End",
+    "Repair Arms Out",
+    "Repair Arms Hold",
+    "Repair Arms In",
+    "Sink",
+    "SinkHold",
+    "Surface",
+    "SinkMove",
+    "Move Special",
+    "StandToLayDown",
+    "LayDownToStand",
+    "Lay Down",
+    "Crawl",
+    "Lay Down Fire",
+    "Crouch",
+    "CrouchFire",
+    "Construct",
+    "Deconstruct",
+    "Takeoff",
+    "Land",
+    "Hover",
+    "Fly",
+    "FlyToHover",
+    "HoverToFly",
+    "StartPickup",
+    "Pickup",
+    "EndPickup",
+    "Enter Portal",
+    "Exit Portal",
+    "Win",
+    "Leeched",
+    "Leech Death",
+    "Born",
+    "Refinery Pad 1",
+    "Refinery Pad 2",
+    "Sell",
+]
+
+_NAME_PATTERN = re.compile(
+    b"(?:"
+    + b"|".join(
+        re.escape(name.encode("ascii"))
+        for name in sorted(ANIMATION_NAMES, key=len, reverse=True)
+    )
+    + b")\x00"
+)
+
+
+class FrameRange(NamedTuple):
+    unknown: int
+    repeat: int
+    body_part: int
+    start: int
+    end: int
+
+    @property
+    def frames(self) -> range:
+        """The frames of the range, end included."""
+        return range(self.start, self.end + 1)
+
+
+@dataclass
+class Animation:
+    name: str
+    unknown: int
+    ranges: list[FrameRange]
+    offset: int
+
+    @property
+    def start(self) -> int:
+        return min(frame_range.start for frame_range in self.ranges)
+
+    @property
+    def end(self) -> int:
+        return max(frame_range.end for frame_range in self.ranges)
+
+
+@dataclass
+class AnimationTable(Sequence[Animation]):
+    """Animations of an FX data header, in file order, by name and by frame."""
+
+    animations: list[Animation] = field(default_factory=list)
+    _header = Struct("<32si")
+    _range = Struct("<3i?3x2i")
+
+    def __post_init__(self) -> None:
+        self._by_name = {animation.name: animation for animation in self.animations}
+        self._intervals = sorted(
+            (frame_range.start, frame_range.end, i, frame_range)
+            for i, animation in enumerate(self.animations)
+            for frame_range in animation.ranges
+        )
+        self._starts = [interval[0] for interval in self._intervals]
+
+    @classmethod
+    def frombuffer(cls, fx_data: bytes | memoryview) -> "AnimationTable":
+        """Find and decode the animation records of an FX data header.
+
+        The buffer is scanned once for all known animation names; when a name
+        occurs more than once, the last occurrence is used.
+        """
+        buffer = bytes(fx_data)
+        last = {
+            match.group()[:-1]: match.start()
+            for match in _NAME_PATTERN.finditer(buffer)
+        }
+        animations = []
+        for offset in sorted(last.values()):
+            if offset + cls._header.size > len(buffer):
+                continue
+            name, unknown = cls._header.unpack_from(buffer, offset)
+            ranges = []
+            position = offset + cls._header.size
+            is_last = False
+            while not is_last and position + cls._range.size <= len(buffer):
+                unknown_range, repeat, body_part, is_last, start, end = (
+                    cls._range.unpack_from(buffer, position)
+                )
+                ranges.append(FrameRange(unknown_range, repeat, body_part, start, end))
+                position += cls._range.size
+            animations.append(
+                Animation(
+                    name.split(b"\x00")[0].decode("ascii"), unknown, ranges, offset
+                )
+            )
+        return cls(animations)
+
+    def __len__(self) -> int:
+        return len(self.animations)
+
+    @overload
+    def __getitem__(self, key: int) -> Animation: ...
+
+    @overload
+    def __getitem__(self, key: str) -> Animation: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> list[Animation]: ...
+
+    def __getitem__(self, key: int | str | slice) -> Animation | list[Animation]:
+        if isinstance(key, str):
+            return self._by_name[key]
+        return self.animations[key]
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, str):
+            return key in self._by_name
+        return key in self.animations
+
+    def __iter__(self) -> Iterator[Animation]:
+        return iter(self.animations)
+
+    def names(self) -> list[str]:
+        return [animation.name for animation in self.animations]
+
+    def at_frame(self, frame: int) -> list[tuple[Animation, FrameRange]]:
+        """The animations, and their ranges, that play the given frame."""
+        stop = bisect_right(self._starts, frame)
+        return [
+            (self.animations[i], frame_range)
+            for _, end, i, frame_range in self._intervals[:stop]
+            if end >= frame
+        ]
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
-from typing import NamedTuple
+from typing import NamedTuple, BinaryIO
+from io import BytesIO
 from xanlib.math_utils import Vector3, Quaternion, Matrix
-from struct import Struct
+from struct import Struct, calcsize
 
 
 class KeyAnimationFrame(NamedTuple):
@@ -28,7 +29,12 @@ class KeyAnimation:
     _vector3 = Struct("<3f")
 
     def __bytes__(self) -> bytes:
-        extra_data = b""
+        stream = BytesIO()
+        self.tostream(stream)
+        return stream.getvalue()
+
+    def tostream(self, stream: BinaryIO) -> None:
+        stream.write(self._header_struct.pack(self.frame_count, self.flags))
         if self.flags in (-1, -2, -3):
             if self.flags == -1:
                 matrix_struct = self._matrix16_struct
@@ -38,30 +44,35 @@ class KeyAnimation:
                 extra_struct = Struct(
                     self._extra_fmt.format(count=self.frame_count + 1)
                 )
-                extra_data = extra_struct.pack(len(self.matrices), *self.extra_data)
+                stream.write(extra_struct.pack(len(self.matrices), *self.extra_data))
                 matrix_struct = self._matrix12_struct
-            return (
-                self._header_struct.pack(self.frame_count, self.flags)
-                + extra_data
-                + b"".join(matrix_struct.pack(*matrix) for matrix in self.matrices)
+            stream.write(
+                b"".join(matrix_struct.pack(*matrix) for matrix in self.matrices)
             )
         else:
-            buffer = self._header_struct.pack(self.frame_count, self.flags)
             for frame in self.frames:
-                buffer += self._pos.pack(frame.frame_id, frame.flag)
+                stream.write(self._pos.pack(frame.frame_id, frame.flag))
                 if frame.rotation is not None:
-                    buffer += self._quaternion.pack(frame.rotation.w, *frame.rotation.v)
+                    stream.write(
+                        self._quaternion.pack(frame.rotation.w, *frame.rotation.v)
+                    )
                 if frame.scale is not None:
-                    buffer += self._vector3.pack(*frame.scale)
+                    stream.write(self._vector3.pack(*frame.scale))
                 if frame.translation is not None:
-                    buffer += self._vector3.pack(*frame.translation)
-            return buffer
+                    stream.write(self._vector3.pack(*frame.translation))
+
+    @classmethod
+    def frombuffer(cls, buffer: bytes | memoryview, offset: int = 0) -> "KeyAnimation":
+        return cls.parse(buffer, offset)[0]
 
     @classmethod
-    def frombuffer(cls, buffer: bytes, offset: int = 0) -> "KeyAnimation":
+    def parse(
+        cls, buffer: bytes | memoryview, offset: int = 0
+    ) -> tuple["KeyAnimation", int]:
+        """Decode a key animation, returning it and the offset just past it."""
         frame_count, flags = cls._header_struct.unpack_from(buffer, offset)
+        offset += cls._header_struct.size
         if flags in (-1, -2, -3):
-            extra_size = 0
             if flags == -1:
                 matrix_struct = cls._matrix16_struct
                 real_count = frame_count + 1
@@ -70,24 +81,16 @@ class KeyAnimation:
                 real_count = frame_count + 1
             else:
                 extra_struct = Struct(cls._extra_fmt.format(count=frame_count + 1))
-                real_count, *extra_data = extra_struct.unpack_from(
-                    buffer, offset + cls._header_struct.size
-                )
+                real_count, *extra_data = extra_struct.unpack_from(buffer, offset)
                 matrix_struct = cls._matrix12_struct
-                extra_size = extra_struct.size
-            matrices = [
-                matrix_struct.unpack_from(
-                    buffer,
-                    offset
-                    + cls._header_struct.size
-                    + extra_size
-                    + matrix_struct.size * i,
-                )
-                for i in range(real_count)
-            ]
+                offset += extra_struct.size
+            matrices_size = matrix_struct.size * real_count
+            matrices = list(
+                matrix_struct.iter_unpack(buffer[offset : offset + matrices_size])
+            )
+            offset += matrices_size
         else:
             frames = []
-            offset += cls._header_struct.size
             for i in range(flags):
                 frame_id, flag = cls._pos.unpack_from(buffer, offset)
                 offset += cls._pos.size
@@ -109,10 +112,40 @@ class KeyAnimation:
                     KeyAnimationFrame(frame_id, flag, rotation, scale, translation)
                 )
 
-        return KeyAnimation(
-            frame_count,
-            flags,
-            matrices if flags in (-1, -2, -3) else [],
-            extra_data if flags == -3 else [],
-            frames if flags not in (-1, -2, -3) else [],
+        return (
+            KeyAnimation(
+                frame_count,
+                flags,
+                matrices if flags in (-1, -2, -3) else [],
+                extra_data if flags == -3 else [],
+                frames if flags not in (-1, -2, -3) else [],
+            ),
+            offset,
         )
+
+    @classmethod
+    def skip(cls, buffer: bytes | memoryview, offset: int = 0) -> int:
+        """Return the offset just past a key animation without decoding it."""
+        frame_count, flags = cls._header_struct.unpack_from(buffer, offset)
+        offset += cls._header_struct.size
+        if flags == -1:
+            return offset + cls._matrix16_struct.size * (frame_count + 1)
+        if flags == -2:
+            return offset + cls._matrix12_struct.size * (frame_count + 1)
+        if flags == -3:
+            (real_count,) = Struct(cls._extra_fmt.format(count=0)).unpack_from(
+                buffer, offset
+            )
+            offset += calcsize(cls._extra_fmt.format(count=frame_count + 1))
+            return offset + cls._matrix12_struct.size * real_count
+        for _ in range(flags):
+            _, flag = cls._pos.unpack_from(buffer, offset)
+            offset += cls._pos.size
+            assert not (flag & 0b1000111111111111)
+            if (flag >> 12) & 0b001:
+                offset += cls._quaternion.size
+            if (flag >> 12) & 0b010:
+                offset += cls._vector3.size
+            if (flag >> 12) & 0b100:
+                offset += cls._vector3.size
+        return offset
@@ -0,0 +1,203 @@
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import NamedTuple
+from struct import Struct, error as struct_error
+from xanlib.math_utils import Matrix
+from xanlib.vertex import Vertex
+from xanlib.face import Face
+from xanlib.vertex_animation import VertexAnimation
+from xanlib.key_animation import KeyAnimation
+from xanlib.node import Node
+from xanlib.scene import Scene
+
+
+class Span(NamedTuple):
+    start: int
+    end: int
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+@dataclass
+class NodeLayout:
+    """Header values and section byte spans of one node, without its geometry."""
+
+    path: str
+    offset: int
+    end: int
+    vertex_count: int
+    flags: Node.Flags
+    face_count: int
+    transform: Matrix
+    name: str
+    sections: dict[str, Span] = field(default_factory=dict)
+    children: list["NodeLayout"] = field(default_factory=list)
+
+    def __iter__(self) -> Iterator["NodeLayout"]:
+        yield self
+        for child in self.children:
+            yield from child
+
+    @property
+    def meshes(self) -> Span:
+        """Span of everything after the children: geometry, colours, animations."""
+        return Span(self.sections["vertices"].start, self.end)
+
+
+@dataclass
+class SceneLayout:
+    version: int
+    fx_data: Span
+    texture_name_data: Span
+    nodes: list[NodeLayout] = field(default_factory=list)
+    error: Exception | None = None
+    unparsed: Span | None = None
+
+    def __iter__(self) -> Iterator[NodeLayout]:
+        for node in self.nodes:
+            yield from node
+
+
+class FormatError(ValueError):
+    """A structural inconsistency at a byte offset of an XBF buffer."""
+
+    def __init__(self, message: str, offset: int, path: str = "") -> None:
+        location = f"at offset {offset}" + (f" in node {path!r}" if path else "")
+        super().__init__(f"{message} {location}")
+        self.message = message
+        self.offset = offset
+        self.path = path
+
+    def __reduce__(self) -> tuple[type, tuple[str, int, str]]:
+        return type(self), (self.message, self.offset, self.path)
+
+
+def _require(
+    buffer: bytes | memoryview, offset: int, size: int, what: str, path: str
+) -> None:
+    if size < 0:
+        raise FormatError(f"Negative {what} size {size}", offset, path)
+    if offset + size > len(buffer):
+        raise FormatError(
+            f"{what} of {size} bytes runs past the end of the buffer "
+            f"({len(buffer)})",
+            offset,
+            path,
+        )
+
+
+def skim_node(
+    buffer: bytes | memoryview, offset: int = 0, path: str = ""
+) -> NodeLayout:
+    """Walk one node and its subtree, recording spans without decoding geometry.
+
+    Raises FormatError at the first section that is inconsistent with the
+    buffer, e.g. negative counts or sizes running past its end.
+    """
+    start = offset
+    _require(buffer, offset, Node._header.size, "Node header", path)
+    vertex_count, flags, face_count, child_count, *transform, name_length = (
+        Node._header.unpack_from(buffer, offset)
+    )
+    for what, count in (
+        ("vertex", vertex_count),
+        ("face", face_count),
+        ("child", child_count),
+    ):
+        if count < 0:
+            raise FormatError(f"Negative {what} count {count}", offset, path)
+    offset += Node._header.size
+    _require(buffer, offset, name_length, "Node name", path)
+    try:
+        name = str(buffer[offset : offset + name_length], "ascii")
+    except UnicodeDecodeError as e:
+        raise FormatError(f"Node name is not ASCII ({e.reason})", offset, path)
+    offset += name_length
+    path = f"{path}/{name}" if path else name
+
+    layout = NodeLayout(
+        path=path,
+        offset=start,
+        end=start,
+        vertex_count=vertex_count,
+        flags=Node.Flags(flags),
+        face_count=face_count,
+        transform=tuple(transform),
+        name=name,
+    )
+    layout.sections["header"] = Span(start, offset)
+
+    for _ in range(child_count):
+        child = skim_node(buffer, offset, path)
+        layout.children.append(child)
+        offset = child.end
+
+    def section(name: str, size: int) -> None:
+        nonlocal offset
+        _require(buffer, offset, size, name, path)
+        layout.sections[name] = Span(offset, offset + size)
+        offset += size
+
+    def animation_size(
+        name: str, skip: Callable[[bytes | memoryview, int], int]
+    ) -> int:
+        try:
+            return skip(buffer, offset) - offset
+        except (struct_error, AssertionError, ArithmeticError) as e:
+            raise FormatError(
+                f"Malformed {name} ({e or type(e).__name__})", offset, path
+            )
+
+    section("vertices", Vertex.cstruct.size * vertex_count)
+    section("faces", Face.cstruct.size * face_count)
+    if Node.Flags.PRELIGHT in layout.flags:
+        section("rgb", Node._rgb.size * vertex_count)
+    if Node.Flags.SMOOTHING_GROUPS in layout.flags:
+        section(
+            "smoothing_groups",
+            Struct(Node._smoothing_groups.format(face_count=face_count)).size,
+        )
+    if Node.Flags.VERTEX_ANIMATION in layout.flags:
+        section(
+            "vertex_animation",
+            animation_size("vertex_animation", VertexAnimation.skip),
+        )
+    if Node.Flags.KEY_ANIMATION in layout.flags:
+        section("key_animation", animation_size("key_animation", KeyAnimation.skip))
+
+    layout.end = offset
+    return layout
+
+
+def skim_scene(buffer: bytes | memoryview, offset: int = 0) -> SceneLayout:
+    """Walk a scene buffer like Scene.frombuffer, recording layouts, not nodes.
+
+    Inconsistent scene headers raise FormatError; a node that fails to skim is
+    recorded in error and unparsed, as Scene.frombuffer does.
+    """
+    _require(buffer, offset, Scene._header.size, "Scene header", "")
+    version, fxdata_size = Scene._header.unpack_from(buffer, offset)
+    offset += Scene._header.size
+    _require(buffer, offset, fxdata_size, "FXData", "")
+    fx_data = Span(offset, offset + fxdata_size)
+    offset = fx_data.end
+    _require(buffer, offset, 4, "Texture name size", "")
+    texture_data_size = int.from_bytes(buffer[offset : offset + 4], "little")
+    offset += 4
+    _require(buffer, offset, texture_data_size, "Texture name data", "")
+    texture_name_data = Span(offset, offset + texture_data_size)
+    offset = texture_name_data.end
+
+    layout = SceneLayout(version, fx_data, texture_name_data)
+    while offset < len(buffer):
+        try:
+            node = skim_node(buffer, offset)
+        except Exception as e:
+            layout.error = e
+            layout.unparsed = Span(offset, len(buffer))
+            return layout
+        layout.nodes.append(node)
+        offset = node.end
+    return layout
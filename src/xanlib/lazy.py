@@ -0,0 +1,114 @@
+from dataclasses import fields
+from typing import Any, BinaryIO
+from xanlib.node import Node, _watched
+from xanlib.layout import NodeLayout
+from xanlib import profiling
+
+_LAZY_FIELDS = (
+    "vertices",
+    "faces",
+    "rgb",
+    "smoothing_groups",
+    "vertex_animation",
+    "key_animation",
+)
+
+
+def _lazy_field(name: str) -> property:
+    def getter(self: "LazyNode") -> Any:
+        return self._decode()[name]
+
+    def setter(self: "LazyNode", value: Any) -> None:
+        self._decode()[name] = value
+
+    return property(getter, setter)
+
+
+class LazyNode(Node):
+    """A Node whose geometry, colours and animations are decoded on first access.
+
+    The header, name and children are available immediately. Until the other
+    sections are accessed, bytes(node) copies them verbatim from the source buffer.
+    """
+
+    _buffer: Any = None
+    _layout: NodeLayout | None = None
+    _arrays: bool = False
+    _meshes: dict[str, Any] | None = None
+
+    vertices = _lazy_field("vertices")
+    faces = _lazy_field("faces")
+    rgb = _lazy_field("rgb")
+    smoothing_groups = _lazy_field("smoothing_groups")
+    vertex_animation = _lazy_field("vertex_animation")
+    key_animation = _lazy_field("key_animation")
+
+    @classmethod
+    def fromlayout(
+        cls,
+        buffer: Any,
+        layout: NodeLayout,
+        parent: Node | None = None,
+        arrays: bool = False,
+    ) -> "LazyNode":
+        node = cls.__new__(cls)
+        node.parent = parent
+        node.transform = layout.transform
+        node.name = layout.name
+        node._buffer = buffer
+        node._layout = layout
+        node._arrays = arrays
+        node.children = [
+            cls.fromlayout(buffer, child, node, arrays) for child in layout.children
+        ]
+        node._source_offset = layout.offset
+        return node
+
+    @property
+    def is_decoded(self) -> bool:
+        return self._meshes is not None
+
+    def _decode(self) -> dict[str, Any]:
+        if self._meshes is None:
+            decoded = Node(name=self.name)
+            if self._layout is not None:
+                decoded._parse_meshes(
+                    self._buffer,
+                    self._layout.meshes.start,
+                    self._layout.vertex_count,
+                    self._layout.flags,
+                    self._layout.face_count,
+                    self._arrays,
+                )
+            self._meshes = {
+                name: _watched(getattr(decoded, name), self, name)
+                for name in _LAZY_FIELDS
+            }
+        return self._meshes
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Node):
+            return NotImplemented
+        return all(
+            getattr(self, f.name) == getattr(other, f.name)
+            for f in fields(Node)
+            if f.compare
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def tostream(self, stream: BinaryIO) -> None:
+        if self._meshes is not None or self._layout is None:
+            super().tostream(stream)
+            return
+
+        layout = self._layout
+        self._header_tostream(
+            stream, layout.vertex_count, layout.flags, layout.face_count
+        )
+        for child in self.children:
+            child.tostream(stream)
+        clock = profiling.clock("save", self.name)
+        written = stream.write(self._buffer[layout.meshes.start : layout.end])
+        if clock is not None:
+            clock.lap("verbatim", written)
@@ -1,15 +1,160 @@
-from collections.abc import Iterator, Callable
-from typing import Any
-from dataclasses import dataclass, field
+from collections.abc import Iterator, Callable, Iterable, Sequence
+from typing import Any, BinaryIO, SupportsIndex
+from io import BytesIO
+from dataclasses import dataclass, field, fields
+from functools import wraps
+import weakref
 from enum import IntFlag
 from xanlib.math_utils import Matrix
 from xanlib.vertex import Vertex
 from xanlib.face import Face
 from xanlib.vertex_animation import VertexAnimation
 from xanlib.key_animation import KeyAnimation
+from xanlib import profiling
 from struct import Struct
 
 
+class NodeList(list["Node"]):
+    """A list of nodes that reports changes to the Node or Scene holding it.
+
+    Each node added to the list records that holder as an owner, and edits to
+    a node are passed on through its owners up to the scenes containing it, so
+    a scene's indexes (such as its name index) only rebuild when that scene
+    changed.
+    """
+
+    owner: Any = None
+
+    @classmethod
+    def owned(cls, nodes: Iterable["Node"], owner: Any) -> "NodeList":
+        """nodes as a NodeList held by owner, copying lists held elsewhere."""
+        if not isinstance(nodes, NodeList) or (
+            nodes.owner is not None and nodes.owner is not owner
+        ):
+            nodes = cls(nodes)
+        nodes.owner = owner
+        for node in nodes:
+            node._adopt(owner)
+        return nodes
+
+    def _changed(self, added: Iterable["Node"] = ()) -> None:
+        if self.owner is not None:
+            for node in added:
+                node._adopt(self.owner)
+            self.owner._touch("structure")
+
+    def append(self, node: "Node") -> None:
+        super().append(node)
+        self._changed((node,))
+
+    def extend(self, nodes: Iterable["Node"]) -> None:
+        nodes = list(nodes)
+        super().extend(nodes)
+        self._changed(nodes)
+
+    def insert(self, index: SupportsIndex, node: "Node") -> None:
+        super().insert(index, node)
+        self._changed((node,))
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            value = list(value)
+            super().__setitem__(index, value)
+            self._changed(value)
+        else:
+            super().__setitem__(index, value)
+            self._changed((value,))
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # Unpickling appends the nodes before restoring the owner.
+        self.__dict__.update(state)
+        if self.owner is not None:
+            for node in self:
+                node._adopt(self.owner)
+
+
+def _touching(method: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(method)
+    def wrapper(self: NodeList, *args: Any, **kwargs: Any) -> Any:
+        result = method(self, *args, **kwargs)
+        self._changed()
+        return result
+
+    return wrapper
+
+
+for _method in (
+    "remove",
+    "pop",
+    "clear",
+    "sort",
+    "reverse",
+    "__delitem__",
+    "__imul__",
+):
+    setattr(NodeList, _method, _touching(getattr(list, _method)))
+
+
+def _iadd(self: NodeList, nodes: Iterable["Node"]) -> NodeList:
+    self.extend(nodes)
+    return self
+
+
+# Set like the methods above, since typing list.__iadd__ and list.__add__
+# together does not allow overriding just one of them.
+setattr(NodeList, "__iadd__", _iadd)
+
+
+class FieldList(list[Any]):
+    """A list field of a parsed node that marks the field as changed when the
+    list is edited in place, as assigning the field does (see xanlib.patch).
+
+    Only the list itself is watched: changing the attributes of a Vertex or
+    Face it holds is not noticed.
+    """
+
+    node: "Node | None" = None
+    name = ""
+
+
+def _marking(method: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(method)
+    def wrapper(self: FieldList, *args: Any, **kwargs: Any) -> Any:
+        result = method(self, *args, **kwargs)
+        if self.node is not None:
+            self.node._mark(self.name)
+        return result
+
+    return wrapper
+
+
+for _method in (
+    "append",
+    "extend",
+    "insert",
+    "remove",
+    "pop",
+    "clear",
+    "sort",
+    "reverse",
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+):
+    setattr(FieldList, _method, _marking(getattr(list, _method)))
+
+
+def _watched(value: Any, node: "Node", name: str) -> Any:
+    """value as a FieldList marking node.name, if it is a list."""
+    if not isinstance(value, list):
+        return value
+    field_list = FieldList(value)
+    field_list.node = node
+    field_list.name = name
+    return field_list
+
+
 @dataclass
 class Node:
 
@@ -19,12 +164,12 @@ class Node:
         VERTEX_ANIMATION = 4
         KEY_ANIMATION = 8
 
-    parent: "Node | None" = None
+    parent: "Node | None" = field(default=None, compare=False)
     transform: Matrix | None = None
     name: str = ""
-    children: list["Node"] = field(default_factory=list)
-    vertices: list[Vertex] = field(default_factory=list)
-    faces: list[Face] = field(default_factory=list)
+    children: list["Node"] = field(default_factory=NodeList)
+    vertices: Sequence[Vertex] = field(default_factory=list)
+    faces: Sequence[Face] = field(default_factory=list)
     rgb: list[tuple[int, int, int]] | None = None
     smoothing_groups: list[int] | None = None
     vertex_animation: VertexAnimation | None = None
@@ -32,11 +177,64 @@ class Node:
     _header = Struct("<4i16dI")
     _rgb = Struct("<3B")
     _smoothing_groups = "<{face_count}i"
+    # Offset of the node in the buffer it was parsed from, and the fields
+    # assigned since then (see xanlib.patch).
+    _source_offset: int | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _dirty: frozenset[str] = field(
+        default=frozenset(), init=False, repr=False, compare=False
+    )
+    # The nodes and scenes whose NodeLists hold this node, as weak references.
+    _owners: tuple["weakref.ref[Any]", ...] = field(
+        default=(), init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "children":
+            value = NodeList.owned(value, self)
+        if name in ("name", "children"):
+            self._touch("structure")
+        elif name == "transform":
+            self._touch("transform")
+        elif name in ("vertices", "vertex_animation"):
+            self._touch("geometry")
+        if self._source_offset is not None and name in _TRACKED_FIELDS:
+            self._mark(name)
+        super().__setattr__(name, value)
+
+    def _mark(self, name: str) -> None:
+        object.__setattr__(self, "_dirty", self._dirty | {name})
+
+    def _watch(self) -> None:
+        """Turn the list fields into FieldLists, to notice in-place edits."""
+        for name in _LIST_FIELDS:
+            object.__setattr__(self, name, _watched(getattr(self, name), self, name))
+
+    def _adopt(self, owner: Any) -> None:
+        owners = tuple(ref for ref in self._owners if ref() is not None)
+        if not any(ref() is owner for ref in owners):
+            owners += (weakref.ref(owner),)
+        object.__setattr__(self, "_owners", owners)
+
+    def _touch(self, kind: str) -> None:
+        for ref in self._owners:
+            owner = ref()
+            if owner is not None:
+                owner._touch(kind)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Weak references cannot be pickled; NodeList restores the owners.
+        state = self.__dict__.copy()
+        state.pop("_owners", None)
+        return state
 
     def __iter__(self) -> Iterator["Node"]:
-        yield self
-        for child in self.children:
-            yield from child
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
 
     @property
     def ancestors(self) -> Iterator["Node"]:
@@ -46,45 +244,120 @@ class Node:
             node = node.parent
 
     def __bytes__(self) -> bytes:
-        extras = b""
+        stream = BytesIO()
+        self.tostream(stream)
+        return stream.getvalue()
+
+    def _flags(self) -> "Node.Flags":
         flags = Node.Flags(0)
         if self.rgb is not None:
             flags |= self.Flags.PRELIGHT
-            extras += b"".join(self._rgb.pack(*rgb) for rgb in self.rgb)
         if self.smoothing_groups is not None:
             flags |= self.Flags.SMOOTHING_GROUPS
-            smoothing_groups = Struct(
-                self._smoothing_groups.format(face_count=len(self.faces))
-            )
-            extras += smoothing_groups.pack(*self.smoothing_groups)
         if self.vertex_animation is not None:
             flags |= self.Flags.VERTEX_ANIMATION
-            extras += bytes(self.vertex_animation)
         if self.key_animation is not None:
             flags |= self.Flags.KEY_ANIMATION
-            extras += bytes(self.key_animation)
+        return flags
 
+    def _header_tostream(
+        self, stream: BinaryIO, vertex_count: int, flags: "Node.Flags", face_count: int
+    ) -> None:
         assert self.transform is not None
-        buffer = self._header.pack(
-            len(self.vertices),
-            flags,
-            len(self.faces),
-            len(self.children),
-            *self.transform,
-            len(self.name),
-        ) + self.name.encode("ascii")
+        stream.write(
+            self._header.pack(
+                vertex_count,
+                flags,
+                face_count,
+                len(self.children),
+                *self.transform,
+                len(self.name),
+            )
+        )
+        stream.write(self.name.encode("ascii"))
 
-        buffer += b"".join(bytes(child) for child in self.children)
-        buffer += b"".join(bytes(vertex) for vertex in self.vertices)
-        buffer += b"".join(bytes(face) for face in self.faces)
+    def tostream(self, stream: BinaryIO) -> None:
+        """Write the node and its subtree section by section."""
+        clock = profiling.clock("save", self.name)
+        self._header_tostream(
+            stream, len(self.vertices), self._flags(), len(self.faces)
+        )
+        if clock is not None:
+            clock.lap("header", self._header.size + len(self.name))
+        for child in self.children:
+            child.tostream(stream)
+        self._meshes_tostream(stream)
 
-        return buffer + extras
+    def _meshes_tostream(self, stream: BinaryIO) -> None:
+        clock = profiling.clock("save", self.name)
+        written = stream.write(_pack_all(self.vertices))
+        if clock is not None:
+            clock.lap("vertices", written, len(self.vertices))
+        written = stream.write(_pack_all(self.faces))
+        if clock is not None:
+            clock.lap("faces", written, len(self.faces))
+        if self.rgb is not None:
+            written = stream.write(b"".join(self._rgb.pack(*rgb) for rgb in self.rgb))
+            if clock is not None:
+                clock.lap("rgb", written, len(self.rgb))
+        if self.smoothing_groups is not None:
+            smoothing_groups = Struct(
+                self._smoothing_groups.format(face_count=len(self.faces))
+            )
+            written = stream.write(smoothing_groups.pack(*self.smoothing_groups))
+            if clock is not None:
+                clock.lap("smoothing_groups", written, len(self.smoothing_groups))
+        if self.vertex_animation is not None:
+            if clock is None:
+                self.vertex_animation.tostream(stream)
+            else:
+                data = bytes(self.vertex_animation)
+                stream.write(data)
+                clock.lap(
+                    "vertex_animation",
+                    len(data),
+                    len(self.vertex_animation.keys)
+                    + (self.vertex_animation.base_count or 0),
+                )
+        if self.key_animation is not None:
+            if clock is None:
+                self.key_animation.tostream(stream)
+            else:
+                data = bytes(self.key_animation)
+                stream.write(data)
+                clock.lap(
+                    "key_animation",
+                    len(data),
+                    len(self.key_animation.matrices) + len(self.key_animation.frames),
+                )
 
     @classmethod
     def frombuffer(
-        cls, buffer: bytes, offset: int = 0, parent: "Node | None" = None
+        cls,
+        buffer: bytes | memoryview,
+        offset: int = 0,
+        parent: "Node | None" = None,
+        arrays: bool = False,
     ) -> "Node":
+        return cls.parse(buffer, offset, parent, arrays)[0]
+
+    @classmethod
+    def parse(
+        cls,
+        buffer: bytes | memoryview,
+        offset: int = 0,
+        parent: "Node | None" = None,
+        arrays: bool = False,
+    ) -> tuple["Node", int]:
+        """Decode a node and its subtree, returning it and the offset just past it.
+
+        With arrays=True, vertices, faces and vertex animation frames are decoded
+        into numpy-backed views of the buffer (see xanlib.arrays) instead of
+        object lists.
+        """
         node = cls(parent=parent)
+        start = offset
+        clock = profiling.clock("load", "")
 
         vertex_count, flags, face_count, child_count, *transform, name_length = (
             cls._header.unpack_from(buffer, offset)
@@ -92,47 +365,114 @@ class Node:
         offset += cls._header.size
         flags = Node.Flags(flags)
         node.transform = tuple(transform)
-        node.name = buffer[offset : offset + name_length].decode("ascii")
+        node.name = str(buffer[offset : offset + name_length], "ascii")
         offset += name_length
+        if clock is not None:
+            clock.node = node.name
+            clock.lap("header", offset - start)
 
         for _ in range(child_count):
-            child = cls.frombuffer(buffer, offset, parent=node)
+            child, offset = cls.parse(buffer, offset, parent=node, arrays=arrays)
             node.children.append(child)
-            offset += len(bytes(child))
 
-        vertices_size = Vertex.cstruct.size * vertex_count
-        vertex_buffer = buffer[offset : offset + vertices_size]
-        node.vertices = [
-            Vertex(*coords) for coords in Vertex.cstruct.iter_unpack(vertex_buffer)
-        ]
-        offset += vertices_size
+        offset = node._parse_meshes(
+            buffer, offset, vertex_count, flags, face_count, arrays
+        )
+        node._source_offset = start
+        node._watch()
+
+        return node, offset
 
+    def _parse_meshes(
+        self,
+        buffer: bytes | memoryview,
+        offset: int,
+        vertex_count: int,
+        flags: "Node.Flags",
+        face_count: int,
+        arrays: bool = False,
+    ) -> int:
+        """Decode the sections that follow the children, returning the end offset."""
+        clock = profiling.clock("load", self.name)
+        vertices_size = Vertex.cstruct.size * vertex_count
         faces_size = Face.cstruct.size * face_count
-        face_buffer = buffer[offset : offset + faces_size]
-        node.faces = [Face(*fields) for fields in Face.cstruct.iter_unpack(face_buffer)]
-        offset += faces_size
+        if arrays:
+            from xanlib.arrays import VertexArray, FaceArray
+
+            self.vertices = VertexArray.frombuffer(buffer, vertex_count, offset)
+            offset += vertices_size
+            if clock is not None:
+                clock.lap("vertices", vertices_size, vertex_count)
+            self.faces = FaceArray.frombuffer(buffer, face_count, offset)
+            offset += faces_size
+        else:
+            vertex_buffer = buffer[offset : offset + vertices_size]
+            self.vertices = [
+                Vertex(*coords) for coords in Vertex.cstruct.iter_unpack(vertex_buffer)
+            ]
+            offset += vertices_size
+            if clock is not None:
+                clock.lap("vertices", vertices_size, vertex_count)
+
+            face_buffer = buffer[offset : offset + faces_size]
+            self.faces = [
+                Face(*fields) for fields in Face.cstruct.iter_unpack(face_buffer)
+            ]
+            offset += faces_size
+        if clock is not None:
+            clock.lap("faces", faces_size, face_count)
 
         if Node.Flags.PRELIGHT in flags:
-            rgb_buffer = buffer[offset : offset + cls._rgb.size * vertex_count]
-            node.rgb = [rgb_tuple for rgb_tuple in cls._rgb.iter_unpack(rgb_buffer)]
-            offset += cls._rgb.size * vertex_count
+            rgb_buffer = buffer[offset : offset + self._rgb.size * vertex_count]
+            self.rgb = [rgb_tuple for rgb_tuple in self._rgb.iter_unpack(rgb_buffer)]
+            offset += self._rgb.size * vertex_count
+            if clock is not None:
+                clock.lap("rgb", self._rgb.size * vertex_count, vertex_count)
 
         if Node.Flags.SMOOTHING_GROUPS in flags:
             smoothing_groups = Struct(
-                cls._smoothing_groups.format(face_count=face_count)
+                self._smoothing_groups.format(face_count=face_count)
             )
-            node.smoothing_groups = list(smoothing_groups.unpack_from(buffer, offset))
+            self.smoothing_groups = list(smoothing_groups.unpack_from(buffer, offset))
             offset += smoothing_groups.size
+            if clock is not None:
+                clock.lap("smoothing_groups", smoothing_groups.size, face_count)
 
         if Node.Flags.VERTEX_ANIMATION in flags:
-            node.vertex_animation = VertexAnimation.frombuffer(buffer, offset)
-            offset += len(bytes(node.vertex_animation))
+            section_start = offset
+            self.vertex_animation, offset = VertexAnimation.parse(
+                buffer, offset, arrays
+            )
+            if clock is not None:
+                clock.lap(
+                    "vertex_animation",
+                    offset - section_start,
+                    len(self.vertex_animation.keys)
+                    + (self.vertex_animation.base_count or 0),
+                )
 
         if Node.Flags.KEY_ANIMATION in flags:
-            node.key_animation = KeyAnimation.frombuffer(buffer, offset)
-            offset += len(bytes(node.key_animation))
+            section_start = offset
+            self.key_animation, offset = KeyAnimation.parse(buffer, offset)
+            if clock is not None:
+                clock.lap(
+                    "key_animation",
+                    offset - section_start,
+                    len(self.key_animation.matrices) + len(self.key_animation.frames),
+                )
+
+        return offset
+
+
+_TRACKED_FIELDS = frozenset(f.name for f in fields(Node) if f.init) - {"parent"}
+_LIST_FIELDS = ("vertices", "faces", "rgb", "smoothing_groups")
+
 
-        return node
+def _pack_all(items: Iterable[Vertex] | Iterable[Face]) -> bytes:
+    tobytes = getattr(items, "tobytes", None)
+    if tobytes is not None:
+        return tobytes()
+    return b"".join(bytes(item) for item in items)
 
 
 def traverse(
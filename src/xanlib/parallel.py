@@ -0,0 +1,65 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+import sys
+from xanlib.node import Node
+from xanlib.layout import NodeLayout
+
+
+def gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def _parse(buffer: Any, offset: int, arrays: bool) -> Node:
+    return Node.parse(buffer, offset, arrays=arrays)[0]
+
+
+def parse_nodes(
+    buffer: Any,
+    layouts: list[NodeLayout],
+    workers: int | None = None,
+    arrays: bool = False,
+    processes: bool | None = None,
+) -> tuple[list[Node], Exception | None, int | None]:
+    """Decode skimmed top-level nodes in parallel, keeping their order.
+
+    Threads share the buffer, and are used by default for array-backed
+    decodes, which spend most of their time outside the interpreter, and
+    when the interpreter runs without the GIL. Otherwise each node's bytes
+    are sent to a process pool and the decoded subtree pickled back, which
+    only pays off with more cores than the pickling costs.
+    Returns the nodes decoded before the first failure, that failure, and its
+    offset.
+    """
+    if processes is None:
+        processes = gil_enabled() and not arrays
+    executor: Executor
+    if processes:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        futures = [
+            executor.submit(
+                _parse, bytes(buffer[layout.offset : layout.end]), 0, arrays
+            )
+            for layout in layouts
+        ]
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = [
+            executor.submit(_parse, buffer, layout.offset, arrays) for layout in layouts
+        ]
+
+    nodes: list[Node] = []
+    try:
+        for layout, future in zip(layouts, futures):
+            try:
+                node = future.result()
+            except Exception as e:
+                return nodes, e, layout.offset
+            if processes:
+                for descendant in node:
+                    if descendant._source_offset is not None:
+                        descendant._source_offset += layout.offset
+            nodes.append(node)
+    finally:
+        executor.shutdown(cancel_futures=True)
+    return nodes, None, None
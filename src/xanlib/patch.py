@@ -0,0 +1,128 @@
+from os import PathLike
+import mmap as _mmap
+import os
+import shutil
+from struct import Struct
+from typing import Any
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.layout import NodeLayout, skim_scene
+from xanlib.xbf_io import save_xbf
+
+# Edits that keep the byte layout, and so can be patched into the source file.
+PATCHABLE_FIELDS = frozenset({"transform", "rgb"})
+
+_transform = Struct("<16d")
+# Offset of the transform within a node header: vertex, flag, face and
+# child counts come first.
+_TRANSFORM_OFFSET = Struct("<4i").size
+
+
+def _matches(nodes: list[Node], layouts: list[NodeLayout]) -> bool:
+    """Whether the node tree still has the structure it was loaded with."""
+    if len(nodes) != len(layouts):
+        return False
+    return all(
+        node._source_offset == layout.offset
+        and node.name == layout.name
+        and _matches(node.children, layout.children)
+        for node, layout in zip(nodes, layouts)
+    )
+
+
+def _node_patches(node: Node, layout: NodeLayout) -> list[tuple[int, bytes]] | None:
+    patches = []
+    if "transform" in node._dirty:
+        if node.transform is None or len(node.transform) != 16:
+            return None
+        patches.append(
+            (layout.offset + _TRANSFORM_OFFSET, _transform.pack(*node.transform))
+        )
+    if "rgb" in node._dirty:
+        span = layout.sections.get("rgb")
+        if span is None or node.rgb is None or len(node.rgb) != layout.vertex_count:
+            return None
+        patches.append((span.start, b"".join(Node._rgb.pack(*rgb) for rgb in node.rgb)))
+    return patches
+
+
+def find_patches(scene: Scene) -> list[tuple[int, bytes]] | None:
+    """The (offset, bytes) writes that turn the source file into the scene.
+
+    Returns None if the scene was not loaded from a file, the file changed
+    since, or the scene has edits that need a full write: structural changes,
+    assignments to fields other than transform and rgb, or an rgb list of a
+    different length. Lists edited in place, such as node.rgb[0] = ..., count
+    as assigned (see FieldList); changing a Vertex, Face or animation in place
+    is not noticed, so assign the field after doing so.
+    """
+    source = scene._source
+    if source is None:
+        return None
+    try:
+        stat = os.stat(source.path)
+    except OSError:
+        return None
+    if (stat.st_size, stat.st_mtime_ns) != (source.size, source.mtime_ns):
+        return None
+
+    with open(source.path, "rb") as stream:
+        with _mmap.mmap(stream.fileno(), 0, access=_mmap.ACCESS_READ) as mapping:
+            with memoryview(mapping) as view, view[:-4] as buffer:
+                return _scene_patches(scene, buffer)
+
+
+def _scene_patches(scene: Scene, buffer: Any) -> list[tuple[int, bytes]] | None:
+    layout = skim_scene(buffer)
+    if not (
+        layout.error is None
+        and scene.unparsed is None
+        and layout.version == scene.version
+        and buffer[slice(*layout.fx_data)] == scene.FXData
+        and buffer[slice(*layout.texture_name_data)] == scene.textureNameData
+        and _matches(scene.nodes, layout.nodes)
+    ):
+        return None
+
+    patches: list[tuple[int, bytes]] = []
+    for node, node_layout in zip(scene, layout):
+        if not node._dirty:
+            continue
+        if not node._dirty <= PATCHABLE_FIELDS:
+            return None
+        node_patches = _node_patches(node, node_layout)
+        if node_patches is None:
+            return None
+        patches.extend(node_patches)
+    return patches
+
+
+def patch_xbf(scene: Scene, filename: str | PathLike, streaming: bool = False) -> bool:
+    """Save a scene by patching its changed bytes into its source file.
+
+    If filename is the source file, it is patched in place; otherwise the
+    source is copied to filename first. Falls back to a full save_xbf when
+    the edits cannot be patched (see find_patches). Returns whether the file
+    was patched.
+    """
+    patches = find_patches(scene)
+    if patches is None:
+        save_xbf(scene, filename, streaming)
+        return False
+
+    source = scene._source
+    assert source is not None
+    in_place = os.path.exists(filename) and os.path.samefile(source.path, filename)
+    if not in_place:
+        shutil.copyfile(source.path, filename)
+    with open(filename, "r+b") as stream:
+        for offset, data in patches:
+            stream.seek(offset)
+            stream.write(data)
+
+    if in_place:
+        stat = os.stat(filename)
+        scene._source = source._replace(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        for node in scene:
+            node._dirty = frozenset()
+    return True
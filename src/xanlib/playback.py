@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from typing import NamedTuple
+import math
+import numpy as np
+import numpy.typing as npt
+from xanlib.vertex_animation import VertexAnimation
+from xanlib.arrays import CompressedFrames, decode_normals
+
+# Logical frame f shows stored frame keys[f], as in examples/xbf_viewer.py,
+# and playback loops over len(keys) logical frames.
+# The meaning of the low bits of VertexAnimation.scale is not known, so
+# positions are multiplied by a caller-supplied position_scale instead.
+
+
+class Mesh(NamedTuple):
+    positions: npt.NDArray[np.float32]
+    normals: npt.NDArray[np.float32]
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+
+class VertexAnimationPlayer:
+    """Meshes of a vertex animation by logical frame.
+
+    Stored frames are decoded to float arrays once and kept in an LRU cache of
+    cache_size frames. Fractional frames are linearly interpolated between
+    the surrounding keys when the animation has interpolation data, and
+    floored to a whole frame otherwise.
+    """
+
+    def __init__(
+        self,
+        animation: VertexAnimation,
+        cache_size: int = 32,
+        position_scale: float = 1.0,
+    ) -> None:
+        if not animation.frames or not animation.keys:
+            raise ValueError("Vertex animation has no compressed frames")
+        self.animation = animation
+        self.cache_size = cache_size
+        self.position_scale = position_scale
+        self._cache: OrderedDict[int, Mesh] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.animation.keys)
+
+    @property
+    def interpolated(self) -> bool:
+        return bool(self.animation.interpolation_data)
+
+    def _decode(self, stored: int) -> Mesh:
+        frames = self.animation.frames
+        if stored >= len(frames):
+            raise IndexError(
+                f"Key {stored} is past the last stored frame ({len(frames) - 1})"
+            )
+        if isinstance(frames, CompressedFrames):
+            data = frames.data[stored]
+        else:
+            data = CompressedFrames.fromframes([frames[stored]]).data[0]
+        positions = np.stack([data["x"], data["y"], data["z"]], axis=-1).astype(
+            np.float32
+        )
+        positions *= self.position_scale
+        normals = decode_normals(data["normal_packed"])
+        positions.flags.writeable = False
+        normals.flags.writeable = False
+        return Mesh(positions, normals)
+
+    def stored_frame(self, stored: int) -> Mesh:
+        """The decoded mesh of one stored frame, from the cache if present."""
+        mesh = self._cache.get(stored)
+        if mesh is not None:
+            self._hits += 1
+            self._cache.move_to_end(stored)
+            return mesh
+        self._misses += 1
+        mesh = self._decode(stored)
+        if self.cache_size > 0:
+            self._cache[stored] = mesh
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return mesh
+
+    def mesh(self, frame: float) -> Mesh:
+        """The mesh at a logical frame, looping past the last one."""
+        keys = self.animation.keys
+        whole = math.floor(frame)
+        current = self.stored_frame(keys[whole % len(keys)])
+        alpha = frame - whole
+        if not alpha or not self.interpolated:
+            return current
+        following = self.stored_frame(keys[(whole + 1) % len(keys)])
+        return Mesh(
+            current.positions + (following.positions - current.positions) * alpha,
+            current.normals + (following.normals - current.normals) * alpha,
+        )
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, len(self._cache), self.cache_size)
+
+    def cache_clear(self) -> None:
+        self._cache.clear()
+        self._hits = self._misses = 0
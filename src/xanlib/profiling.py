@@ -0,0 +1,138 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import NamedTuple
+
+# Instrumented code checks `profiling.active` once per node or file and does
+# nothing more while it is None, so profiling costs nothing when disabled.
+
+
+class ProfileEvent(NamedTuple):
+    """Time spent on one section of one node, or one step of a file.
+
+    operation is "load" or "save"; node is the node name, or the file name
+    for file-level steps ("read", "parse", "encode", "write").
+    elements counts what the section holds: vertices, faces, colours,
+    smoothing groups, or compressed vertices and keys of animations.
+    """
+
+    operation: str
+    node: str
+    section: str
+    seconds: float
+    bytes: int
+    elements: int
+
+
+@dataclass
+class SectionStats:
+    calls: int = 0
+    seconds: float = 0.0
+    bytes: int = 0
+    elements: int = 0
+
+    def add(self, event: ProfileEvent) -> None:
+        self.calls += 1
+        self.seconds += event.seconds
+        self.bytes += event.bytes
+        self.elements += event.elements
+
+
+@dataclass
+class ProfileReport:
+    events: list[ProfileEvent] = field(default_factory=list)
+
+    def by_section(self) -> dict[tuple[str, str], SectionStats]:
+        """Totals per (operation, section)."""
+        totals: dict[tuple[str, str], SectionStats] = {}
+        for event in self.events:
+            totals.setdefault((event.operation, event.section), SectionStats()).add(
+                event
+            )
+        return totals
+
+    def by_node(self) -> dict[tuple[str, str], SectionStats]:
+        """Totals per (operation, node name), files included."""
+        totals: dict[tuple[str, str], SectionStats] = {}
+        for event in self.events:
+            totals.setdefault((event.operation, event.node), SectionStats()).add(event)
+        return totals
+
+    def format(self) -> str:
+        lines = [
+            f"{'operation':<10} {'section':<18} {'calls':>7} {'ms':>10} "
+            f"{'MB':>9} {'elements':>11}"
+        ]
+        for (operation, section), stats in sorted(
+            self.by_section().items(), key=lambda item: -item[1].seconds
+        ):
+            lines.append(
+                f"{operation:<10} {section:<18} {stats.calls:>7} "
+                f"{stats.seconds * 1e3:>10.2f} {stats.bytes / 1e6:>9.3f} "
+                f"{stats.elements:>11}"
+            )
+        return "\n".join(lines)
+
+
+class Profiler:
+    def __init__(self, callback: Callable[[ProfileEvent], None] | None) -> None:
+        self.report = ProfileReport()
+        self.callback = callback
+
+    def record(self, event: ProfileEvent) -> None:
+        self.report.events.append(event)
+        if self.callback is not None:
+            self.callback(event)
+
+    def clock(self, operation: str, node: str) -> "Clock":
+        return Clock(self, operation, node)
+
+
+class Clock:
+    """Times consecutive sections of one node or file."""
+
+    def __init__(self, profiler: Profiler, operation: str, node: str) -> None:
+        self.profiler = profiler
+        self.operation = operation
+        self.node = node
+        self.start = perf_counter()
+
+    def lap(self, section: str, size: int, elements: int = 0) -> None:
+        now = perf_counter()
+        self.profiler.record(
+            ProfileEvent(
+                self.operation, self.node, section, now - self.start, size, elements
+            )
+        )
+        self.start = now
+
+
+active: Profiler | None = None
+
+
+def clock(operation: str, node: str) -> Clock | None:
+    """A Clock for the active profiler, or None when profiling is disabled."""
+    if active is None:
+        return None
+    return active.clock(operation, node)
+
+
+@contextmanager
+def profile(
+    callback: Callable[[ProfileEvent], None] | None = None,
+) -> Iterator[ProfileReport]:
+    """Record load and save timings inside the block.
+
+    Yields a ProfileReport that fills up as the block runs; each event is also
+    passed to callback, if given. Profiling is process-wide: loads and saves
+    in other threads during the block are recorded too.
+    """
+    global active
+    previous = active
+    profiler = Profiler(callback)
+    active = profiler
+    try:
+        yield profiler.report
+    finally:
+        active = previous
@@ -0,0 +1,243 @@
+from typing import NamedTuple
+import numpy as np
+import numpy.typing as npt
+from xanlib.math_utils import Matrix
+from xanlib.key_animation import KeyAnimation
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.transforms import flatten_hierarchy, compose_hierarchy
+
+# Matrices use the layout of Node.transform reshaped to 4x4, so points are
+# transformed as row vectors: [x, y, z, 1] @ matrix.
+# 12-float key animation matrices are read the same way, without the
+# homogeneous column: four rows of three.
+# Quaternions are (w, x, y, z) in the Hamilton convention.
+
+
+class SampledTransforms(NamedTuple):
+    """Transforms of every node of a scene at each sampled time.
+
+    matrices has shape (len(nodes), len(times), 4, 4); nodes are in
+    depth-first order.
+    """
+
+    nodes: list[Node]
+    times: npt.NDArray[np.float64]
+    matrices: npt.NDArray[np.float64]
+    rows: dict[int, int]
+
+    def matrix(self, node: Node) -> npt.NDArray[np.float64]:
+        return self.matrices[self.rows[id(node)]]
+
+
+def slerp(
+    q0: npt.ArrayLike, q1: npt.ArrayLike, t: npt.ArrayLike
+) -> npt.NDArray[np.float64]:
+    """Spherical linear interpolation of (..., 4) quaternions along the
+    shortest arc, with t broadcast against their leading axes."""
+    q0 = np.asarray(q0, np.float64)
+    q1 = np.asarray(q1, np.float64)
+    t = np.asarray(t, np.float64)[..., None]
+    dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+    q1 = np.where(dot < 0, -q1, q1)
+    dot = np.clip(np.abs(dot), 0.0, 1.0)
+    theta = np.arccos(dot)
+    sin_theta = np.sin(theta)
+    small = sin_theta < 1e-6
+    safe = np.where(small, 1.0, sin_theta)
+    w0 = np.where(small, 1 - t, np.sin((1 - t) * theta) / safe)
+    w1 = np.where(small, t, np.sin(t * theta) / safe)
+    result = w0 * q0 + w1 * q1
+    return result / np.linalg.norm(result, axis=-1, keepdims=True)
+
+
+def quaternion_to_matrix(q: npt.ArrayLike) -> npt.NDArray[np.float64]:
+    """(..., 4) quaternions to (..., 3, 3) rotations in the row-vector layout."""
+    w, x, y, z = np.moveaxis(np.asarray(q, np.float64), -1, 0)
+    rotation = np.stack(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+            [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+            [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+    return np.moveaxis(rotation, (0, 1), (-1, -2))
+
+
+def matrix_to_quaternion(rotation: npt.ArrayLike) -> npt.NDArray[np.float64]:
+    """A 3x3 rotation in the row-vector layout to a (w, x, y, z) quaternion."""
+    m = np.asarray(rotation, np.float64).T
+    trace = np.trace(m)
+    if trace > 0:
+        s = 2 * np.sqrt(trace + 1)
+        q = [
+            s / 4,
+            (m[2, 1] - m[1, 2]) / s,
+            (m[0, 2] - m[2, 0]) / s,
+            (m[1, 0] - m[0, 1]) / s,
+        ]
+    elif m[0, 0] > m[1, 1] and m[0, 0] > m[2, 2]:
+        s = 2 * np.sqrt(1 + m[0, 0] - m[1, 1] - m[2, 2])
+        q = [
+            (m[2, 1] - m[1, 2]) / s,
+            s / 4,
+            (m[0, 1] + m[1, 0]) / s,
+            (m[0, 2] + m[2, 0]) / s,
+        ]
+    elif m[1, 1] > m[2, 2]:
+        s = 2 * np.sqrt(1 + m[1, 1] - m[0, 0] - m[2, 2])
+        q = [
+            (m[0, 2] - m[2, 0]) / s,
+            (m[0, 1] + m[1, 0]) / s,
+            s / 4,
+            (m[1, 2] + m[2, 1]) / s,
+        ]
+    else:
+        s = 2 * np.sqrt(1 + m[2, 2] - m[0, 0] - m[1, 1])
+        q = [
+            (m[1, 0] - m[0, 1]) / s,
+            (m[0, 2] + m[2, 0]) / s,
+            (m[1, 2] + m[2, 1]) / s,
+            s / 4,
+        ]
+    return np.array(q)
+
+
+def compose(
+    rotation: npt.ArrayLike, scale: npt.ArrayLike, translation: npt.ArrayLike
+) -> npt.NDArray[np.float64]:
+    """(..., 4, 4) matrices that scale, then rotate, then translate."""
+    rotation_matrix = quaternion_to_matrix(rotation)
+    scale = np.asarray(scale, np.float64)
+    translation = np.asarray(translation, np.float64)
+    shape = rotation_matrix.shape[:-2]
+    matrices = np.zeros((*shape, 4, 4))
+    matrices[..., :3, :3] = scale[..., :, None] * rotation_matrix
+    matrices[..., 3, :3] = translation
+    matrices[..., 3, 3] = 1.0
+    return matrices
+
+
+def decompose(
+    transform: Matrix | None,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Split a Node.transform into rotation, scale and translation."""
+    if transform is None:
+        return np.array([1.0, 0, 0, 0]), np.ones(3), np.zeros(3)
+    matrix = np.asarray(transform, np.float64).reshape(4, 4)
+    scale = np.linalg.norm(matrix[:3, :3], axis=1)
+    rotation = matrix_to_quaternion(matrix[:3, :3] / np.where(scale, scale, 1)[:, None])
+    return rotation, scale, matrix[3, :3].copy()
+
+
+def _sample_channel(
+    key_times: npt.NDArray[np.float64],
+    values: npt.NDArray[np.float64],
+    times: npt.NDArray[np.float64],
+    rotation: bool,
+) -> npt.NDArray[np.float64]:
+    after = np.searchsorted(key_times, times, side="right")
+    i1 = np.clip(after, 0, len(key_times) - 1)
+    i0 = np.clip(after - 1, 0, len(key_times) - 1)
+    span = key_times[i1] - key_times[i0]
+    alpha = np.where(span > 0, (times - key_times[i0]) / np.where(span, span, 1), 0.0)
+    if rotation:
+        return slerp(values[i0], values[i1], alpha)
+    return values[i0] + (values[i1] - values[i0]) * alpha[:, None]
+
+
+def matrix_frame_indices(
+    animation: KeyAnimation, times: npt.ArrayLike
+) -> npt.NDArray[np.intp]:
+    """Which stored matrix each time reads, for the matrix modes -1, -2 and -3.
+
+    Times are floored to whole frames and clamped to the animation; mode -3
+    then maps each frame through extra_data.
+    """
+    frames = np.clip(
+        np.floor(np.asarray(times, np.float64)).astype(np.intp),
+        0,
+        animation.frame_count,
+    )
+    if animation.flags == -3:
+        frames = np.asarray(animation.extra_data, np.intp)[frames]
+    return np.clip(frames, 0, len(animation.matrices) - 1)
+
+
+def sample_key_animation(
+    animation: KeyAnimation, times: npt.ArrayLike, rest: Matrix | None = None
+) -> npt.NDArray[np.float64]:
+    """Local (len(times), 4, 4) matrices of a key animation at the given frames.
+
+    Keyframe animations slerp rotations and lerp scale and translation between
+    the surrounding keys of each channel, holding the first and last keys
+    outside their range. Channels with no keys come from rest, usually the
+    node's static transform. Matrix animations read their stored matrices.
+    """
+    times = np.atleast_1d(np.asarray(times, np.float64))
+    if animation.flags in (-1, -2, -3):
+        if animation.flags == -1:
+            stored = np.array(animation.matrices, np.float64).reshape(-1, 4, 4)
+        else:
+            stored = np.zeros((len(animation.matrices), 4, 4))
+            stored[:, :, :3] = np.array(animation.matrices, np.float64).reshape(
+                -1, 4, 3
+            )
+            stored[:, 3, 3] = 1.0
+        return stored[matrix_frame_indices(animation, times)]
+
+    rest_rotation, rest_scale, rest_translation = decompose(rest)
+    frames = sorted(animation.frames, key=lambda frame: frame.frame_id)
+    channels = []
+    for name, default in (
+        ("rotation", rest_rotation),
+        ("scale", rest_scale),
+        ("translation", rest_translation),
+    ):
+        keyed = [frame for frame in frames if getattr(frame, name) is not None]
+        if not keyed:
+            channels.append(np.broadcast_to(default, (len(times), len(default))))
+            continue
+        key_times = np.array([frame.frame_id for frame in keyed], np.float64)
+        if name == "rotation":
+            values = np.array(
+                [(frame.rotation.w, *frame.rotation.v) for frame in keyed],  # type: ignore[union-attr]
+                np.float64,
+            )
+        else:
+            values = np.array([getattr(frame, name) for frame in keyed], np.float64)
+        channels.append(
+            _sample_channel(key_times, values, times, rotation=name == "rotation")
+        )
+    return compose(*channels)
+
+
+def sample_node(node: Node, times: npt.ArrayLike) -> npt.NDArray[np.float64]:
+    """Local (len(times), 4, 4) matrices of a node, animated or not."""
+    times = np.atleast_1d(np.asarray(times, np.float64))
+    if node.key_animation is not None:
+        return sample_key_animation(node.key_animation, times, node.transform)
+    transform = np.eye(4) if node.transform is None else node.transform
+    return np.broadcast_to(
+        np.asarray(transform, np.float64).reshape(4, 4), (len(times), 4, 4)
+    ).copy()
+
+
+def sample_scene(
+    scene: Scene, times: npt.ArrayLike, world: bool = True
+) -> SampledTransforms:
+    """Sample every node at every time in one call.
+
+    With world=True (the default) the local matrices are composed down the
+    hierarchy, one batched multiplication per depth level.
+    """
+    times = np.atleast_1d(np.asarray(times, np.float64))
+    nodes, parents, depths = flatten_hierarchy(scene)
+    matrices = np.empty((len(nodes), len(times), 4, 4))
+    for row, node in enumerate(nodes):
+        matrices[row] = sample_node(node, times)
+    if world:
+        compose_hierarchy(matrices, parents, depths)
+    return SampledTransforms(
+        nodes, times, matrices, {id(node): row for row, node in enumerate(nodes)}
+    )
@@ -1,50 +1,166 @@
 from collections.abc import Iterator
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, BinaryIO, NamedTuple
+from io import BytesIO
 import re
-from xanlib.node import Node, traverse
+from xanlib.node import Node, NodeList, traverse
+from xanlib import profiling
 from struct import Struct
 
+if TYPE_CHECKING:
+    from xanlib.fx_data import AnimationTable
+
+
+class SourceFile(NamedTuple):
+    """The file a scene was loaded from, as it was when loaded."""
+
+    path: str
+    size: int
+    mtime_ns: int
+
 
 @dataclass
 class Scene:
     version: int | None = None
-    FXData: bytes = b""
-    textureNameData: bytes = b""
-    nodes: list[Node] = field(default_factory=list)
+    FXData: bytes | memoryview = b""
+    textureNameData: bytes | memoryview = b""
+    nodes: list[Node] = field(default_factory=NodeList)
     error: Exception | None = None
-    unparsed: bytes | None = None
+    unparsed: bytes | memoryview | None = None
     _header = Struct("<2i")
+    _name_index: dict[str, list[Node]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _name_index_generation: int = field(
+        default=-1, init=False, repr=False, compare=False
+    )
+    # Bumped by changes to the node hierarchy or node names (see NodeList).
+    _structure_generation: int = field(default=0, init=False, repr=False, compare=False)
+    # Bumped by node transform assignments.
+    _transform_generation: int = field(default=0, init=False, repr=False, compare=False)
+    # Bumped by node vertices and vertex animation assignments.
+    _geometry_generation: int = field(default=0, init=False, repr=False, compare=False)
+    _world_transforms: Any = field(default=None, init=False, repr=False, compare=False)
+    _bounds: Any = field(default=None, init=False, repr=False, compare=False)
+    _animations: "AnimationTable | None" = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _textures: tuple[str, ...] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _source: SourceFile | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "nodes":
+            value = NodeList.owned(value, self)
+            self._touch("structure")
+        elif name == "FXData":
+            super().__setattr__("_animations", None)
+        elif name == "textureNameData":
+            super().__setattr__("_textures", None)
+        super().__setattr__(name, value)
+
+    def _touch(self, kind: str) -> None:
+        name = f"_{kind}_generation"
+        super().__setattr__(name, getattr(self, name) + 1)
+
+    @property
+    def animations(self) -> "AnimationTable":
+        """The animation table of FXData, parsed on first access."""
+        if self._animations is None:
+            from xanlib.fx_data import AnimationTable
+
+            self._animations = AnimationTable.frombuffer(self.FXData)
+        return self._animations
 
     @property
     def textures(self) -> list[str]:
-        return [
-            texture.decode("ascii")
-            for texture in re.split(b"\x00\x00|\x00\x02", self.textureNameData)
-            if texture
-        ]
+        """The texture names of textureNameData, split on first access."""
+        if self._textures is None:
+            self._textures = tuple(split_texture_names(self.textureNameData))
+        return list(self._textures)
 
     def __iter__(self) -> Iterator[Node]:
-        for node in self.nodes:
-            yield from node
+        stack = list(reversed(self.nodes))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def _names(self) -> dict[str, list[Node]]:
+        if (
+            self._name_index is None
+            or self._name_index_generation != self._structure_generation
+        ):
+            index: dict[str, list[Node]] = {}
+            for node in self:
+                index.setdefault(node.name, []).append(node)
+            self._name_index = index
+            self._name_index_generation = self._structure_generation
+        return self._name_index
+
+    def find_all(self, name: str) -> list[Node]:
+        """All nodes with the given name, in depth-first order."""
+        return list(self._names().get(name, []))
 
     def __getitem__(self, name: str) -> Node:
-        return next(node for node in self if node.name == name)
+        """Look up a node by name, or by a '/'-separated path of names.
+
+        If several nodes share a name, the first in depth-first order is
+        returned. Exact names take precedence over paths, since node names
+        may themselves contain '/'.
+        """
+        nodes = self._names().get(name)
+        if nodes:
+            return nodes[0]
+        if "/" in name:
+            node = _find_path(self.nodes, name.split("/"))
+            if node is not None:
+                return node
+        raise KeyError(name)
 
     def __bytes__(self) -> bytes:
-        buffer = (
-            self._header.pack(self.version, len(self.FXData))
-            + self.FXData
-            + len(self.textureNameData).to_bytes(4, "little")
-            + self.textureNameData
-            + b"".join(bytes(node) for node in self.nodes)
-        )
-        if self.unparsed is not None:
-            buffer += self.unparsed
+        stream = BytesIO()
+        self.tostream(stream)
+        return stream.getvalue()
 
-        return buffer
+    def tostream(self, stream: BinaryIO) -> None:
+        clock = profiling.clock("save", "")
+        stream.write(self._header.pack(self.version, len(self.FXData)))
+        stream.write(self.FXData)
+        stream.write(len(self.textureNameData).to_bytes(4, "little"))
+        stream.write(self.textureNameData)
+        if clock is not None:
+            clock.lap(
+                "scene_header",
+                self._header.size + len(self.FXData) + 4 + len(self.textureNameData),
+            )
+        for node in self.nodes:
+            node.tostream(stream)
+        if self.unparsed is not None:
+            stream.write(self.unparsed)
 
     @classmethod
-    def frombuffer(cls, buffer: bytes, offset: int = 0) -> "Scene":
+    def frombuffer(
+        cls,
+        buffer: bytes | memoryview,
+        offset: int = 0,
+        arrays: bool = False,
+        lazy: bool = False,
+        workers: int | None = None,
+    ) -> "Scene":
+        """Decode a scene from a buffer that excludes the trailing EOF marker.
+
+        With lazy=True, nodes are only skimmed for their header, name and byte
+        span; their geometry and animations are decoded on first access.
+
+        With workers greater than 1 (and lazy=False), the top-level nodes are
+        skimmed first and then decoded in parallel (see xanlib.parallel).
+        """
+        clock = profiling.clock("load", "")
+        start = offset
         scene = Scene()
         scene.version, fxdata_size = cls._header.unpack_from(buffer, offset)
         scene.FXData = buffer[cls._header.size : cls._header.size + fxdata_size]
@@ -56,11 +172,36 @@ class Scene:
         offset += 4
         scene.textureNameData = buffer[offset : offset + texture_data_size]
         offset += texture_data_size
+        if clock is not None:
+            clock.lap("scene_header", offset - start)
+        if workers is not None and workers > 1 and not lazy:
+            from xanlib.layout import skim_scene
+            from xanlib.parallel import parse_nodes
+
+            scene_layout = skim_scene(buffer)
+            nodes, scene.error, error_offset = parse_nodes(
+                buffer, scene_layout.nodes, workers, arrays
+            )
+            scene.nodes.extend(nodes)
+            if scene.error is None and scene_layout.error is not None:
+                scene.error = scene_layout.error
+                error_offset = scene_layout.unparsed.start  # type: ignore[union-attr]
+            if scene.error is not None:
+                scene.unparsed = buffer[error_offset:]
+            return scene
         while offset < len(buffer):
             try:
-                node = Node.frombuffer(buffer, offset)
+                node: Node
+                if lazy:
+                    from xanlib.layout import skim_node
+                    from xanlib.lazy import LazyNode
+
+                    node_layout = skim_node(buffer, offset)
+                    node = LazyNode.fromlayout(buffer, node_layout, arrays=arrays)
+                    offset = node_layout.end
+                else:
+                    node, offset = Node.parse(buffer, offset, arrays=arrays)
                 scene.nodes.append(node)
-                offset += len(bytes(node))
             except Exception as e:
                 scene.error = e
                 scene.unparsed = buffer[offset:]
@@ -68,6 +209,26 @@ class Scene:
         return scene
 
 
+def split_texture_names(data: bytes | memoryview) -> list[str]:
+    return [
+        texture.decode("ascii")
+        for texture in re.split(b"\x00\x00|\x00\x02", bytes(data))
+        if texture
+    ]
+
+
+def _find_path(nodes: list[Node], names: list[str]) -> Node | None:
+    first, *rest = names
+    for node in nodes:
+        if node.name == first:
+            if not rest:
+                return node
+            found = _find_path(node.children, rest)
+            if found is not None:
+                return found
+    return None
+
+
 def print_node_names(scene: Scene) -> None:
     for node in scene.nodes:
         traverse(node, lambda n, depth, **kwargs: print(" " * depth * 2 + n.name))
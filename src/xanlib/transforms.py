@@ -0,0 +1,84 @@
+from typing import NamedTuple
+import numpy as np
+import numpy.typing as npt
+from xanlib.node import Node
+from xanlib.scene import Scene
+
+
+class WorldTransforms(NamedTuple):
+    """World matrices of every node of a scene, in depth-first order.
+
+    matrices[i] is the world matrix of nodes[i], laid out like Node.transform
+    reshaped to 4x4: the transpose of the column-major matrix, so points are
+    transformed as row vectors, [x, y, z, 1] @ matrices[i].
+    """
+
+    nodes: list[Node]
+    matrices: npt.NDArray[np.float64]
+    rows: dict[int, int]
+
+    def matrix(self, node: Node) -> npt.NDArray[np.float64]:
+        return self.matrices[self.rows[id(node)]]
+
+
+def local_matrices(nodes: list[Node]) -> npt.NDArray[np.float64]:
+    """(len(nodes), 4, 4) local matrices, with identity for unset transforms."""
+    identity = np.eye(4).ravel()
+    return np.array(
+        [identity if node.transform is None else node.transform for node in nodes],
+        dtype=np.float64,
+    ).reshape(-1, 4, 4)
+
+
+def flatten_hierarchy(scene: Scene) -> tuple[list[Node], list[int], list[int]]:
+    """Nodes in depth-first order, with their parent rows (-1 for roots) and depths."""
+    nodes: list[Node] = []
+    parents: list[int] = []
+    depths: list[int] = []
+    stack = [(node, -1, 0) for node in reversed(scene.nodes)]
+    while stack:
+        node, parent, depth = stack.pop()
+        row = len(nodes)
+        nodes.append(node)
+        parents.append(parent)
+        depths.append(depth)
+        stack.extend((child, row, depth + 1) for child in reversed(node.children))
+    return nodes, parents, depths
+
+
+def compose_hierarchy(
+    matrices: npt.NDArray[np.float64], parents: list[int], depths: list[int]
+) -> npt.NDArray[np.float64]:
+    """Turn local matrices (node axis first) into world matrices, in place."""
+    parent_rows = np.array(parents, dtype=np.intp)
+    depth_rows = np.array(depths, dtype=np.intp)
+    for depth in range(1, int(depth_rows.max(initial=0)) + 1):
+        rows = np.flatnonzero(depth_rows == depth)
+        matrices[rows] = matrices[rows] @ matrices[parent_rows[rows]]
+    return matrices
+
+
+def compute_world_transforms(scene: Scene) -> WorldTransforms:
+    """Compute all world matrices in one top-down pass, one batch per depth."""
+    nodes, parents, depths = flatten_hierarchy(scene)
+    matrices = compose_hierarchy(local_matrices(nodes), parents, depths)
+    matrices.flags.writeable = False
+
+    return WorldTransforms(
+        nodes, matrices, {id(node): row for row, node in enumerate(nodes)}
+    )
+
+
+def world_transforms(scene: Scene) -> WorldTransforms:
+    """Cached compute_world_transforms.
+
+    The result is reused until a transform of one of the scene's nodes is
+    assigned or its node hierarchy changes. Mutating a transform in place is impossible, since it
+    is a tuple.
+    """
+    generation = (scene._structure_generation, scene._transform_generation)
+    cached = scene._world_transforms
+    if cached is None or cached[0] != generation:
+        cached = (generation, compute_world_transforms(scene))
+        scene._world_transforms = cached
+    return cached[1]
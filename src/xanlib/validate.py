@@ -0,0 +1,111 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from os import PathLike
+from typing import NamedTuple
+import mmap as _mmap
+from xanlib.layout import FormatError, SceneLayout, skim_scene
+
+
+class SectionEntry(NamedTuple):
+    path: str
+    section: str
+    offset: int
+    size: int
+
+
+@dataclass
+class ValidationReport:
+    """Outcome of validating one XBF file.
+
+    sections lists every section walked before the first inconsistency, if
+    any, with scene-level sections under the empty path.
+    """
+
+    filename: str | PathLike | None
+    size: int
+    error: FormatError | None = None
+    sections: list[SectionEntry] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+    @property
+    def offset(self) -> int | None:
+        return None if self.error is None else self.error.offset
+
+    @property
+    def path(self) -> str | None:
+        return None if self.error is None else self.error.path
+
+
+def _sections(layout: SceneLayout) -> list[SectionEntry]:
+    entries = [
+        SectionEntry("", "header", 0, layout.fx_data.start),
+        SectionEntry("", "FXData", layout.fx_data.start, layout.fx_data.size),
+        SectionEntry(
+            "",
+            "textureNameData",
+            layout.texture_name_data.start - 4,
+            layout.texture_name_data.size + 4,
+        ),
+    ]
+    for node in layout:
+        entries.extend(
+            SectionEntry(node.path, name, span.start, span.size)
+            for name, span in node.sections.items()
+        )
+    return sorted(entries, key=lambda entry: entry.offset)
+
+
+def validate_buffer(
+    buffer: bytes | memoryview, filename: str | PathLike | None = None
+) -> ValidationReport:
+    """Check the layout of a whole XBF file's contents, EOF marker included.
+
+    Only headers, counts and flags are read; geometry and animations are
+    skipped over by their computed sizes.
+    """
+    report = ValidationReport(filename, len(buffer))
+    if len(buffer) < 4 or buffer[-4:] != b"\xff\xff\xff\xff":
+        last_int = int.from_bytes(buffer[-4:], "little", signed=True)
+        report.error = FormatError(
+            f"Expected EOF marker -1, got {last_int}", max(len(buffer) - 4, 0)
+        )
+        return report
+    # The skim error's traceback would keep slices of the body alive, and
+    # with them the caller's mapping; drop it along with the body slice.
+    with memoryview(buffer) as view, view[:-4] as body:
+        try:
+            layout = skim_scene(body)
+        except FormatError as e:
+            report.error = e.with_traceback(None)
+            return report
+        if layout.error is not None:
+            layout.error = layout.error.with_traceback(None)
+    report.sections = _sections(layout)
+    if layout.error is not None:
+        report.error = (
+            layout.error
+            if isinstance(layout.error, FormatError)
+            else FormatError(str(layout.error), layout.unparsed.start)  # type: ignore[union-attr]
+        )
+    report.sections.append(SectionEntry("", "EOF", len(buffer) - 4, 4))
+    return report
+
+
+def validate_xbf(filename: str | PathLike) -> ValidationReport:
+    """Validate an XBF file through a read-only memory mapping."""
+    with open(filename, "rb") as stream:
+        try:
+            mapping = _mmap.mmap(stream.fileno(), 0, access=_mmap.ACCESS_READ)
+        except ValueError:
+            return validate_buffer(b"", filename)
+    with mapping, memoryview(mapping) as buffer:
+        report = validate_buffer(buffer, filename)
+    return report
+
+
+def validate_many(paths: Iterable[str | PathLike]) -> Iterator[ValidationReport]:
+    for path in paths:
+        yield validate_xbf(path)
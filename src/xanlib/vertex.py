@@ -3,15 +3,33 @@ from xanlib.math_utils import Vector3
 from struct import Struct
 
 
-@dataclass(init=False)
+@dataclass(slots=True)
 class Vertex:
+    """A vertex stored as six flat floats; position and normal are views."""
+
+    x: float
+    y: float
+    z: float
+    nx: float
+    ny: float
+    nz: float
     cstruct = Struct("<6f")
 
-    def __init__(
-        self, x: float, y: float, z: float, nx: float, ny: float, nz: float
-    ) -> None:
-        self.position = Vector3(x, y, z)
-        self.normal = Vector3(nx, ny, nz)
+    @property
+    def position(self) -> Vector3:
+        return Vector3(self.x, self.y, self.z)
+
+    @position.setter
+    def position(self, value: tuple[float, float, float]) -> None:
+        self.x, self.y, self.z = value
+
+    @property
+    def normal(self) -> Vector3:
+        return Vector3(self.nx, self.ny, self.nz)
+
+    @normal.setter
+    def normal(self, value: tuple[float, float, float]) -> None:
+        self.nx, self.ny, self.nz = value
 
     def __bytes__(self) -> bytes:
-        return self.cstruct.pack(*self.position, *self.normal)
+        return self.cstruct.pack(self.x, self.y, self.z, self.nx, self.ny, self.nz)
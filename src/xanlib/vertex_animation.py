@@ -1,6 +1,9 @@
+from collections.abc import Sequence
+from typing import BinaryIO
 from dataclasses import dataclass
+from io import BytesIO
 from xanlib.compressed_vertex import CompressedVertex
-from struct import Struct, pack
+from struct import Struct, pack, calcsize
 
 
 @dataclass
@@ -11,7 +14,7 @@ class VertexAnimation:
     scale: int | None
     base_count: int | None
     real_count: int | None
-    frames: list[list[CompressedVertex]]
+    frames: Sequence[Sequence[CompressedVertex]]
     interpolation_data: list[int]
     _header_struct = Struct("<3i")
     _key_fmt = "<{actual}I"
@@ -19,70 +22,115 @@ class VertexAnimation:
     _interpolation_fmt = "<{frame_count}I"
 
     def __bytes__(self) -> bytes:
-        buffer = self._header_struct.pack(self.frame_count, self.count, len(self.keys))
-        buffer += pack(self._key_fmt.format(actual=len(self.keys)), *self.keys)
+        stream = BytesIO()
+        self.tostream(stream)
+        return stream.getvalue()
+
+    def tostream(self, stream: BinaryIO) -> None:
+        stream.write(
+            self._header_struct.pack(self.frame_count, self.count, len(self.keys))
+        )
+        stream.write(pack(self._key_fmt.format(actual=len(self.keys)), *self.keys))
         if self.frames:
-            buffer += self._compressed_header_struct.pack(self.scale, self.base_count)
-            buffer += b"".join(
-                bytes(vertex) for frame in self.frames for vertex in frame
+            stream.write(
+                self._compressed_header_struct.pack(self.scale, self.base_count)
             )
+            tobytes = getattr(self.frames, "tobytes", None)
+            if tobytes is not None:
+                stream.write(tobytes())
+            else:
+                for frame in self.frames:
+                    stream.write(b"".join(bytes(vertex) for vertex in frame))
             if self.interpolation_data:
-                buffer += pack(
-                    self._interpolation_fmt.format(frame_count=self.frame_count),
-                    *self.interpolation_data,
+                stream.write(
+                    pack(
+                        self._interpolation_fmt.format(frame_count=self.frame_count),
+                        *self.interpolation_data,
+                    )
                 )
 
-        return buffer
+    @classmethod
+    def frombuffer(
+        cls, buffer: bytes | memoryview, offset: int = 0, arrays: bool = False
+    ) -> "VertexAnimation":
+        return cls.parse(buffer, offset, arrays)[0]
 
     @classmethod
-    def frombuffer(cls, buffer: bytes, offset: int = 0) -> "VertexAnimation":
+    def parse(
+        cls, buffer: bytes | memoryview, offset: int = 0, arrays: bool = False
+    ) -> tuple["VertexAnimation", int]:
+        """Decode a vertex animation, returning it and the offset just past it.
+
+        With arrays=True, frames are decoded into a numpy-backed CompressedFrames
+        view of the buffer instead of lists of CompressedVertex objects.
+        """
         frame_count, count, actual = cls._header_struct.unpack_from(buffer, offset)
+        offset += cls._header_struct.size
         keys_struct = Struct(cls._key_fmt.format(actual=actual))
-        keys = list(keys_struct.unpack_from(buffer, offset + cls._header_struct.size))
+        keys = list(keys_struct.unpack_from(buffer, offset))
+        offset += keys_struct.size
         if count < 0:
             scale, base_count = cls._compressed_header_struct.unpack_from(
-                buffer, offset + cls._header_struct.size + keys_struct.size
+                buffer, offset
             )
+            offset += cls._compressed_header_struct.size
             assert count == -base_count
             real_count = base_count // actual
-            frames = [
-                [
-                    CompressedVertex(
-                        *CompressedVertex.cstruct.unpack_from(
-                            buffer,
-                            offset
-                            + cls._header_struct.size
-                            + keys_struct.size
-                            + cls._compressed_header_struct.size
-                            + CompressedVertex.cstruct.size * i,
-                        )
+            frames_size = CompressedVertex.cstruct.size * real_count * actual
+            frames: Sequence[Sequence[CompressedVertex]]
+            if arrays:
+                from xanlib.arrays import CompressedFrames
+
+                frames = CompressedFrames.frombuffer(buffer, actual, real_count, offset)
+            else:
+                vertices = [
+                    CompressedVertex(*fields)
+                    for fields in CompressedVertex.cstruct.iter_unpack(
+                        buffer[offset : offset + frames_size]
                     )
-                    for i in range(j * real_count, (j + 1) * real_count)
                 ]
-                for j in range(actual)
-            ]
+                frames = [
+                    vertices[j * real_count : (j + 1) * real_count]
+                    for j in range(actual)
+                ]
+            offset += frames_size
             if scale & 0x80000000:
                 interpolation_struct = Struct(
                     cls._interpolation_fmt.format(frame_count=frame_count)
                 )
                 interpolation_data = list(
-                    interpolation_struct.unpack_from(
-                        buffer,
-                        offset
-                        + cls._header_struct.size
-                        + keys_struct.size
-                        + cls._compressed_header_struct.size
-                        + CompressedVertex.cstruct.size * real_count * actual,
-                    )
+                    interpolation_struct.unpack_from(buffer, offset)
                 )
+                offset += interpolation_struct.size
 
-        return VertexAnimation(
-            frame_count,
-            count,
-            keys,
-            scale if count < 0 else None,
-            base_count if count < 0 else None,
-            real_count if count < 0 else None,
-            frames if count < 0 else [],
-            interpolation_data if count < 0 and scale & 0x80000000 else [],
+        return (
+            VertexAnimation(
+                frame_count,
+                count,
+                keys,
+                scale if count < 0 else None,
+                base_count if count < 0 else None,
+                real_count if count < 0 else None,
+                frames if count < 0 else [],
+                interpolation_data if count < 0 and scale & 0x80000000 else [],
+            ),
+            offset,
         )
+
+    @classmethod
+    def skip(cls, buffer: bytes | memoryview, offset: int = 0) -> int:
+        """Return the offset just past a vertex animation without decoding it."""
+        frame_count, count, actual = cls._header_struct.unpack_from(buffer, offset)
+        offset += cls._header_struct.size + calcsize(cls._key_fmt.format(actual=actual))
+        if count < 0:
+            scale, base_count = cls._compressed_header_struct.unpack_from(
+                buffer, offset
+            )
+            offset += cls._compressed_header_struct.size
+            real_count = base_count // actual
+            offset += CompressedVertex.cstruct.size * real_count * actual
+            if scale & 0x80000000:
+                offset += calcsize(
+                    cls._interpolation_fmt.format(frame_count=frame_count)
+                )
+        return offset
@@ -1,21 +1,139 @@
+import os
+import secrets
+import shutil
 from os import PathLike
-from xanlib.scene import Scene
+from typing import TYPE_CHECKING
+import mmap as _mmap
+from xanlib.scene import Scene, SourceFile
+from xanlib.layout import FormatError
+from xanlib import profiling
 
+if TYPE_CHECKING:
+    from xanlib.cache import SceneCache
 
-def load_xbf(filename: str | PathLike) -> Scene:
+
+def load_xbf(
+    filename: str | PathLike,
+    arrays: bool = False,
+    mmap: bool = False,
+    lazy: bool = False,
+    cache: "SceneCache | None" = None,
+    workers: int | None = None,
+) -> Scene:
+    """Load an XBF file.
+
+    With mmap=True the file is memory-mapped and parsed through a memoryview,
+    so FXData, textureNameData, unparsed and (with arrays=True) the vertex
+    and face arrays remain views into the mapping instead of copies.
+    The mapping stays open for as long as any of those views are referenced.
+
+    Raises FormatError if the file does not end with the EOF marker.
+
+    With lazy=True, node geometry and animations are decoded on first access,
+    and untouched nodes are written back verbatim (see Scene.frombuffer).
+
+    With workers greater than 1, top-level nodes are decoded in parallel
+    after a skim pass (see Scene.frombuffer).
+
+    With a SceneCache, a previously parsed copy of an unchanged file is
+    returned from the cache instead of being parsed again. Cached scenes are
+    always array-backed, and cannot be combined with mmap=True.
+    """
+    if cache is not None:
+        if mmap:
+            raise ValueError("Cached scenes cannot be memory-mapped")
+        return cache.load(filename, lazy=lazy, workers=workers)
+
+    clock = profiling.clock("load", str(filename))
+    buffer: bytes | memoryview
     with open(filename, "rb") as stream:
-        buffer = stream.read()
+        # Empty files cannot be mapped; they fail the EOF marker check below.
+        if mmap and os.fstat(stream.fileno()).st_size > 0:
+            buffer = memoryview(
+                _mmap.mmap(stream.fileno(), 0, access=_mmap.ACCESS_READ)
+            )
+        else:
+            buffer = stream.read()
+    if clock is not None:
+        clock.lap("read", len(buffer))
 
     last_int = int.from_bytes(buffer[-4:], "little", signed=True)
-    assert last_int == -1, f"Expected EOF, got {last_int}"
-    return Scene.frombuffer(buffer[:-4])
+    if len(buffer) < 4 or last_int != -1:
+        raise FormatError(
+            f"Expected EOF marker -1, got {last_int}", max(len(buffer) - 4, 0)
+        )
+    scene = Scene.frombuffer(buffer[:-4], arrays=arrays, lazy=lazy, workers=workers)
+    if clock is not None:
+        clock.lap("parse", len(buffer))
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        pass
+    else:
+        scene._source = SourceFile(
+            os.path.abspath(filename), stat.st_size, stat.st_mtime_ns
+        )
+    return scene
+
+
+def save_xbf(
+    scene: Scene,
+    filename: str | PathLike,
+    streaming: bool = False,
+    patch: bool = False,
+) -> None:
+    """Save a scene as an XBF file.
+
+    With streaming=True each section is written to the file as it is encoded,
+    instead of first building the whole file in memory. The sections go to a
+    temporary file next to filename that then replaces it, so a failed save
+    leaves the existing file intact. On POSIX systems this also lets a scene
+    memory-mapped from filename be streamed back over it; Windows does not
+    replace files that are still mapped, and raises PermissionError instead.
+
+    With patch=True, a scene loaded by load_xbf whose only edits are
+    assigned transforms and same-length rgb lists is saved by patching those
+    bytes into (a copy of) the file it was loaded from; see xanlib.patch.
+    """
+    if patch:
+        from xanlib.patch import patch_xbf
+
+        patch_xbf(scene, filename, streaming)
+        return
+
+    eof = (-1).to_bytes(4, "little", signed=True)
+    clock = profiling.clock("save", str(filename))
 
+    if streaming:
+        # The scene may be a memory-mapped view of filename itself, so write
+        # beside it and swap the finished file in, instead of truncating the
+        # mapped file while it is still being read.
+        temporary = f"{os.fspath(filename)}.{secrets.token_hex(4)}.tmp"
+        try:
+            with open(temporary, "xb") as stream:
+                scene.tostream(stream)
+                if scene.unparsed is None:
+                    stream.write(eof)
+                written = stream.tell()
+            if os.path.exists(filename):
+                shutil.copymode(filename, temporary)
+            os.replace(temporary, filename)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+            raise
+        if clock is not None:
+            clock.lap("write", written)
+        return
 
-def save_xbf(scene: Scene, filename: str | PathLike) -> None:
     buffer = bytes(scene)
 
     if scene.unparsed is None:
-        buffer += (-1).to_bytes(4, "little", signed=True)
+        buffer += eof
+    if clock is not None:
+        clock.lap("encode", len(buffer))
 
     with open(filename, "wb") as stream:
         stream.write(buffer)
+    if clock is not None:
+        clock.lap("write", len(buffer))
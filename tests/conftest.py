@@ -13,6 +13,8 @@ from xanlib.scene import Scene
 
 EncodedDecoded = namedtuple("EncodedDecoded", ["encoded", "decoded"])
 
+EOF_MARKER = (-1).to_bytes(4, "little", signed=True)
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -255,3 +257,29 @@ def scene(node_basic):
     )
 
     yield EncodedDecoded(encoded, decoded)
+
+
+@pytest.fixture
+def family_scene(node_with_children):
+    decoded = Scene(
+        version=1,
+        FXData=b"FXDataHeader",
+        textureNameData=b"foobar.tga\x00\x00",
+        nodes=[Node.frombuffer(node_with_children.encoded)],
+    )
+
+    yield EncodedDecoded(bytes(decoded), decoded)
+
+
+@pytest.fixture
+def xbf_file(tmp_path, scene):
+    file = tmp_path / "scene.xbf"
+    file.write_bytes(scene.encoded + EOF_MARKER)
+    yield file
+
+
+@pytest.fixture
+def family_xbf_file(tmp_path, family_scene):
+    file = tmp_path / "family.xbf"
+    file.write_bytes(family_scene.encoded + EOF_MARKER)
+    yield file
@@ -0,0 +1,51 @@
+import asyncio
+from xanlib.scene import Scene
+from xanlib.xbf_io import load_xbf
+from xanlib.aio import load_xbf_async, save_xbf_async, iter_scenes_async
+from conftest import EOF_MARKER
+
+
+def test_load_and_save_async(tmp_path, xbf_file, scene):
+    source = xbf_file
+    targets = [tmp_path / f"copy{i}.xbf" for i in range(4)]
+
+    async def main() -> list[Scene]:
+        semaphore = asyncio.Semaphore(2)
+        loaded = await asyncio.gather(
+            *(load_xbf_async(source, semaphore=semaphore) for _ in targets)
+        )
+        await asyncio.gather(
+            *(
+                save_xbf_async(result, target, semaphore=semaphore)
+                for result, target in zip(loaded, targets)
+            )
+        )
+        return loaded
+
+    for result in asyncio.run(main()):
+        assert result == scene.decoded
+    for target in targets:
+        assert load_xbf(target) == scene.decoded
+
+
+def test_iter_scenes_async(tmp_path, scene):
+    (tmp_path / "sub").mkdir()
+    for name in ("a.xbf", "b.xbf", "sub/c.XBF"):
+        (tmp_path / name).write_bytes(scene.encoded + EOF_MARKER)
+    (tmp_path / "d.xbf").write_bytes(b"garbage")
+
+    async def main():
+        return [result async for result in iter_scenes_async(tmp_path, concurrency=2)]
+
+    results = asyncio.run(main())
+    assert sorted(result.path.name for result in results) == [
+        "a.xbf",
+        "b.xbf",
+        "c.XBF",
+        "d.xbf",
+    ]
+    for result in results:
+        if result.path.name == "d.xbf":
+            assert result.error is not None
+        else:
+            assert result.value == scene.decoded
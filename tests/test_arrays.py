@@ -0,0 +1,112 @@
+import pytest
+from xanlib.node import Node
+from xanlib.scene import Scene
+
+np = pytest.importorskip("numpy")
+
+from xanlib.arrays import VertexArray, FaceArray  # noqa: E402
+
+
+def test_read_node_arrays(node_basic):
+    result = Node.frombuffer(node_basic.encoded, arrays=True)
+    assert isinstance(result.vertices, VertexArray)
+    assert isinstance(result.faces, FaceArray)
+    assert result.vertices.data.shape == (len(node_basic.decoded.vertices), 6)
+    assert result.vertices == node_basic.decoded.vertices
+    assert result.faces == node_basic.decoded.faces
+    assert bytes(result.faces[0]) == bytes(node_basic.decoded.faces[0])
+    assert bytes(result.vertices[-1]) == bytes(node_basic.decoded.vertices[-1])
+
+
+def test_write_node_arrays(node_with_children):
+    result = Node.frombuffer(node_with_children.encoded, arrays=True)
+    assert isinstance(result.children[0].vertices, VertexArray)
+    assert bytes(result) == node_with_children.encoded
+
+
+def test_scene_arrays_roundtrip(scene):
+    assert bytes(Scene.frombuffer(scene.encoded, arrays=True)) == scene.encoded
+
+
+def test_arrays_from_objects(node_basic):
+    vertices = VertexArray.fromvertices(node_basic.decoded.vertices)
+    faces = FaceArray.fromfaces(node_basic.decoded.faces)
+    node = Node(
+        transform=node_basic.decoded.transform,
+        name=node_basic.decoded.name,
+        vertices=vertices,
+        faces=faces,
+        rgb=node_basic.decoded.rgb,
+    )
+    assert bytes(node) == node_basic.encoded
+    assert faces.vertex_indices.shape == (1, 3)
+    np.testing.assert_array_equal(vertices.positions, vertices.data[:, :3])
+
+
+def test_load_xbf_mmap_arrays(tmp_path, scene):
+    from xanlib.xbf_io import load_xbf
+
+    file = tmp_path / "foo.xbf"
+    file.write_bytes(scene.encoded + (-1).to_bytes(4, "little", signed=True))
+    result = load_xbf(file, arrays=True, mmap=True)
+    vertices = result.nodes[0].vertices
+    assert not vertices.data.flags.owndata
+    assert not vertices.data.flags.writeable
+    assert bytes(result) == scene.encoded
+
+
+def test_decode_normals_matches_compressed_vertex():
+    from xanlib.compressed_vertex import CompressedVertex
+    from xanlib.arrays import decode_normals, decode_flags
+
+    packed = np.arange(0, 1 << 16, 97, dtype=np.uint16)
+    vertices = [CompressedVertex(0, 0, 0, int(p)) for p in packed]
+    np.testing.assert_array_equal(
+        decode_normals(packed), [vertex.normal for vertex in vertices]
+    )
+    np.testing.assert_array_equal(
+        decode_flags(packed), [vertex.as_flag() for vertex in vertices]
+    )
+
+
+def test_encode_normals_matches_from_vertex():
+    from xanlib.compressed_vertex import CompressedVertex
+    from xanlib.vertex import Vertex
+    from xanlib.arrays import encode_normals, decode_normals
+
+    normals = np.array([[-20, 0, 15], [3, -7, 1], [-15, 16, -1]])
+    expected = []
+    for normal in normals.tolist():
+        vertex = CompressedVertex(0, 0, 0, 0)
+        vertex.from_vertex(Vertex(0, 0, 0, *normal))
+        expected.append(vertex.normal_packed)
+    np.testing.assert_array_equal(encode_normals(normals), expected)
+    positive = np.array([[0, 1, 15], [7, 3, 2]])
+    np.testing.assert_array_equal(decode_normals(encode_normals(positive)), positive)
+    assert encode_normals([[0, 0, 0]], flags=[True])[0] == 0x8000
+
+
+def test_vertex_animation_arrays(vertex_animation):
+    from xanlib.vertex_animation import VertexAnimation
+    from xanlib.arrays import CompressedFrames
+
+    result = VertexAnimation.frombuffer(vertex_animation.encoded, arrays=True)
+    assert result == vertex_animation.decoded
+    assert bytes(result) == vertex_animation.encoded
+    if vertex_animation.decoded.frames:
+        assert isinstance(result.frames, CompressedFrames)
+        assert result.frames.data.shape == (
+            len(vertex_animation.decoded.frames),
+            vertex_animation.decoded.real_count,
+        )
+        assert result.frames[0] == vertex_animation.decoded.frames[0]
+        np.testing.assert_array_equal(
+            result.frames.normals[0],
+            [vertex.normal for vertex in vertex_animation.decoded.frames[0]],
+        )
+        np.testing.assert_array_equal(
+            result.frames.positions[-1],
+            [vertex.position for vertex in vertex_animation.decoded.frames[-1]],
+        )
+        rebuilt = CompressedFrames.fromframes(vertex_animation.decoded.frames)
+        assert rebuilt == result.frames
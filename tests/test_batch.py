@@ -0,0 +1,39 @@
+from operator import attrgetter
+import pytest
+from xanlib.batch import load_many, iter_scenes
+from conftest import EOF_MARKER
+
+
+@pytest.fixture
+def xbf_dir(tmp_path, scene):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.xbf").write_bytes(scene.encoded + EOF_MARKER)
+    (tmp_path / "sub" / "B.XBF").write_bytes(scene.encoded + EOF_MARKER)
+    (tmp_path / "c.xbf").write_bytes(scene.encoded + b"\x01\x02\x03" + EOF_MARKER)
+    (tmp_path / "d.xbf").write_bytes(b"garbage")
+    (tmp_path / "notes.txt").write_bytes(b"")
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_iter_scenes(xbf_dir, scene, workers):
+    results = list(iter_scenes(xbf_dir, workers=workers))
+    assert [result.path.name for result in results] == [
+        "a.xbf",
+        "c.xbf",
+        "d.xbf",
+        "B.XBF",
+    ]
+    a, c, d, b = results
+    assert a.value == scene.decoded and a.error is None
+    assert b.value == scene.decoded
+    assert c.error is not None and c.unparsed_size == 3
+    assert d.value is None and d.error is not None
+
+
+def test_load_many_reduce_unordered(xbf_dir, scene):
+    paths = [xbf_dir / "a.xbf", xbf_dir / "sub" / "B.XBF"]
+    results = load_many(paths, workers=2, reduce=attrgetter("textures"), ordered=False)
+    assert sorted(result.path for result in results) == sorted(paths)
+    for result in load_many(paths, workers=2, reduce=attrgetter("textures")):
+        assert result.value == scene.decoded.textures
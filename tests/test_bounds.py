@@ -0,0 +1,119 @@
+import pytest
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.vertex import Vertex
+from xanlib.face import Face
+from xanlib.compressed_vertex import CompressedVertex
+from xanlib.vertex_animation import VertexAnimation
+
+np = pytest.importorskip("numpy")
+
+from xanlib.bounds import (  # noqa: E402
+    bounds_of,
+    compute_scene_bounds,
+    frustum_planes,
+    in_frustum,
+    scene_bounds,
+)
+
+
+def build_scene() -> Scene:
+    matrix = np.diag([2.0, 2.0, 2.0, 1.0])
+    matrix[3, :3] = [10, 0, 0]
+    child = Node(
+        name="child",
+        transform=tuple(np.eye(4).ravel()),
+        vertices=[
+            Vertex(0.0, 0.0, 0.0, 0.0, 0.0, 1.0),
+            Vertex(2.0, 0.0, 0.0, 0.0, 0.0, 1.0),
+            Vertex(0.0, 4.0, 0.0, 0.0, 0.0, 1.0),
+        ],
+        faces=[Face(0, 1, 2, 0, 0, 0.0, 0.0, 1.0, 0.0, 0.0, 1.0)],
+        vertex_animation=VertexAnimation(
+            frame_count=2,
+            count=-6,
+            keys=[0, 1],
+            scale=0,
+            base_count=6,
+            real_count=3,
+            frames=[
+                [CompressedVertex(0, 0, 0, 0)] * 3,
+                [CompressedVertex(-1, 0, 0, 0), CompressedVertex(3, 5, 1, 0)] * 1
+                + [CompressedVertex(0, 0, 0, 0)],
+            ],
+            interpolation_data=[],
+        ),
+    )
+    root = Node(name="root", transform=tuple(matrix.ravel()), children=[child])
+    child.parent = root
+    return Scene(nodes=[root])
+
+
+def test_bounds_of():
+    bounds = bounds_of([[0, 0, 0], [2, 0, 0], [0, 4, 0]])
+    assert bounds.minimum.tolist() == [0, 0, 0]
+    assert bounds.maximum.tolist() == [2, 4, 0]
+    assert bounds.center.tolist() == [1, 2, 0]
+    assert bounds.radius == pytest.approx(5**0.5)
+    assert np.isnan(bounds_of(np.zeros((0, 3))).radius)
+
+
+def test_scene_bounds():
+    scene = build_scene()
+    bounds = compute_scene_bounds(scene)
+    root, child = scene.nodes[0], scene.nodes[0].children[0]
+    assert bounds.nodes == [root, child]
+    assert np.isnan(bounds.local.minimum[0]).all()
+    minimum, maximum = bounds.aabb(child, world=False)
+    assert (minimum.tolist(), maximum.tolist()) == ([0, 0, 0], [2, 4, 0])
+    minimum, maximum = bounds.aabb(child)
+    assert (minimum.tolist(), maximum.tolist()) == ([10, 0, 0], [14, 8, 0])
+    center, radius = bounds.sphere(child)
+    assert center.tolist() == [12, 4, 0]
+    assert radius == pytest.approx(2 * 5**0.5)
+    assert bounds.local_frames[0] is None
+    frames = bounds.local_frames[1]
+    assert frames.minimum.tolist() == [[0, 0, 0], [-1, 0, 0]]
+    assert frames.maximum.tolist() == [[0, 0, 0], [3, 5, 1]]
+    assert bounds.world_frames[1].union()[1].tolist() == [16, 10, 2]
+
+
+def test_scene_bounds_cached():
+    scene = build_scene()
+    bounds = scene_bounds(scene)
+    assert scene_bounds(scene) is bounds
+    child = scene.nodes[0].children[0]
+    child.vertices = [Vertex(5.0, 5.0, 5.0, 0.0, 0.0, 1.0)] * 3
+    refreshed = scene_bounds(scene)
+    assert refreshed is not bounds
+    assert refreshed.aabb(child, world=False)[0].tolist() == [5, 5, 5]
+    scene.nodes[0].transform = tuple(np.eye(4).ravel())
+    assert scene_bounds(scene).aabb(child)[0].tolist() == [5, 5, 5]
+    assert scene_bounds(scene, position_scale=2.0) is not scene_bounds(scene)
+
+
+def test_scene_bounds_kept_across_other_scenes():
+    scene = build_scene()
+    bounds = scene_bounds(scene)
+    other = build_scene()
+    other["child"].vertices = [Vertex(5.0, 5.0, 5.0, 0.0, 0.0, 1.0)] * 3
+    build_scene()
+    assert scene_bounds(scene) is bounds
+
+
+def test_in_frustum():
+    planes = frustum_planes(np.eye(4))
+    bounds = bounds_of(
+        [
+            [[0, 0, 0], [0.5, 0.5, 0.5]],
+            [[0.5, 0.5, 0.5], [3, 3, 3]],
+            [[2, 2, 2], [3, 3, 3]],
+            [[np.nan] * 3] * 2,
+        ]
+    )
+    assert in_frustum(bounds, planes).tolist() == [True, True, False, False]
+    scene = build_scene()
+    translate = np.eye(4)
+    translate[3, :3] = [-12, -4, 0]
+    visible = in_frustum(scene_bounds(scene).world, frustum_planes(translate))
+    assert visible.tolist() == [False, True]
@@ -0,0 +1,94 @@
+import pytest
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.vertex import Vertex
+from xanlib.face import Face
+
+np = pytest.importorskip("numpy")
+
+from xanlib.bounds import classify_boxes, frustum_planes  # noqa: E402
+from xanlib.bvh import _intersect_triangles, build_bvh  # noqa: E402
+
+
+def random_scene(seed: int = 0, nodes: int = 3, faces: int = 60) -> Scene:
+    rng = np.random.default_rng(seed)
+    scene = Scene()
+    for index in range(nodes):
+        matrix = np.eye(4)
+        matrix[3, :3] = rng.uniform(-5, 5, 3)
+        centers = rng.uniform(-3, 3, (faces, 1, 3))
+        corners = centers + rng.uniform(-0.5, 0.5, (faces, 3, 3))
+        scene.nodes.append(
+            Node(
+                name=f"node{index}",
+                transform=tuple(matrix.ravel()),
+                vertices=[
+                    Vertex(*map(float, corner), 0.0, 0.0, 1.0)
+                    for corner in corners.reshape(-1, 3)
+                ],
+                faces=[
+                    Face(3 * i, 3 * i + 1, 3 * i + 2, 0, 0, 0, 0, 0, 0, 0, 0)
+                    for i in range(faces)
+                ],
+            )
+        )
+    return scene
+
+
+def test_intersect_matches_brute_force():
+    bvh = build_bvh(random_scene())
+    assert bvh.left[0] >= 0
+    assert sorted(bvh.order.tolist()) == list(range(len(bvh.triangles)))
+    rng = np.random.default_rng(1)
+    origins = rng.uniform(-10, 10, (200, 3))
+    directions = rng.uniform(-1, 1, (200, 3))
+    hits = bvh.intersect(origins, directions)
+    _, expected, _, _ = _intersect_triangles(origins, directions, bvh.triangles)
+    np.testing.assert_allclose(hits.distance, expected)
+    hit = hits.face >= 0
+    assert hit.any() and not hit.all()
+    np.testing.assert_array_equal(hits.node[hit], bvh.buffers.face_node[hits.face[hit]])
+    assert (hits.node[~hit] == -1).all()
+    points = origins[hit] + directions[hit] * hits.distance[hit, None]
+    triangles = bvh.triangles[hits.face[hit]]
+    barycentric = (
+        triangles[:, 0] * (1 - hits.u[hit] - hits.v[hit])[:, None]
+        + triangles[:, 1] * hits.u[hit][:, None]
+        + triangles[:, 2] * hits.v[hit][:, None]
+    )
+    np.testing.assert_allclose(points, barycentric, atol=1e-9)
+
+
+def test_intersect_axis_aligned_and_max_distance():
+    scene = random_scene(nodes=1, faces=0)
+    scene.nodes[0].vertices = [
+        Vertex(0.0, 0.0, 2.0, 0.0, 0.0, 1.0),
+        Vertex(1.0, 0.0, 2.0, 0.0, 0.0, 1.0),
+        Vertex(0.0, 1.0, 2.0, 0.0, 0.0, 1.0),
+    ]
+    scene.nodes[0].faces = [Face(0, 1, 2, 0, 0, 0, 0, 0, 0, 0, 0)]
+    scene.nodes[0].transform = tuple(np.eye(4).ravel())
+    bvh = build_bvh(scene)
+    hits = bvh.intersect([[0.25, 0.25, 0], [0.25, 0.25, 0]], [[0, 0, 1], [0, 0, -1]])
+    assert hits.distance.tolist() == [2, np.inf]
+    assert hits.face.tolist() == [0, -1]
+    assert bvh.intersect([0.25, 0.25, 0], [0, 0, 1], max_distance=1).face[0] == -1
+
+
+def test_empty_scene():
+    bvh = build_bvh(Scene())
+    assert len(bvh) == 0
+    assert bvh.intersect([[0, 0, 0]], [[0, 0, 1]]).face.tolist() == [-1]
+    assert bvh.faces_in_frustum(frustum_planes(np.eye(4))).tolist() == []
+
+
+def test_faces_in_frustum():
+    bvh = build_bvh(random_scene(faces=200), leaf_size=2)
+    view = np.diag([0.2, 0.2, 0.2, 1.0])
+    planes = frustum_planes(view)
+    outside, _ = classify_boxes(
+        bvh.triangles.min(axis=1), bvh.triangles.max(axis=1), planes
+    )
+    expected = np.flatnonzero(~outside)
+    assert 0 < len(expected) < len(bvh.triangles)
+    np.testing.assert_array_equal(bvh.faces_in_frustum(planes), expected)
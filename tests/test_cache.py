@@ -0,0 +1,88 @@
+import os
+import pytest
+from xanlib.scene import Scene
+from xanlib.xbf_io import load_xbf
+
+pytest.importorskip("numpy")
+
+from xanlib.cache import SceneCache  # noqa: E402
+
+
+def test_cache_miss_then_hit(tmp_path, xbf_file, scene, mocker):
+    cache = SceneCache(tmp_path / "cache")
+    first = load_xbf(xbf_file, cache=cache)
+    assert first == scene.decoded
+    assert len(cache.entries()) == 1
+
+    frombuffer = mocker.patch("xanlib.scene.Scene.frombuffer")
+    second = load_xbf(xbf_file, cache=cache)
+    frombuffer.assert_not_called()
+    assert second == scene.decoded
+    assert bytes(second) == scene.encoded
+
+
+def test_cache_invalidated_by_change(tmp_path, xbf_file, scene):
+    cache = SceneCache(tmp_path / "cache")
+    load_xbf(xbf_file, cache=cache)
+    stat = xbf_file.stat()
+    os.utime(xbf_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.get(xbf_file, lazy=False) is None
+    load_xbf(xbf_file, cache=cache)
+    assert len(cache.entries()) == 2
+
+
+def test_cache_by_content(tmp_path, xbf_file, scene):
+    cache = SceneCache(tmp_path / "cache", by_content=True)
+    load_xbf(xbf_file, cache=cache)
+    copy = tmp_path / "copy.xbf"
+    copy.write_bytes(xbf_file.read_bytes())
+    assert cache.get(copy, lazy=False) == scene.decoded
+
+
+def test_cache_lru_eviction(tmp_path, xbf_file):
+    cache = SceneCache(tmp_path / "cache")
+    load_xbf(xbf_file, cache=cache)
+    entry_size = cache.size()
+    cache.max_bytes = entry_size * 2
+    files = []
+    for i in range(3):
+        file = tmp_path / f"{i}.xbf"
+        file.write_bytes(xbf_file.read_bytes())
+        files.append(file)
+    load_xbf(files[0], cache=cache)
+    os.utime(cache.entries()[0].path, ns=(0, 0))
+    load_xbf(files[1], cache=cache)
+    assert cache.size() <= cache.max_bytes
+    assert cache.get(xbf_file, lazy=False) is None
+    assert cache.get(files[1], lazy=False) is not None
+
+
+def test_cache_corrupt_entry(tmp_path, xbf_file, scene):
+    cache = SceneCache(tmp_path / "cache")
+    load_xbf(xbf_file, cache=cache)
+    with open(cache.entries()[0].path, "wb") as stream:
+        stream.write(b"not a pickle")
+    assert load_xbf(xbf_file, cache=cache) == scene.decoded
+
+
+def test_cache_hit_maps_arrays(tmp_path, xbf_file, scene):
+    cache = SceneCache(tmp_path / "cache")
+    load_xbf(xbf_file, cache=cache)
+    hit = load_xbf(xbf_file, cache=cache)
+    assert hit == scene.decoded
+    assert not hit.nodes[0].vertices.data.flags.writeable
+
+    entry = cache.entries()[0].path
+    with open(entry, "rb") as stream:
+        data = stream.read()
+    with open(entry, "wb") as stream:
+        stream.write(data[:-1])
+    assert cache.get(xbf_file, lazy=False) is None
+    assert not os.path.exists(entry)
+
+
+def test_cache_miss_passes_workers(tmp_path, xbf_file, mocker):
+    cache = SceneCache(tmp_path / "cache")
+    frombuffer = mocker.spy(Scene, "frombuffer")
+    load_xbf(xbf_file, cache=cache, workers=2)
+    assert frombuffer.call_args.kwargs["workers"] == 2
@@ -0,0 +1,70 @@
+import os
+import pytest
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.corpus_index import CorpusIndex, UpdateStats
+from conftest import EOF_MARKER
+
+
+@pytest.fixture
+def xbf_dir(tmp_path, scene, family_scene):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.xbf").write_bytes(scene.encoded + EOF_MARKER)
+    (tmp_path / "sub" / "B.XBF").write_bytes(family_scene.encoded + EOF_MARKER)
+    (tmp_path / "d.xbf").write_bytes(b"garbage")
+    return tmp_path
+
+
+def test_textures_cached(scene):
+    decoded = scene.decoded
+    assert decoded.textures == ["foobar.tga"]
+    assert decoded._textures == ("foobar.tga",)
+    decoded.textures.append("ignored")
+    assert decoded.textures == ["foobar.tga"]
+    decoded.textureNameData = b"a.tga\x00\x00b.tga\x00\x02"
+    assert decoded.textures == ["a.tga", "b.tga"]
+
+
+def test_index_queries(xbf_dir):
+    a = str((xbf_dir / "a.xbf").resolve())
+    b = str((xbf_dir / "sub" / "B.XBF").resolve())
+    d = str((xbf_dir / "d.xbf").resolve())
+    with CorpusIndex() as index:
+        assert index.update(xbf_dir) == UpdateStats(3, 0, 0, 0)
+        assert index.files() == sorted([a, b, d])
+        assert list(index.errors()) == [d]
+        assert index.textures(a) == ["foobar.tga"]
+        assert index.files_with_texture("FOOBAR.TGA") == sorted([a, b])
+        assert index.files_with_node("TestNode") == sorted([a, b])
+        assert index.files_with_node("Parent", substring=True) == [b]
+        assert index.files_with_node("Parent") == []
+        assert index.files_with_flags(Node.Flags.PRELIGHT) == sorted([a, b])
+        assert index.files_with_flags(Node.Flags.KEY_ANIMATION) == []
+        nodes = index.nodes(xbf_dir / "sub" / "B.XBF")
+        assert [node.path for node in nodes] == ["ParentNode", "ParentNode/TestNode"]
+        assert nodes[1].vertex_count == 2 and nodes[1].face_count == 1
+        assert nodes[1].flags is Node.Flags.PRELIGHT
+
+
+def test_incremental_update(xbf_dir, tmp_path_factory):
+    database = tmp_path_factory.mktemp("index") / "index.sqlite"
+    with CorpusIndex(database) as index:
+        index.update(xbf_dir)
+
+    a = xbf_dir / "a.xbf"
+    stat = a.stat()
+    a.write_bytes(
+        bytes(Scene(version=1, textureNameData=b"new.tga\x00\x00")) + EOF_MARKER
+    )
+    os.utime(a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    (xbf_dir / "d.xbf").unlink()
+
+    with CorpusIndex(database) as index:
+        assert index.update(xbf_dir) == UpdateStats(0, 1, 1, 1)
+        assert index.textures(a) == ["new.tga"]
+        assert index.files_with_node("TestNode") == [
+            str((xbf_dir / "sub" / "B.XBF").resolve())
+        ]
+        assert index.errors() == {}
+        assert index.update(xbf_dir / "sub") == UpdateStats(0, 0, 0, 1)
+        assert len(index.files()) == 2
@@ -0,0 +1,53 @@
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.vertex import Vertex
+from xanlib.xbf_io import save_xbf
+from xanlib.diff import diff_scenes
+
+
+def test_identical_scenes(scene):
+    result = diff_scenes(scene.encoded, Scene.frombuffer(scene.encoded))
+    assert not result
+    assert result.nodes == []
+
+
+def test_changed_sections(family_scene):
+    original = family_scene.encoded
+    edited = Scene.frombuffer(original)
+    child = edited["ParentNode/TestNode"]
+    child.vertices[0] = Vertex(9.0, 9.0, 9.0, 0.0, 0.0, 1.0)
+    child.rgb = [(1, 2, 3)] * len(child.rgb)
+    edited.FXData = b"edited"
+
+    result = diff_scenes(original, edited)
+    assert result.changes["FXData"] == (b"FXDataHeader", b"edited")
+    [node_diff] = result.nodes
+    assert node_diff.path == "ParentNode/TestNode"
+    assert node_diff.status == "changed"
+    assert set(node_diff.sections) == {"vertices", "rgb"}
+    vertices = node_diff.sections["vertices"]
+    assert list(vertices.changes) == [0]
+    assert vertices.changes[0] == (
+        Scene.frombuffer(original)["ParentNode/TestNode"].vertices[0],
+        Vertex(9.0, 9.0, 9.0, 0.0, 0.0, 1.0),
+    )
+
+
+def test_header_and_structure_changes(family_scene, tmp_path):
+    original = family_scene.encoded
+    edited = Scene.frombuffer(original)
+    parent = edited["ParentNode"]
+    parent.transform = tuple(float(i % 5 == 0) for i in range(16))
+    parent.children.append(
+        Node(parent=parent, name="Added", transform=parent.transform)
+    )
+    del parent.children[0]
+    save_xbf(edited, tmp_path / "edited.xbf")
+
+    result = diff_scenes(original, tmp_path / "edited.xbf")
+    by_path = {node_diff.path: node_diff for node_diff in result}
+    assert by_path["ParentNode/Added"].status == "added"
+    assert by_path["ParentNode/TestNode"].status == "removed"
+    header = by_path["ParentNode"].sections["header"]
+    assert set(header.changes) == {"transform"}
+    assert not result.changes
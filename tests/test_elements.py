@@ -0,0 +1,31 @@
+from xanlib.vertex import Vertex
+from xanlib.face import Face
+from xanlib.compressed_vertex import CompressedVertex
+from xanlib.math_utils import Vector3, UV
+
+
+def test_elements_have_no_instance_dict():
+    for element in (
+        Vertex(1, 2, 3, 4, 5, 6),
+        Face(0, 1, 2, 3, 4, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6),
+        CompressedVertex(1, 2, 3, 4),
+    ):
+        assert not hasattr(element, "__dict__")
+
+
+def test_vertex_views():
+    vertex = Vertex(1.0, 2.0, 3.0, 4.0, 5.0, 6.0)
+    assert vertex.position == Vector3(1.0, 2.0, 3.0)
+    assert vertex.normal == Vector3(4.0, 5.0, 6.0)
+    vertex.position = (7.0, 8.0, 9.0)
+    assert vertex == Vertex(7.0, 8.0, 9.0, 4.0, 5.0, 6.0)
+    assert vertex != Vertex(7.0, 8.0, 9.0, 4.0, 5.0, 0.0)
+
+
+def test_face_views():
+    face = Face(0, 1, 2, 3, 4, 0.5, 0.25, 1.0, 0.0, 0.0, 1.0)
+    assert face.vertex_indices == (0, 1, 2)
+    assert face.uv_coords == (UV(0.5, 0.25), UV(1.0, 0.0), UV(0.0, 1.0))
+    face.vertex_indices = (2, 1, 0)
+    face.uv_coords = ((0.0, 0.0), (1.0, 1.0), (0.5, 0.5))
+    assert bytes(face) == bytes(Face(2, 1, 0, 3, 4, 0.0, 0.0, 1.0, 1.0, 0.5, 0.5))
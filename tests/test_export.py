@@ -0,0 +1,76 @@
+import pytest
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.vertex import Vertex
+from xanlib.face import Face
+
+np = pytest.importorskip("numpy")
+
+from xanlib.export import export_buffers  # noqa: E402
+from xanlib.transforms import world_transforms  # noqa: E402
+
+
+def build_scene() -> Scene:
+    scale = np.diag([2.0, 2.0, 2.0, 1.0])
+    scale[3, :3] = [10, 0, 0]
+    triangle = [
+        Vertex(0.0, 0.0, 0.0, 0.0, 0.0, 1.0),
+        Vertex(1.0, 0.0, 0.0, 0.0, 0.0, 1.0),
+        Vertex(0.0, 1.0, 0.0, 0.0, 0.0, 1.0),
+    ]
+    face = Face(0, 1, 2, 3, 0, 0.0, 0.0, 1.0, 0.0, 0.0, 1.0)
+    child = Node(
+        name="child",
+        transform=tuple(np.eye(4).ravel()),
+        vertices=triangle,
+        faces=[face, Face(2, 1, 0, 5, 1, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5)],
+        rgb=[(1, 2, 3)] * 3,
+    )
+    root = Node(
+        name="root",
+        transform=tuple(scale.ravel()),
+        vertices=triangle,
+        faces=[face],
+        children=[child],
+    )
+    child.parent = root
+    empty = Node(name="empty", transform=tuple(np.eye(4).ravel()))
+    return Scene(version=1, nodes=[root, empty])
+
+
+def test_export_buffers():
+    scene = build_scene()
+    buffers = export_buffers(scene)
+    assert [node.name for node in buffers.nodes] == ["root", "child", "empty"]
+    assert buffers.positions.shape == (6, 3)
+    assert buffers.vertex_offsets.tolist() == [0, 3, 6, 6]
+    assert buffers.face_offsets.tolist() == [0, 1, 3, 3]
+    assert buffers.indices.tolist() == [[0, 1, 2], [3, 4, 5], [5, 4, 3]]
+    assert buffers.texture_index.tolist() == [3, 3, 5]
+    assert buffers.face_flags.tolist() == [0, 0, 1]
+    assert buffers.face_node.tolist() == [0, 1, 1]
+    assert buffers.vertex_node.tolist() == [0, 0, 0, 1, 1, 1]
+    assert buffers.uvs[0].tolist() == [[0, 0], [1, 0], [0, 1]]
+    assert buffers.rgb.tolist() == [[255] * 3] * 3 + [[1, 2, 3]] * 3
+    np.testing.assert_array_equal(
+        buffers.positions[buffers.vertex_slice(1)][1], [1, 0, 0]
+    )
+
+    arrays = export_buffers(Scene.frombuffer(bytes(scene), arrays=True))
+    np.testing.assert_array_equal(arrays.positions, buffers.positions)
+    np.testing.assert_array_equal(arrays.indices, buffers.indices)
+
+
+def test_export_buffers_world():
+    scene = build_scene()
+    buffers = export_buffers(scene, world=True)
+    world = world_transforms(scene)
+    for row, node in enumerate(buffers.nodes):
+        local = np.array([(*vertex.position, 1.0) for vertex in node.vertices])
+        if not len(local):
+            continue
+        expected = (local @ world.matrix(node))[:, :3]
+        np.testing.assert_allclose(
+            buffers.positions[buffers.vertex_slice(row)], expected
+        )
+    np.testing.assert_allclose(buffers.normals, [[0, 0, 1]] * 6)
@@ -0,0 +1,55 @@
+from struct import pack
+from xanlib.scene import Scene
+from xanlib.fx_data import AnimationTable, FrameRange
+
+
+def record(
+    name: str, unknown: int, ranges: list[tuple[int, int, int, int, int]]
+) -> bytes:
+    data = pack("<32si", name.encode("ascii"), unknown)
+    for i, (unknown_range, repeat, body_part, start, end) in enumerate(ranges):
+        data += pack(
+            "<3i?3x2i",
+            unknown_range,
+            repeat,
+            body_part,
+            i == len(ranges) - 1,
+            start,
+            end,
+        )
+    return data
+
+
+FX_DATA = (
+    b"\x01\x02\x03\x04"
+    + record("Idle 0", 7, [(0, 1, 0, 0, 9)])
+    + record("Deployed Idle 0", 8, [(0, 2, 0, 10, 19), (0, 0, 1, 15, 25)])
+    + record("Move", 9, [(1, 0, 2, 30, 39)])
+)
+
+
+def test_table_by_name_and_frame():
+    table = AnimationTable.frombuffer(FX_DATA)
+    assert table.names() == ["Idle 0", "Deployed Idle 0", "Move"]
+    deployed = table["Deployed Idle 0"]
+    assert deployed.unknown == 8
+    assert deployed.ranges[1] == FrameRange(0, 0, 1, 15, 25)
+    assert (deployed.start, deployed.end) == (10, 25)
+    assert list(table["Idle 0"].ranges[0].frames) == list(range(10))
+    assert "Move" in table and "Sell" not in table
+
+    assert [(animation.name, r.body_part) for animation, r in table.at_frame(16)] == [
+        ("Deployed Idle 0", 0),
+        ("Deployed Idle 0", 1),
+    ]
+    assert table.at_frame(9)[0][0].name == "Idle 0"
+    assert table.at_frame(29) == []
+
+
+def test_scene_animations_are_cached_until_fx_data_changes():
+    scene = Scene(version=1, FXData=FX_DATA)
+    assert scene.animations is scene.animations
+    assert len(scene.animations) == 3
+    scene.FXData = b""
+    assert len(scene.animations) == 0
+    assert scene == Scene(version=1, FXData=b"")
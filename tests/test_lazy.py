@@ -0,0 +1,66 @@
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.lazy import LazyNode
+from xanlib.layout import skim_node, skim_scene
+from xanlib.xbf_io import load_xbf
+
+
+def test_skim_node_spans(node_with_children):
+    layout = skim_node(node_with_children.encoded)
+    assert layout.end == len(node_with_children.encoded)
+    assert [node.path for node in layout] == ["ParentNode", "ParentNode/TestNode"]
+    child = layout.children[0]
+    assert layout.sections["header"].end == child.offset
+    assert layout.meshes.start == child.end
+    assert set(layout.sections) == {"header", "vertices", "faces", "rgb"}
+    assert layout.sections["rgb"].size == 3
+
+
+def test_skim_scene(scene):
+    layout = skim_scene(scene.encoded)
+    assert layout.error is None
+    assert scene.encoded[slice(*layout.fx_data)] == scene.decoded.FXData
+    assert layout.nodes[0].end == len(scene.encoded)
+
+
+def test_lazy_scene_decodes_on_access(scene):
+    result = Scene.frombuffer(scene.encoded, lazy=True)
+    node = result.nodes[0]
+    assert isinstance(node, LazyNode)
+    assert node.name == scene.decoded.nodes[0].name
+    assert not node.is_decoded
+    assert bytes(result) == scene.encoded
+    assert not node.is_decoded
+    assert node.rgb == scene.decoded.nodes[0].rgb
+    assert node.is_decoded
+    assert result == scene.decoded
+    assert bytes(result) == scene.encoded
+
+
+def test_lazy_edit_keeps_untouched_nodes_verbatim(node_with_children):
+    node = LazyNode.fromlayout(
+        node_with_children.encoded, skim_node(node_with_children.encoded)
+    )
+    node.transform = (1.0,) * 16
+    expected = Node.frombuffer(node_with_children.encoded)
+    expected.transform = (1.0,) * 16
+    assert bytes(node) == bytes(expected)
+    assert not node.is_decoded
+    assert not node.children[0].is_decoded
+    assert node.children[0].parent is node
+
+
+def test_lazy_set_field(node_basic):
+    node = LazyNode.fromlayout(node_basic.encoded, skim_node(node_basic.encoded))
+    node.rgb = None
+    expected = Node.frombuffer(node_basic.encoded)
+    expected.rgb = None
+    assert bytes(node) == bytes(expected)
+
+
+def test_load_xbf_lazy(tmp_path, scene):
+    file = tmp_path / "foo.xbf"
+    file.write_bytes(scene.encoded + (-1).to_bytes(4, "little", signed=True))
+    result = load_xbf(file, lazy=True, mmap=True)
+    assert result.textures == scene.decoded.textures
+    assert result == scene.decoded
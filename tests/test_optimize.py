@@ -0,0 +1,177 @@
+import pytest
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.vertex import Vertex
+from xanlib.face import Face
+from xanlib.compressed_vertex import CompressedVertex
+from xanlib.vertex_animation import VertexAnimation
+
+np = pytest.importorskip("numpy")
+
+from xanlib.arrays import VertexArray, FaceArray, CompressedFrames  # noqa: E402
+from xanlib.optimize import (  # noqa: E402
+    acmr,
+    optimize_node,
+    optimize_scene,
+    reorder_faces,
+)
+
+SIZE = 12
+
+
+def build_node() -> Node:
+    """A SIZE x SIZE grid exported without sharing: three vertices per face,
+    faces shuffled."""
+    rng = np.random.default_rng(0)
+    vertices = []
+    faces = []
+    rgb = []
+    for row in range(SIZE):
+        for column in range(SIZE):
+            corners = [(row, column), (row + 1, column), (row, column + 1)]
+            corners2 = [(row + 1, column), (row + 1, column + 1), (row, column + 1)]
+            for triangle in (corners, corners2):
+                base = len(vertices)
+                for x, y in triangle:
+                    vertices.append(Vertex(float(x), float(y), 0.0, 0.0, 0.0, 1.0))
+                    rgb.append((x * 10, y * 10, 0))
+                faces.append(
+                    Face(base, base + 1, base + 2, row, 0, 0.0, 0.0, 1.0, 0.0, 0.0, 1.0)
+                )
+    order = rng.permutation(len(faces))
+    faces = [faces[i] for i in order]
+    frames = [
+        [
+            CompressedVertex(int(v.x) * (k + 1), int(v.y), k, 0x8000 * (k % 2))
+            for v in vertices
+        ]
+        for k in range(2)
+    ]
+    base_count = len(vertices) * 2
+    return Node(
+        name="grid",
+        transform=tuple(np.eye(4).ravel()),
+        vertices=vertices,
+        faces=faces,
+        rgb=rgb,
+        smoothing_groups=[face.texture_index for face in faces],
+        vertex_animation=VertexAnimation(
+            frame_count=2,
+            count=-base_count,
+            keys=[0, 1],
+            scale=0,
+            base_count=base_count,
+            real_count=len(vertices),
+            frames=frames,
+            interpolation_data=[],
+        ),
+    )
+
+
+def corners(node: Node) -> list:
+    """Each face's corners as (position, rgb, animated positions, uv)."""
+    frames = node.vertex_animation.frames
+    return [
+        tuple(
+            (
+                node.vertices[index].position,
+                node.rgb[index],
+                tuple(frame[index].position for frame in frames),
+                uv,
+            )
+            for index, uv in zip(face.vertex_indices, face.uv_coords)
+        )
+        for face in node.faces
+    ]
+
+
+def test_weld_and_reorder():
+    node = build_node()
+    expected = sorted(corners(node))
+    report = optimize_node(node)
+    assert report.vertices_before == 6 * SIZE * SIZE
+    assert report.vertices_after == (SIZE + 1) ** 2
+    assert report.acmr_after < report.acmr_before
+    assert report.acmr_after < 1.0
+    assert sorted(corners(node)) == expected
+    assert node.smoothing_groups == [face.texture_index for face in node.faces]
+    animation = node.vertex_animation
+    assert animation.real_count == len(node.vertices)
+    assert animation.base_count == -animation.count == 2 * len(node.vertices)
+    assert Node.frombuffer(bytes(node)) == node
+
+
+def test_colour_and_animation_keep_vertices_apart():
+    node = build_node()
+    node.rgb = [(i % 256, 0, 0) for i in range(len(node.vertices))]
+    report = optimize_node(node)
+    assert report.vertices_after == report.vertices_before
+
+
+def jittered_node() -> Node:
+    node = build_node()
+    node.vertex_animation = None
+    node.vertices = [
+        Vertex(v.x + 1e-4 * (i % 2), v.y, v.z, *v.normal)
+        for i, v in enumerate(node.vertices)
+    ]
+    return node
+
+
+def test_tolerance():
+    assert optimize_node(jittered_node()).vertices_after > (SIZE + 1) ** 2
+    report = optimize_node(jittered_node(), tolerance=1e-2)
+    assert report.vertices_after == (SIZE + 1) ** 2
+
+
+def test_arrays_stay_arrays():
+    node = build_node()
+    expected = sorted(corners(node))
+    node.vertices = VertexArray.fromvertices(node.vertices)
+    node.faces = FaceArray.fromfaces(node.faces)
+    node.vertex_animation.frames = CompressedFrames.fromframes(
+        node.vertex_animation.frames
+    )
+    optimize_node(node)
+    assert isinstance(node.vertices, VertexArray)
+    assert isinstance(node.faces, FaceArray)
+    assert isinstance(node.vertex_animation.frames, CompressedFrames)
+    assert sorted(corners(node)) == expected
+
+
+def test_mismatched_animation_only_reorders_faces():
+    node = build_node()
+    animation = node.vertex_animation
+    animation.frames = [frame[:-1] for frame in animation.frames]
+    vertices = list(node.vertices)
+    report = optimize_node(node)
+    assert report.vertices_after == report.vertices_before
+    assert node.vertices == vertices
+
+
+def test_invalid_index():
+    node = Node(name="bad", vertices=[Vertex(0, 0, 0, 0, 0, 1)])
+    node.faces = [Face(0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0)]
+    with pytest.raises(ValueError, match="bad"):
+        optimize_node(node)
+
+
+def test_acmr():
+    assert acmr(np.zeros((0, 3), int)) == 0.0
+    assert acmr([[0, 1, 2], [3, 4, 5]]) == 3.0
+    assert acmr([[0, 1, 2], [2, 1, 3]]) == 2.0
+    assert acmr([[0, 1, 2], [3, 4, 5], [0, 1, 2]], cache_size=3) == 3.0
+
+
+def test_reorder_faces_is_a_permutation():
+    indices = np.random.default_rng(1).integers(0, 30, (100, 3))
+    order = reorder_faces(indices, 30)
+    assert sorted(order.tolist()) == list(range(100))
+
+
+def test_optimize_scene_skips_nodes_without_faces():
+    empty = Node(name="empty", vertices=[Vertex(0, 0, 0, 0, 0, 1)])
+    scene = Scene(nodes=[empty, build_node()])
+    reports = optimize_scene(scene)
+    assert [report.name for report in reports] == ["grid"]
+    assert len(empty.vertices) == 1
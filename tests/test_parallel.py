@@ -0,0 +1,43 @@
+import pytest
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.layout import skim_scene
+from xanlib.parallel import parse_nodes
+
+
+@pytest.fixture
+def buffer(family_scene, node_with_children, node_basic):
+    scene = family_scene.decoded
+    scene.nodes.append(Node.frombuffer(node_basic.encoded))
+    scene.nodes.append(Node.frombuffer(node_with_children.encoded))
+    return bytes(scene)
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_parse_nodes(buffer, processes):
+    expected = Scene.frombuffer(buffer)
+    layout = skim_scene(buffer)
+    nodes, error, offset = parse_nodes(buffer, layout.nodes, 2, processes=processes)
+    assert error is None and offset is None
+    assert nodes == expected.nodes
+    for node, expected_node in zip(Scene(nodes=nodes), expected):
+        assert node._source_offset == expected_node._source_offset
+        assert all(child.parent is node for child in node.children)
+
+
+def test_frombuffer_workers(buffer):
+    assert Scene.frombuffer(buffer, workers=2) == Scene.frombuffer(buffer)
+
+
+def test_frombuffer_workers_arrays(buffer):
+    pytest.importorskip("numpy")
+    assert Scene.frombuffer(buffer, arrays=True, workers=2) == Scene.frombuffer(buffer)
+
+
+def test_frombuffer_workers_error(buffer):
+    truncated = buffer[:-1]
+    expected = Scene.frombuffer(truncated)
+    result = Scene.frombuffer(truncated, workers=2)
+    assert result.nodes == expected.nodes
+    assert result.unparsed == expected.unparsed
+    assert result.error is not None
@@ -0,0 +1,81 @@
+import pytest
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.vertex import Vertex
+from xanlib.xbf_io import load_xbf, save_xbf
+from xanlib.patch import find_patches, patch_xbf
+from conftest import EOF_MARKER
+
+IDENTITY = tuple(float(i % 5 == 0) for i in range(16))
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_patch_transform_and_rgb(family_xbf_file, tmp_path, lazy):
+    scene = load_xbf(family_xbf_file, lazy=lazy)
+    assert find_patches(scene) == []
+    scene["ParentNode/TestNode"].transform = IDENTITY
+    scene["ParentNode"].rgb = [(1, 2, 3)]
+
+    copy = tmp_path / "copy.xbf"
+    assert patch_xbf(scene, copy)
+    assert copy.read_bytes() == bytes(scene) + EOF_MARKER
+    assert load_xbf(copy) == scene
+
+    assert patch_xbf(scene, family_xbf_file)
+    assert family_xbf_file.read_bytes() == copy.read_bytes()
+    assert find_patches(scene) == []
+
+
+def test_fallback_to_full_write(family_xbf_file, tmp_path):
+    scene = load_xbf(family_xbf_file)
+    scene["ParentNode"].rgb = [(1, 2, 3), (4, 5, 6)]
+    scene["ParentNode"].vertices = scene["ParentNode"].vertices * 2
+    assert find_patches(scene) is None
+    copy = tmp_path / "copy.xbf"
+    assert not patch_xbf(scene, copy)
+    assert load_xbf(copy) == scene
+
+    scene = load_xbf(family_xbf_file)
+    scene["ParentNode"].children.append(Node(name="Added", transform=IDENTITY))
+    assert find_patches(scene) is None
+
+    scene = load_xbf(family_xbf_file)
+    scene.FXData = b"edited"
+    assert find_patches(scene) is None
+
+    scene = load_xbf(family_xbf_file)
+    save_xbf(Scene(version=2), family_xbf_file)
+    scene["ParentNode"].transform = IDENTITY
+    assert find_patches(scene) is None
+
+
+def test_save_xbf_patch_option(family_xbf_file, mocker):
+    scene = load_xbf(family_xbf_file)
+    scene["ParentNode"].transform = IDENTITY
+    copyfile = mocker.spy(__import__("shutil"), "copyfile")
+    save_xbf(scene, family_xbf_file, patch=True)
+    copyfile.assert_not_called()
+    assert load_xbf(family_xbf_file) == scene
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_in_place_edits(family_xbf_file, tmp_path, lazy):
+    scene = load_xbf(family_xbf_file, lazy=lazy)
+    scene["ParentNode/TestNode"].vertices[0] = Vertex(9.0, 9.0, 9.0, 0.0, 0.0, 1.0)
+    assert find_patches(scene) is None
+    copy = tmp_path / "copy.xbf"
+    assert not patch_xbf(scene, copy)
+    assert load_xbf(copy) == scene
+
+    scene = load_xbf(family_xbf_file, lazy=lazy)
+    scene["ParentNode"].transform = IDENTITY
+    scene["ParentNode/TestNode"].rgb[0] = (7, 8, 9)
+    assert patch_xbf(scene, copy)
+    assert copy.read_bytes() == bytes(scene) + EOF_MARKER
+
+    scene = load_xbf(family_xbf_file, lazy=lazy)
+    rgb = scene["ParentNode"].rgb
+    scene["ParentNode"].rgb = rgb
+    rgb[0] = (7, 8, 9)
+    assert patch_xbf(scene, copy)
+    assert copy.read_bytes() == bytes(scene) + EOF_MARKER
@@ -0,0 +1,68 @@
+import pytest
+from xanlib.compressed_vertex import CompressedVertex
+from xanlib.vertex_animation import VertexAnimation
+
+np = pytest.importorskip("numpy")
+
+from xanlib.playback import VertexAnimationPlayer  # noqa: E402
+
+
+def make_animation(interpolated: bool, arrays: bool = False) -> VertexAnimation:
+    frames = [
+        [CompressedVertex(0, 0, 0, 1), CompressedVertex(10, 0, 0, 2)],
+        [CompressedVertex(10, 20, 0, 3), CompressedVertex(20, 0, 30, 4)],
+    ]
+    animation = VertexAnimation(
+        frame_count=3,
+        count=-4,
+        keys=[0, 1, 1],
+        scale=0x80000000 if interpolated else 0,
+        base_count=4,
+        real_count=2,
+        frames=frames,
+        interpolation_data=[0, 0, 0] if interpolated else [],
+    )
+    if arrays:
+        animation = VertexAnimation.frombuffer(bytes(animation), arrays=True)
+    return animation
+
+
+@pytest.mark.parametrize("arrays", [False, True])
+def test_mesh_matches_compressed_vertices(arrays):
+    animation = make_animation(interpolated=False, arrays=arrays)
+    player = VertexAnimationPlayer(animation, position_scale=0.5)
+    for frame, key in enumerate(animation.keys):
+        mesh = player.mesh(frame)
+        expected = [vertex.as_vertex() for vertex in animation.frames[key]]
+        np.testing.assert_array_equal(
+            mesh.positions, [np.multiply(v.position, 0.5) for v in expected]
+        )
+        np.testing.assert_array_equal(mesh.normals, [v.normal for v in expected])
+
+
+def test_mesh_loops_and_floors_without_interpolation():
+    player = VertexAnimationPlayer(make_animation(interpolated=False))
+    np.testing.assert_array_equal(player.mesh(3).positions, player.mesh(0).positions)
+    np.testing.assert_array_equal(player.mesh(0.5).positions, player.mesh(0).positions)
+
+
+def test_mesh_interpolates_between_keys():
+    player = VertexAnimationPlayer(make_animation(interpolated=True))
+    np.testing.assert_allclose(player.mesh(0.5).positions, [[5, 10, 0], [15, 0, 15]])
+    np.testing.assert_allclose(player.mesh(2.5).positions, [[5, 10, 0], [15, 0, 15]])
+
+
+def test_cache_is_bounded_and_reused():
+    player = VertexAnimationPlayer(make_animation(interpolated=False), cache_size=1)
+    first = player.mesh(0)
+    assert player.mesh(0) is first
+    player.mesh(1)
+    assert player.mesh(0) is not first
+    assert player.cache_info() == (1, 3, 1, 1)
+    with pytest.raises(ValueError):
+        first.positions[0, 0] = 1
+
+
+def test_uncompressed_animation_is_rejected():
+    with pytest.raises(ValueError):
+        VertexAnimationPlayer(VertexAnimation(2, 1, [1, 2], None, None, None, [], []))
@@ -0,0 +1,68 @@
+from xanlib import profiling
+from xanlib.node import Node
+from xanlib.scene import Scene
+from xanlib.xbf_io import load_xbf, save_xbf
+
+
+def test_disabled_by_default(node_with_children):
+    assert profiling.active is None
+    assert profiling.clock("load", "") is None
+    Node.frombuffer(node_with_children.encoded)
+
+
+def test_load_sections_cover_buffer(scene):
+    with profiling.profile() as report:
+        Scene.frombuffer(scene.encoded)
+    assert profiling.active is None
+    sections = report.by_section()
+    assert sum(stats.bytes for stats in sections.values()) == len(scene.encoded)
+    assert sections["load", "header"].calls == 1
+    assert sections["load", "vertices"].elements == len(scene.decoded.nodes[0].vertices)
+    assert sections["load", "faces"].elements == len(scene.decoded.nodes[0].faces)
+    assert all(event.seconds >= 0 for event in report.events)
+
+
+def test_events_per_node(node_with_children):
+    with profiling.profile() as report:
+        node = Node.frombuffer(node_with_children.encoded)
+        encoded = bytes(node)
+    by_node = report.by_node()
+    assert set(by_node) == {
+        (operation, name)
+        for operation in ("load", "save")
+        for name in ("ParentNode", "TestNode")
+    }
+    for operation in ("load", "save"):
+        assert sum(
+            stats.bytes for (op, _), stats in by_node.items() if op == operation
+        ) == len(encoded)
+
+
+def test_callback_and_file_steps(scene, tmp_path):
+    received = []
+    filename = tmp_path / "scene.xbf"
+    with profiling.profile(received.append) as report:
+        save_xbf(scene.decoded, filename)
+        load_xbf(filename)
+    assert received == report.events
+    steps = [
+        (event.operation, event.section)
+        for event in report.events
+        if event.node == str(filename)
+    ]
+    assert steps == [
+        ("save", "encode"),
+        ("save", "write"),
+        ("load", "read"),
+        ("load", "parse"),
+    ]
+    assert "operation" in report.format()
+
+
+def test_nested_profiles_restore_outer():
+    with profiling.profile() as outer:
+        with profiling.profile() as inner:
+            pass
+        assert profiling.active is not None
+        assert profiling.active.report is outer
+    assert inner.events == []
@@ -0,0 +1,112 @@
+import math
+import pytest
+from xanlib.key_animation import KeyAnimation, KeyAnimationFrame
+from xanlib.math_utils import Quaternion, Vector3
+from xanlib.node import Node
+from xanlib.scene import Scene
+
+np = pytest.importorskip("numpy")
+
+from xanlib.sampling import (  # noqa: E402
+    slerp,
+    sample_key_animation,
+    sample_node,
+    sample_scene,
+    decompose,
+)
+
+ROTATE_Z_90 = Quaternion(
+    math.cos(math.pi / 4), Vector3(0.0, 0.0, math.sin(math.pi / 4))
+)
+IDENTITY_ROTATION = Quaternion(1.0, Vector3(0.0, 0.0, 0.0))
+
+
+def keyframe_animation():
+    return KeyAnimation(
+        frame_count=10,
+        flags=2,
+        matrices=[],
+        extra_data=[],
+        frames=[
+            KeyAnimationFrame(
+                0, 0b101 << 12, IDENTITY_ROTATION, None, Vector3(0, 0, 0)
+            ),
+            KeyAnimationFrame(10, 0b101 << 12, ROTATE_Z_90, None, Vector3(10, 0, 0)),
+        ],
+    )
+
+
+def test_slerp_midpoint():
+    result = slerp([1, 0, 0, 0], [0, 0, 0, 1], [0.0, 0.5, 1.0])
+    np.testing.assert_allclose(result[0], [1, 0, 0, 0], atol=1e-12)
+    np.testing.assert_allclose(result[1], [math.sqrt(0.5), 0, 0, math.sqrt(0.5)])
+    np.testing.assert_allclose(result[2], [0, 0, 0, 1], atol=1e-12)
+
+
+def test_sample_keyframes():
+    matrices = sample_key_animation(keyframe_animation(), [-5, 0, 5, 10, 20])
+    assert matrices.shape == (5, 4, 4)
+    x_axis = np.array([1.0, 0.0, 0.0, 0.0])
+    np.testing.assert_allclose(x_axis @ matrices[0], [1, 0, 0, 0], atol=1e-12)
+    half = math.sqrt(0.5)
+    np.testing.assert_allclose(x_axis @ matrices[2], [half, half, 0, 0], atol=1e-12)
+    np.testing.assert_allclose(x_axis @ matrices[3], [0, 1, 0, 0], atol=1e-12)
+    np.testing.assert_allclose(matrices[2][3, :3], [5, 0, 0])
+    np.testing.assert_allclose(matrices[4], matrices[3])
+
+
+def test_missing_channels_come_from_rest():
+    rest = tuple(np.diag([2.0, 2.0, 2.0, 1.0]).ravel())
+    matrices = sample_key_animation(keyframe_animation(), [0], rest=rest)
+    np.testing.assert_allclose(np.diag(matrices[0]), [2, 2, 2, 1])
+    rotation, scale, translation = decompose(rest)
+    np.testing.assert_allclose(rotation, [1, 0, 0, 0])
+    np.testing.assert_allclose(scale, [2, 2, 2])
+
+
+def test_sample_matrix_modes():
+    matrices16 = [
+        tuple(float(i + 100 * frame) for i in range(16)) for frame in range(3)
+    ]
+    mode1 = KeyAnimation(2, -1, matrices16, [], [])
+    result = sample_key_animation(mode1, [0, 1.7, 5])
+    np.testing.assert_array_equal(result[1], np.reshape(matrices16[1], (4, 4)))
+    np.testing.assert_array_equal(result[2], np.reshape(matrices16[2], (4, 4)))
+
+    matrices12 = [
+        tuple(float(i + 100 * frame) for i in range(12)) for frame in range(2)
+    ]
+    mode3 = KeyAnimation(3, -3, matrices12, [1, 1, 0, 1], [])
+    result = sample_key_animation(mode3, [0, 1, 2, 3])
+    expected = np.zeros((4, 4))
+    expected[:, :3] = np.reshape(matrices12[1], (4, 3))
+    expected[3, 3] = 1
+    np.testing.assert_array_equal(result[0], expected)
+    np.testing.assert_array_equal(result[2][:, :3], np.reshape(matrices12[0], (4, 3)))
+
+
+def test_sample_fixture_animations(key_animation):
+    times = np.linspace(-1, key_animation.decoded.frame_count + 1, 7)
+    result = sample_key_animation(key_animation.decoded, times)
+    assert result.shape == (7, 4, 4)
+    assert np.all(np.isfinite(result))
+
+
+def test_sample_scene_world():
+    child = Node(name="child", transform=tuple(np.eye(4).ravel()))
+    child.key_animation = keyframe_animation()
+    offset = np.eye(4)
+    offset[3, :3] = [0, 0, 7]
+    root = Node(name="root", transform=tuple(offset.ravel()), children=[child])
+    child.parent = root
+    scene = Scene(nodes=[root])
+
+    times = np.arange(0, 11, 5)
+    result = sample_scene(scene, times)
+    assert result.matrices.shape == (2, 3, 4, 4)
+    local = sample_node(child, times)
+    np.testing.assert_allclose(result.matrix(child), local @ offset)
+    np.testing.assert_allclose(result.matrix(root), np.broadcast_to(offset, (3, 4, 4)))
+    np.testing.assert_allclose(
+        sample_scene(scene, times, world=False).matrix(child), local
+    )
@@ -0,0 +1,96 @@
+import copy
+import pickle
+import pytest
+from xanlib.node import Node
+from xanlib.scene import Scene
+
+
+@pytest.fixture
+def hierarchy():
+    barrel = Node(name="barrel")
+    turret = Node(name="turret", children=[barrel])
+    hull = Node(name="hull")
+    root = Node(name="root", children=[turret, hull])
+    other = Node(name="barrel")
+    return Scene(nodes=[root, other])
+
+
+def test_getitem_by_name(hierarchy):
+    assert hierarchy["turret"] is hierarchy.nodes[0].children[0]
+
+
+def test_getitem_duplicate_returns_first_depth_first(hierarchy):
+    assert hierarchy["barrel"] is hierarchy.nodes[0].children[0].children[0]
+    assert hierarchy.find_all("barrel") == [
+        hierarchy.nodes[0].children[0].children[0],
+        hierarchy.nodes[1],
+    ]
+
+
+def test_getitem_by_path(hierarchy):
+    assert hierarchy["root/turret/barrel"] is hierarchy["barrel"]
+    with pytest.raises(KeyError):
+        hierarchy["root/hull/barrel"]
+
+
+def test_getitem_missing(hierarchy):
+    with pytest.raises(KeyError):
+        hierarchy["missing"]
+
+
+def test_index_invalidated_by_children_change(hierarchy):
+    assert hierarchy["hull"].children == []
+    hierarchy["hull"].children.append(Node(name="antenna"))
+    assert hierarchy["antenna"] is hierarchy["hull"].children[0]
+    hierarchy["hull"].children = []
+    with pytest.raises(KeyError):
+        hierarchy["antenna"]
+
+
+def test_index_invalidated_by_nodes_and_name_change(hierarchy):
+    hierarchy.nodes.append(Node(name="extra"))
+    assert hierarchy["extra"] is hierarchy.nodes[-1]
+    hierarchy["extra"].name = "renamed"
+    assert hierarchy["renamed"] is hierarchy.nodes[-1]
+    with pytest.raises(KeyError):
+        hierarchy["extra"]
+
+
+def test_iter_depth_first(hierarchy):
+    assert [node.name for node in hierarchy] == [
+        "root",
+        "turret",
+        "barrel",
+        "hull",
+        "barrel",
+    ]
+
+
+def test_lookup_keeps_scenes_equal(hierarchy):
+    copy = Scene(nodes=list(hierarchy.nodes))
+    hierarchy["turret"]
+    assert hierarchy == copy
+
+
+def test_index_kept_across_unrelated_edits(hierarchy):
+    index = hierarchy._names()
+    other = Scene(nodes=[Node(name="other")])
+    other["other"].name = "renamed"
+    other.nodes.append(Node(name="extra"))
+    assert hierarchy._names() is index
+
+
+def test_index_of_shared_nodes_invalidated_in_every_scene(hierarchy):
+    shared = Scene(nodes=list(hierarchy.nodes))
+    assert shared["hull"] is hierarchy["hull"]
+    hierarchy["hull"].children.append(Node(name="antenna"))
+    assert shared["antenna"] is hierarchy["antenna"]
+
+
+def test_index_invalidated_after_pickling(hierarchy):
+    unpickled = pickle.loads(pickle.dumps(hierarchy))
+    unpickled["turret"].name = "tower"
+    assert unpickled["tower"] is unpickled.nodes[0].children[0]
+    copied = copy.deepcopy(hierarchy)
+    copied["barrel"].children.append(Node(name="muzzle"))
+    assert copied["muzzle"] is copied["barrel"].children[0]
@@ -0,0 +1,71 @@
+import random
+import pytest
+from xanlib.node import Node
+from xanlib.scene import Scene
+
+np = pytest.importorskip("numpy")
+
+from xanlib.transforms import world_transforms, compute_world_transforms  # noqa: E402
+
+
+def random_transform(rng):
+    return tuple(rng.uniform(-2, 2) for _ in range(16))
+
+
+@pytest.fixture
+def hierarchy():
+    rng = random.Random(1)
+    leaf = Node(name="leaf", transform=random_transform(rng))
+    middle = Node(name="middle", transform=random_transform(rng), children=[leaf])
+    leaf.parent = middle
+    root = Node(name="root", transform=random_transform(rng), children=[middle])
+    middle.parent = root
+    other = Node(name="other", transform=random_transform(rng))
+    return Scene(nodes=[root, other])
+
+
+def walk_ancestors(node):
+    matrix = np.array(node.transform).reshape(4, 4)
+    for ancestor in node.ancestors:
+        matrix = matrix @ np.array(ancestor.transform).reshape(4, 4)
+    return matrix
+
+
+def test_world_transforms_match_ancestor_walk(hierarchy):
+    result = compute_world_transforms(hierarchy)
+    assert [node.name for node in result.nodes] == [
+        "root",
+        "middle",
+        "leaf",
+        "other",
+    ]
+    assert result.matrices.shape == (4, 4, 4)
+    for node in hierarchy:
+        np.testing.assert_allclose(result.matrix(node), walk_ancestors(node))
+
+
+def test_world_transforms_cached_until_transform_changes(hierarchy):
+    first = world_transforms(hierarchy)
+    assert world_transforms(hierarchy) is first
+    hierarchy["middle"].transform = tuple(np.eye(4).ravel() * 2)
+    second = world_transforms(hierarchy)
+    assert second is not first
+    np.testing.assert_allclose(
+        second.matrix(hierarchy["leaf"]), walk_ancestors(hierarchy["leaf"])
+    )
+
+
+def test_world_transforms_cached_until_hierarchy_changes(hierarchy):
+    first = world_transforms(hierarchy)
+    hierarchy.nodes.append(Node(name="new"))
+    second = world_transforms(hierarchy)
+    assert len(second.nodes) == len(first.nodes) + 1
+    np.testing.assert_array_equal(second.matrix(hierarchy["new"]), np.eye(4))
+
+
+def test_world_transforms_kept_across_other_scenes(hierarchy):
+    first = world_transforms(hierarchy)
+    other = Scene(nodes=[Node(name="other", transform=tuple(np.eye(4).ravel()))])
+    other["other"].transform = tuple(np.eye(4).ravel() * 2)
+    other.nodes.append(Node(name="new"))
+    assert world_transforms(hierarchy) is first
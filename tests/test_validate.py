@@ -0,0 +1,57 @@
+import pytest
+from xanlib.layout import FormatError
+from xanlib.validate import validate_buffer, validate_xbf
+from xanlib.xbf_io import load_xbf
+from conftest import EOF_MARKER
+
+
+def test_valid_file(scene, xbf_file):
+    report = validate_xbf(xbf_file)
+    assert report.valid
+    assert report.size == len(scene.encoded) + 4
+    sections = {(entry.path, entry.section): entry for entry in report.sections}
+    assert sections["", "FXData"].size == len(scene.decoded.FXData)
+    assert sections["", "EOF"].offset == len(scene.encoded)
+    node = scene.decoded.nodes[0]
+    assert (
+        sections[node.name, "header"].offset
+        == sections["", "textureNameData"].offset + sections["", "textureNameData"].size
+    )
+    assert sum(entry.size for entry in report.sections) == report.size
+
+
+def test_missing_eof_marker(scene, tmp_path):
+    report = validate_buffer(scene.encoded)
+    assert not report.valid
+    assert report.offset == len(scene.encoded) - 4
+    file = tmp_path / "scene.xbf"
+    file.write_bytes(scene.encoded)
+    with pytest.raises(FormatError):
+        load_xbf(file)
+
+
+def test_truncated_node(node_with_children, scene):
+    buffer = scene.encoded[: -len(bytes(scene.decoded.nodes[0]))]
+    truncated = buffer + node_with_children.encoded[:-2] + EOF_MARKER
+    report = validate_buffer(truncated)
+    assert not report.valid
+    assert report.path == "ParentNode"
+    rgb_offset = len(buffer) + len(node_with_children.encoded) - 3
+    assert report.offset == rgb_offset
+    assert "rgb" in str(report.error)
+
+
+def test_validate_xbf_truncated_node(node_with_children, scene, tmp_path):
+    file = tmp_path / "truncated.xbf"
+    file.write_bytes(scene.encoded + node_with_children.encoded[:-2] + EOF_MARKER)
+    report = validate_xbf(file)
+    assert not report.valid
+    assert report.path == "ParentNode"
+    assert report.error.__traceback__ is None
+
+
+def test_bad_scene_header(scene):
+    report = validate_buffer(scene.encoded[:10] + EOF_MARKER)
+    assert not report.valid
+    assert report.offset == 8
+    assert report.path == ""
@@ -1,3 +1,4 @@
+import pytest
 from xanlib.face import Face
 from xanlib.vertex import Vertex
 from xanlib.compressed_vertex import convert_signed_5bit
@@ -5,6 +6,7 @@ from xanlib.vertex_animation import VertexAnimation
 from xanlib.key_animation import KeyAnimation
 from xanlib.node import Node
 from xanlib.scene import Scene
+from xanlib.layout import FormatError
 from xanlib.xbf_io import load_xbf
 
 
@@ -52,3 +54,42 @@ def test_load_xbf(mocker, scene):
     result = load_xbf(file)
     assert result == scene.decoded
     mock_open.assert_called_once_with(file, "rb")
+
+
+def test_parse_vertex_animation_end_offset(vertex_animation):
+    result, end = VertexAnimation.parse(vertex_animation.encoded)
+    assert result == vertex_animation.decoded
+    assert end == len(vertex_animation.encoded)
+    assert VertexAnimation.skip(vertex_animation.encoded) == end
+
+
+def test_parse_key_animation_end_offset(key_animation):
+    result, end = KeyAnimation.parse(key_animation.encoded)
+    assert result == key_animation.decoded
+    assert end == len(key_animation.encoded)
+    assert KeyAnimation.skip(key_animation.encoded) == end
+
+
+def test_parse_node_end_offset(node_with_children):
+    padding = b"\xaa" * 7
+    result, end = Node.parse(padding + node_with_children.encoded + padding, 7)
+    assert end == 7 + len(node_with_children.encoded)
+    assert result.children[0].parent is result
+
+
+def test_load_xbf_mmap(tmp_path, scene):
+    file = tmp_path / "foo.xbf"
+    file.write_bytes(scene.encoded + (-1).to_bytes(4, "little", signed=True))
+    result = load_xbf(file, mmap=True)
+    assert isinstance(result.FXData, memoryview)
+    assert result == scene.decoded
+    assert result.textures == scene.decoded.textures
+    assert bytes(result) == scene.encoded
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_load_xbf_empty_file(tmp_path, mmap):
+    file = tmp_path / "empty.xbf"
+    file.write_bytes(b"")
+    with pytest.raises(FormatError):
+        load_xbf(file, mmap=mmap)
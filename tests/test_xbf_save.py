@@ -1,4 +1,7 @@
-from xanlib.xbf_io import save_xbf
+import sys
+import pytest
+from io import BytesIO
+from xanlib.xbf_io import load_xbf, save_xbf
 
 
 def test_write_vertex(vertex):
@@ -34,3 +37,34 @@ def test_save_xbf(mocker, scene):
     file = "foo.xbf"
     save_xbf(scene.decoded, file)
     mock_open.assert_called_once_with(file, "wb")
+
+
+def test_save_xbf_streaming(tmp_path, scene):
+    file = tmp_path / "foo.xbf"
+    save_xbf(scene.decoded, file, streaming=True)
+    assert file.read_bytes() == scene.encoded + (-1).to_bytes(4, "little", signed=True)
+
+
+def test_stream_node_with_children(node_with_children):
+    stream = BytesIO()
+    node_with_children.decoded.tostream(stream)
+    assert stream.getvalue() == node_with_children.encoded
+
+
+def test_stream_animations(vertex_animation, key_animation):
+    for animation in (vertex_animation, key_animation):
+        stream = BytesIO()
+        animation.decoded.tostream(stream)
+        assert stream.getvalue() == animation.encoded
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="Windows cannot replace a mapped file"
+)
+def test_save_xbf_streaming_over_mapped_source(tmp_path, scene):
+    file = tmp_path / "foo.xbf"
+    file.write_bytes(scene.encoded + (-1).to_bytes(4, "little", signed=True))
+    mapped = load_xbf(file, mmap=True)
+    save_xbf(mapped, file, streaming=True)
+    assert file.read_bytes() == scene.encoded + (-1).to_bytes(4, "little", signed=True)
+    assert [path.name for path in tmp_path.iterdir()] == ["foo.xbf"]